@@ -0,0 +1,175 @@
+# akshare调用的记忆化包装：相同函数+参数的并发调用只发起一次请求，结果在本次运行内或TTL内复用
+import threading
+import time
+
+import akshare as ak
+import pandas as pd
+
+from metrics import metrics, AKSHARE_FETCH_SECONDS, AKSHARE_FETCH_ROWS
+from source_health import HealthRegistry, source_name
+
+AK_CACHE_DEFAULT_TTL = 600  # 默认缓存10分钟，None表示直到 clear() 前一直有效，0表示不缓存
+AK_CACHE_MAX_ENTRIES = 512  # 缓存条数上限，超过时淘汰最久未使用的结果（历史日期、各营业部的调用每天都会产生新key）
+AK_CACHE_SWEEP_INTERVAL = 60  # 写入时最多每隔多少秒清理一次已过期的结果
+# 更新频繁的数据源使用更短的TTL，保证服务器定时刷新时拿到新数据
+AK_CACHE_TTLS = {
+    "stock_info_global_cls": 60,
+    "stock_info_global_ths": 60,
+    "stock_hot_search_baidu": 60,
+    "stock_hot_rank_em": 60,
+    "stock_market_activity_legu": 60,
+}
+
+
+class _InFlight:
+    """一次正在进行中的调用，等待者通过 event 获取结果"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlightCache:
+    """带单飞语义的结果缓存
+
+    - 同一个key同时只有一个线程真正执行，其余线程等待并共享结果
+    - 成功结果按TTL缓存：ttl 为 None 时使用 default_ttl，两者都为 None 时直到 clear() 前一直有效；
+      ttl 为 0 时不缓存，只合并同时进行的调用
+    - 异常不缓存，会原样抛给所有等待者
+    - 写入时定期清理已过期的结果，条数超过 max_entries 时淘汰最久未使用的结果，长时间运行的服务器内存不会持续增长
+    """
+
+    def __init__(self, default_ttl=AK_CACHE_DEFAULT_TTL, max_entries=AK_CACHE_MAX_ENTRIES):
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.values = {}  # key -> (结果, 过期时间)，按最近使用的顺序排列
+        self.last_sweep = time.monotonic()
+        self.in_flight = {}
+        self.hits = 0
+        self.misses = 0
+        self.shared = 0
+
+    def call(self, key, func, ttl=None):
+        ttl = self.default_ttl if ttl is None else ttl
+        with self.lock:
+            cached = self.values.get(key)
+            if cached is not None and (cached[1] is None or time.monotonic() < cached[1]):
+                self.hits += 1
+                self.values[key] = self.values.pop(key)  # 移到最近使用的一端
+                return cached[0]
+            flight = self.in_flight.get(key)
+            leader = flight is None
+            if leader:
+                flight = _InFlight()
+                self.in_flight[key] = flight
+                self.misses += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = func()
+            if ttl is None or ttl > 0:
+                expires = time.monotonic() + ttl if ttl is not None else None
+                with self.lock:
+                    self.values.pop(key, None)
+                    self.values[key] = (flight.result, expires)
+                    self._evict()
+            return flight.result
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self.lock:
+                self.in_flight.pop(key, None)
+            flight.event.set()
+
+    def _evict(self):
+        """清理已过期的结果并把条数限制在 max_entries 以内，调用方需持有 lock"""
+        now = time.monotonic()
+        if now - self.last_sweep >= AK_CACHE_SWEEP_INTERVAL:
+            self.last_sweep = now
+            for key in [key for key, (_, expires) in self.values.items() if expires is not None and expires <= now]:
+                del self.values[key]
+        while len(self.values) > self.max_entries:
+            del self.values[next(iter(self.values))]
+
+    def clear(self):
+        """清空已缓存的结果（进行中的调用不受影响）"""
+        with self.lock:
+            self.values.clear()
+
+    def report(self):
+        print(f"akshare缓存统计: 命中 {self.hits} 次，合并并发请求 {self.shared} 次，实际请求 {self.misses} 次")
+
+
+class CachedAkshare:
+    """akshare模块的代理，用法与 ak 相同：akc.stock_zt_pool_em(date=...)
+
+    未命中缓存的实际请求经过 health 的熔断器：持续失败的接口直接抛出 CircuitOpenError，
+    调用方已有的异常处理会返回空数据，不再等待挂起的接口。
+    """
+
+    def __init__(self, module, cache, ttls=None, health=None):
+        self._module = module
+        self._cache = cache
+        self._ttls = ttls or {}
+        self._health = health or HealthRegistry()
+
+    def __getattr__(self, name):
+        func = getattr(self._module, name)
+        if not callable(func):
+            return func
+        ttl = self._ttls.get(name)
+
+        def timed(*args, **kwargs):
+            started = time.monotonic()
+            try:
+                result = func(*args, **kwargs)
+            except Exception:
+                AKSHARE_FETCH_SECONDS.observe(time.monotonic() - started, source=name, outcome='error')
+                raise
+            AKSHARE_FETCH_SECONDS.observe(time.monotonic() - started, source=name, outcome='ok')
+            if isinstance(result, pd.DataFrame):
+                AKSHARE_FETCH_ROWS.set(len(result), source=name)
+            return result
+
+        def cached(*args, **kwargs):
+            key = (name, args, tuple(sorted(kwargs.items())))
+            source = source_name(name, kwargs)
+            if source is None:
+                fetch = lambda: timed(*args, **kwargs)
+            else:
+                fetch = lambda: self._health.call(source, lambda: timed(*args, **kwargs))
+            result = self._cache.call(key, fetch, ttl)
+            # 返回DataFrame副本，调用方修改结果（如添加列）不会污染缓存
+            return result.copy() if isinstance(result, pd.DataFrame) else result
+
+        cached.__name__ = name
+        return cached
+
+    def clear(self):
+        self._cache.clear()
+
+    def health(self):
+        """各akshare接口的健康状态列表"""
+        return self._health.status()
+
+    def report(self):
+        self._cache.report()
+        self._health.report()
+
+
+# 全局共享实例，lb.py 与 server.py 都通过它调用akshare
+akc = CachedAkshare(ak, SingleFlightCache(), AK_CACHE_TTLS)
+
+metrics.counter('akshare_cache_requests_total', 'akshare调用按缓存结果统计：hit 命中，shared 合并到进行中的请求，miss 实际请求',
+                ['result'], collect=lambda: {('hit',): akc._cache.hits, ('shared',): akc._cache.shared,
+                                             ('miss',): akc._cache.misses})
@@ -0,0 +1,80 @@
+# HTML报告渲染基准：比较当前的逐段生成+一次拼接 与 指定提交中的 generate_limit_up_pool_html 在不同股池规模下的耗时
+# 用法: python benchmarks/bench_render.py [--baseline-rev 提交] [行数 ...]
+# 基线默认取改为逐段生成之前的提交（user-008 的父提交），从 git 中读出当时的 lb.py 单独导入，不影响当前代码
+import argparse
+import importlib.util
+import inspect
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import lb  # noqa: E402
+import synthetic  # noqa: E402
+
+DEFAULT_SIZES = [100, 500, 5000]
+DEFAULT_BASELINE_REV = "ad4b0ef^"  # 改为逐段生成之前的 lb.py（报告仍由 html += 逐段累加）
+REPEAT = 3
+
+
+def best_of(func, repeat=REPEAT):
+    """多次运行取最短耗时"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def load_baseline(rev, tmp_dir):
+    """从 git 读出 rev 时的 lb.py，作为独立模块导入（依赖的其他模块使用当前版本）"""
+    source = subprocess.run(["git", "show", f"{rev}:lb.py"], cwd=REPO_DIR, capture_output=True, check=True).stdout
+    path = os.path.join(tmp_dir, "lb_baseline.py")
+    with open(path, 'wb') as f:
+        f.write(source)
+    spec = importlib.util.spec_from_file_location("lb_baseline", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def baseline_renderer(module):
+    """只传入基线版本支持的参数（之后新增的数据源在旧版本中没有对应的参数）
+
+    逐段生成之后的版本中 generate_limit_up_pool_html 只是转发参数，按 iter_limit_up_pool_html 的参数过滤。
+    """
+    signature_of = getattr(module, 'iter_limit_up_pool_html', module.generate_limit_up_pool_html)
+    accepted = inspect.signature(signature_of).parameters
+
+    def render(inputs):
+        return module.generate_limit_up_pool_html(**{key: value for key, value in inputs.items() if key in accepted})
+    return render
+
+
+def run(sizes, baseline_rev):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        render_baseline = baseline_renderer(load_baseline(baseline_rev, tmp_dir))
+        file_path = os.path.join(tmp_dir, "report.html")
+        print(f"基线: {baseline_rev} 的 generate_limit_up_pool_html")
+        print(f"{'股池行数':>8}{'片段数':>8}{'HTML(KB)':>10}{'join(ms)':>10}{'写文件(ms)':>12}{'基线(ms)':>10}")
+        for rows in sizes:
+            inputs = synthetic.report_inputs(rows)
+            chunks = sum(1 for _ in lb.iter_limit_up_pool_html(**inputs))
+            size_kb = len(lb.generate_limit_up_pool_html(**inputs).encode('utf-8')) / 1024
+            join_time = best_of(lambda: lb.generate_limit_up_pool_html(**inputs))
+            write_time = best_of(lambda: lb.write_limit_up_pool_html(file_path, **inputs))
+            baseline_time = best_of(lambda: render_baseline(inputs))
+            print(f"{rows:>8}{chunks:>8}{size_kb:>10.0f}{join_time * 1000:>10.1f}{write_time * 1000:>12.1f}{baseline_time * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="HTML报告渲染基准")
+    parser.add_argument("sizes", type=int, nargs="*", default=DEFAULT_SIZES, help="股池行数")
+    parser.add_argument("--baseline-rev", default=DEFAULT_BASELINE_REV, help="作为基线的提交")
+    args = parser.parse_args()
+    run(args.sizes, args.baseline_rev)
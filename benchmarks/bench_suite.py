@@ -0,0 +1,181 @@
+# 纯Python部分的基准测试：在录制（或合成）数据的 1×/10×/100× 行数下计时，与保存的基线比较，变慢超过容差时失败
+# 用法: python benchmarks/bench_suite.py [--scales 1 10 100] [--only 名称 ...] [--update-baseline] [--tolerance 0.5] [--no-baseline-ok]
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fixtures  # noqa: E402
+import lb  # noqa: E402
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_SCALES = [1, 10, 100]
+REPEATS = {1: 5, 10: 3, 100: 1}  # 各倍数下的运行次数，取最短耗时
+DEFAULT_TOLERANCE = 0.5  # 比基线慢50%以上视为退化，耗时本身有波动，不宜设得太小
+MIN_COMPARE_SECONDS = 0.005  # 基线短于5毫秒的项计时误差太大，只显示不判定
+
+
+def scaled_inputs(inputs, factor):
+    """放大后的数据集；资金流排行由放大后的资金流重新计算，与实际流水线一致"""
+    scaled = fixtures.scale(inputs, factor)
+    scaled['fund_flow_rankings'] = lb.get_fund_flow_rankings(scaled.get('capital_flow_data'), scaled.get('industry_flow_data'))
+    return scaled
+
+
+def server_benchmarks():
+    """api_news / api_hot_rank 的发布（数据转换、序列化、预压缩）和请求处理
+
+    导入 server 需要 Flask；刷新调度器只在直接运行 server.py 时启动，这里不会访问网络。
+    """
+    import server
+    from news_feed import NewsFeed
+
+    client = server.app.test_client()
+    headers = {'Accept-Encoding': 'gzip, br'}
+
+    def publish_news(inputs):
+        server.news_feed = NewsFeed()  # 每次都从空的新闻流开始，计入去重的开销
+        server.publish_news({'cls_news': inputs['cls_news'], 'ths_news': inputs['ths_news']})
+
+    def publish_hot_rank(inputs):
+        hot_search_data = inputs.get('hot_search_data') or {}
+        server.publish_hot_rank({'hot_search_今日': hot_search_data.get('今日'), 'hot_search_1小时': hot_search_data.get('1小时'),
+                                 'hot_rank_data': inputs['hot_rank_data']})
+
+    def request(path):
+        def run(inputs):
+            response = client.get(path, headers=headers)
+            assert response.status_code == 200, f"{path} 返回 {response.status_code}"
+        return run
+
+    return {
+        'api_news:publish': (publish_news, publish_news),
+        'api_news:request': (publish_news, request('/api/news')),
+        'api_hot_rank:publish': (publish_hot_rank, publish_hot_rank),
+        'api_hot_rank:request': (publish_hot_rank, request('/api/hot-rank')),
+    }
+
+
+def benchmarks():
+    """{名称: (准备函数, 计时函数)}，两者都接收放大后的数据集"""
+    def no_setup(inputs):
+        pass
+
+    return {
+        'analyze_limit_up_statistics': (no_setup, lambda inputs: lb.analyze_limit_up_statistics(inputs['today_pool'])),
+        'get_fund_flow_rankings': (no_setup, lambda inputs: lb.get_fund_flow_rankings(
+            inputs['capital_flow_data'], inputs['industry_flow_data'])),
+        'generate_limit_up_pool_html': (no_setup, lambda inputs: lb.generate_limit_up_pool_html(**inputs)),
+        **server_benchmarks(),
+    }
+
+
+def best_of(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def run(scales, only=None):
+    """返回 (结果 {'名称@倍数x': 秒}, 数据来源)"""
+    inputs, source = fixtures.load()
+    cases = benchmarks()
+    if only:
+        unknown = set(only) - set(cases)
+        if unknown:
+            raise SystemExit(f"未知的基准项: {', '.join(sorted(unknown))}，可选: {', '.join(cases)}")
+        cases = {name: case for name, case in cases.items() if name in only}
+    results = {}
+    for factor in scales:
+        data = scaled_inputs(inputs, factor)
+        for name, (setup, func) in cases.items():
+            # 发布时服务器会打印日志，计时期间不输出
+            with contextlib.redirect_stdout(io.StringIO()):
+                setup(data)
+                elapsed = best_of(lambda: func(data), REPEATS.get(factor, 1))
+            results[f"{name}@{factor}x"] = elapsed
+            print(f"{name + '@' + str(factor) + 'x':<40}{elapsed * 1000:>12.2f} ms")
+    return results, source
+
+
+def load_baseline(path=BASELINE_FILE):
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_baseline(results, source, path=BASELINE_FILE):
+    """更新基线：保留本次没有运行的项，覆盖本次运行的项"""
+    baseline = load_baseline(path) or {'results': {}}
+    if baseline.get('source') not in (None, source):
+        baseline['results'] = {}  # 数据来源变了，旧基线不再可比
+    baseline.update({'source': source, 'python': platform.python_version(), 'machine': platform.node(),
+                     'updated_at': time.strftime('%Y-%m-%d %H:%M:%S')})
+    baseline['results'].update({key: round(value, 6) for key, value in results.items()})
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(baseline, f, ensure_ascii=False, indent=2, sort_keys=True)
+    print(f"基线已更新: {path}")
+
+
+def compare(results, source, baseline, tolerance):
+    """与基线比较，返回退化的项 [(名称, 基线秒数, 本次秒数)]；数据不同、无法比较时返回 None"""
+    if baseline.get('source') != source:
+        print(f"基线使用 {baseline.get('source')} 数据，本次使用 {source} 数据，无法比较")
+        return None
+    print(f"\n与基线比较（{baseline.get('updated_at')}，容差 {tolerance:.0%}）:")
+    regressions = []
+    missing = []
+    for key, elapsed in results.items():
+        expected = baseline['results'].get(key)
+        if expected is None:
+            print(f"{key:<40} 基线中没有该项")
+            missing.append(key)
+            continue
+        ratio = elapsed / expected if expected else float('inf')
+        regressed = expected >= MIN_COMPARE_SECONDS and ratio > 1 + tolerance
+        print(f"{key:<40}{expected * 1000:>12.2f} ms ->{elapsed * 1000:>10.2f} ms  {ratio:>6.2f}x{'  退化' if regressed else ''}")
+        if regressed:
+            regressions.append((key, expected, elapsed))
+    return None if missing else regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="纯Python部分的基准测试")
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES, help="数据行数的放大倍数")
+    parser.add_argument("--only", nargs="+", help="只运行指定的基准项")
+    parser.add_argument("--update-baseline", action="store_true", help="用本次结果更新基线，不做比较")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="允许比基线慢的比例")
+    parser.add_argument("--no-baseline-ok", action="store_true", help="没有可比较的基线时不视为失败")
+    args = parser.parse_args()
+
+    results, source = run(args.scales, args.only)
+    if args.update_baseline:
+        save_baseline(results, source)
+        return 0
+    baseline = load_baseline()
+    regressions = None
+    if baseline is None:
+        print(f"\n还没有基线（{BASELINE_FILE}），运行 --update-baseline 生成")
+    else:
+        regressions = compare(results, source, baseline, args.tolerance)
+    if regressions is None:
+        # 没有基线、数据来源变了或基线缺少本次运行的项，都无法判断是否退化
+        return 0 if args.no_baseline_ok else 2
+    if regressions:
+        print(f"\n{len(regressions)} 项比基线慢 {args.tolerance:.0%} 以上")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
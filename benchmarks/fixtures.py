@@ -0,0 +1,127 @@
+# 基准测试数据：录制一次真实的akshare数据供离线重放，并按倍数放大行数；没有录制时使用合成数据
+# 录制: python benchmarks/fixtures.py record   （需要联网，会完整运行一次报告数据抓取，包括LLM分析）
+# 无法访问上游时: python benchmarks/fixtures.py seed   （把合成数据按同样的格式写入，供基准和基线使用）
+import json
+import os
+import pickle
+import sys
+from datetime import datetime
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import synthetic  # noqa: E402
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+MANIFEST_FILE = "manifest.json"
+# 放大时在这些列后追加副本编号，保持名称唯一（代码列保留原值，股票链接等逻辑不受影响）
+SCALE_UNIQUE_COLUMNS = ('名称', '股票名称', '板块名称', '板块', '行业', '标题', '名称/代码')
+SCALE_RANK_COLUMNS = ('序号', '排名', '当前排名')
+
+
+def describe(value):
+    """数据集的行数说明：DataFrame为行数，字典为各项的行数"""
+    if isinstance(value, pd.DataFrame):
+        return len(value)
+    if isinstance(value, dict):
+        return {str(key): describe(item) for key, item in value.items()}
+    return None
+
+
+def save(data, origin, fixture_dir=FIXTURE_DIR):
+    """把各数据集逐个保存为pickle，并写入记录行数、来源和录制时间的清单（替换原有的数据）"""
+    os.makedirs(fixture_dir, exist_ok=True)
+    for name in os.listdir(fixture_dir):
+        if name.endswith('.pkl'):
+            os.remove(os.path.join(fixture_dir, name))
+    manifest = {'recorded_at': datetime.now().isoformat(timespec='seconds'), 'origin': origin,
+                'pandas': pd.__version__, 'datasets': {}}
+    for name, value in data.items():
+        with open(os.path.join(fixture_dir, f"{name}.pkl"), 'wb') as f:
+            pickle.dump(value, f, protocol=4)
+        manifest['datasets'][name] = describe(value)
+    with open(os.path.join(fixture_dir, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    print(f"已写入 {len(data)} 个数据集到 {fixture_dir}（来源: {origin}）")
+
+
+def record(fixture_dir=FIXTURE_DIR):
+    """抓取一次报告所需的全部数据集并保存"""
+    import lb
+
+    data, orchestrator = lb.fetch_report_data()
+    orchestrator.print_summary()
+    save(data, 'akshare', fixture_dir)
+    orchestrator.exit_if_late()
+
+
+def synthetic_inputs():
+    """与录制数据键相同的合成数据集（含多日涨停统计和资金流排行）"""
+    import lb
+
+    inputs = synthetic.report_inputs()
+    pools = {f"2026010{day}": synthetic.limit_up_pool(60, seed=day) for day in range(1, 9)}
+    streaks = lb.compute_limit_up_streaks(pools)
+    inputs['streak_data'] = {'dates': sorted(pools), 'min_days': lb.MIN_LIMIT_UP_DAYS,
+                             'stocks': streaks[streaks['满足条件']].drop(columns=['满足条件']).reset_index(drop=True)}
+    inputs['fund_flow_rankings'] = lb.get_fund_flow_rankings(inputs['capital_flow_data'], inputs['industry_flow_data'])
+    return inputs
+
+
+def load(fixture_dir=FIXTURE_DIR):
+    """返回 (数据集字典, 数据标识)
+
+    数据标识为 'recorded:<来源>@<录制时间>'，重新录制后旧基线不再可比；没有录制的数据时为 'synthetic'。
+    """
+    manifest_path = os.path.join(fixture_dir, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        print(f"未找到录制的数据（{manifest_path}），使用合成数据")
+        return synthetic_inputs(), 'synthetic'
+    with open(manifest_path, encoding='utf-8') as f:
+        manifest = json.load(f)
+    inputs = {}
+    for name in manifest['datasets']:
+        with open(os.path.join(fixture_dir, f"{name}.pkl"), 'rb') as f:
+            inputs[name] = pickle.load(f)
+    origin = manifest.get('origin', 'akshare')
+    print(f"使用 {manifest['recorded_at']} 录制的数据（来源: {origin}）")
+    return inputs, f"recorded:{origin}@{manifest['recorded_at']}"
+
+
+def scale_frame(df, factor):
+    """把DataFrame复制 factor 份拼接起来，名称列追加副本编号，排名列重新编号"""
+    if factor == 1 or df.empty:
+        return df
+    copies = []
+    for copy_idx in range(factor):
+        copy = df.copy()
+        if copy_idx:
+            for column in SCALE_UNIQUE_COLUMNS:
+                if column in copy.columns:
+                    copy[column] = copy[column].astype(str) + f"#{copy_idx}"
+        copies.append(copy)
+    scaled = pd.concat(copies, ignore_index=True)
+    for column in SCALE_RANK_COLUMNS:
+        if column in scaled.columns:
+            scaled[column] = range(1, len(scaled) + 1)
+    return scaled
+
+
+def scale(value, factor):
+    """按倍数放大数据集中的所有DataFrame（包括字典中嵌套的），其余值原样保留"""
+    if isinstance(value, pd.DataFrame):
+        return scale_frame(value, factor)
+    if isinstance(value, dict):
+        return {key: scale(item, factor) for key, item in value.items()}
+    return value
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ['record']:
+        record()
+    elif sys.argv[1:] == ['seed']:
+        save(synthetic_inputs(), 'synthetic')
+    else:
+        print("用法: python benchmarks/fixtures.py record|seed")
+        sys.exit(1)
@@ -0,0 +1,137 @@
+# 按akshare各接口的字段结构生成合成数据，供基准测试使用（不访问网络）
+from datetime import date, time
+
+import numpy as np
+import pandas as pd
+
+INDUSTRIES = ['电子', '医药生物', '汽车', '基础化工', '机械设备', '计算机', '传媒', '电力设备', '通信', '国防军工']
+
+
+def limit_up_pool(rows, seed=0):
+    """stock_zt_pool_em 结构的涨停股池，附带 涨停原因 列"""
+    rng = np.random.default_rng(seed)
+    prefixes = rng.choice(['60', '00', '30'], rows)
+    return pd.DataFrame({
+        '序号': np.arange(1, rows + 1),
+        '代码': [f"{prefix}{i % 10000:04d}" for i, prefix in enumerate(prefixes)],
+        '名称': [f'股票{i}' for i in range(rows)],
+        '涨跌幅': rng.uniform(4.9, 20.1, rows).round(4),
+        '最新价': rng.uniform(2, 80, rows).round(2),
+        '成交额': rng.uniform(1e7, 5e9, rows),
+        '流通市值': rng.uniform(1e9, 5e10, rows),
+        '总市值': rng.uniform(1e9, 9e10, rows),
+        '换手率': rng.uniform(0.5, 40, rows),
+        '封板资金': rng.uniform(1e6, 8e8, rows),
+        '首次封板时间': [f"{h:02d}{m:02d}{sec:02d}" for h, m, sec in zip(rng.integers(9, 15, rows), rng.integers(0, 60, rows), rng.integers(0, 60, rows))],
+        '最后封板时间': [f"{h:02d}{m:02d}{sec:02d}" for h, m, sec in zip(rng.integers(9, 15, rows), rng.integers(0, 60, rows), rng.integers(0, 60, rows))],
+        '炸板次数': rng.integers(0, 5, rows),
+        '涨停统计': [f"{a}/{b}" for a, b in zip(rng.integers(1, 5, rows), rng.integers(1, 5, rows))],
+        '连板数': rng.choice([1, 1, 1, 2, 2, 3, 4, 5], rows),
+        '所属行业': rng.choice(INDUSTRIES, rows),
+        '涨停原因': [f'热点概念{i % 17}' for i in range(rows)],
+    })
+
+
+def fund_flow(rows, instant, seed=1):
+    """stock_fund_flow_concept / stock_fund_flow_industry 结构的资金流向数据"""
+    rng = np.random.default_rng(seed)
+    data = {'序号': np.arange(1, rows + 1), '行业': [f'板块{i}' for i in range(rows)],
+            '行业指数': rng.uniform(500, 3000, rows)}
+    if instant:
+        data['行业-涨跌幅'] = rng.uniform(-3, 6, rows).round(2)
+    else:
+        data['阶段涨跌幅'] = [f"{v:.2f}%" for v in rng.uniform(-10, 10, rows)]
+    data['流入资金'] = rng.uniform(1, 80, rows).round(2)
+    data['流出资金'] = rng.uniform(1, 80, rows).round(2)
+    data['净额'] = (data['流入资金'] - data['流出资金']).round(2)
+    data['公司家数'] = rng.integers(5, 200, rows)
+    return pd.DataFrame(data)
+
+
+def fund_flow_windows(rows, seed=1):
+    return {window: fund_flow(rows, window == '即时', seed + i)
+            for i, window in enumerate(['即时', '3日', '5日', '10日', '20日'])}
+
+
+def board_concept(rows, seed=3):
+    """stock_board_concept_name_em 结构的概念板块数据"""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        '排名': np.arange(1, rows + 1), '板块名称': [f'概念{i}' for i in range(rows)],
+        '板块代码': [f'BK{i:04d}' for i in range(rows)], '最新价': rng.uniform(500, 3000, rows),
+        '涨跌额': rng.uniform(-30, 30, rows), '涨跌幅': rng.uniform(-5, 5, rows),
+        '总市值': rng.uniform(1e10, 1e12, rows), '换手率': rng.uniform(0, 10, rows),
+        '上涨家数': rng.integers(0, 100, rows), '下跌家数': rng.integers(0, 100, rows),
+        '领涨股票': [f'领涨{i}' for i in range(rows)], '领涨股票-涨跌幅': rng.uniform(-5, 20, rows)})
+
+
+def board_industry(rows, seed=4):
+    """stock_board_industry_summary_ths 结构的行业板块数据"""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        '序号': np.arange(1, rows + 1), '板块': [f'行业{i}' for i in range(rows)],
+        '涨跌幅': rng.uniform(-5, 5, rows), '总成交量': rng.uniform(1, 900, rows),
+        '总成交额': rng.uniform(1, 900, rows), '净流入': rng.uniform(-50, 50, rows),
+        '上涨家数': rng.integers(0, 100, rows), '下跌家数': rng.integers(0, 100, rows),
+        '均价': rng.uniform(3, 90, rows), '领涨股': [f'领涨股{i}' for i in range(rows)],
+        '领涨股-最新价': rng.uniform(3, 90, rows), '领涨股-涨跌幅': rng.uniform(-5, 20, rows)})
+
+
+def yyb_lhb(rows, seed=5):
+    """stock_lhb_yyb_detail_em 结构的营业部龙虎榜数据"""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        '序号': np.arange(1, rows + 1), '股票代码': [f'00{i % 10000:04d}' for i in range(rows)],
+        '股票名称': [f'龙虎{i}' for i in range(rows)],
+        '交易日期': [date(2026, 1, 1 + i % 28) for i in range(rows)],
+        '涨跌幅': rng.uniform(-10, 10, rows), '买入金额': rng.uniform(0, 1e8, rows),
+        '卖出金额': rng.uniform(0, 1e8, rows), '净额': rng.uniform(-1e8, 1e8, rows),
+        '上榜原因': ['日涨幅偏离值达7%的证券'] * rows})
+
+
+def news(rows, seed=6):
+    """stock_info_global_cls / stock_info_global_ths 结构的新闻数据"""
+    return pd.DataFrame({'标题': [f'快讯标题{seed}-{i}' for i in range(rows)], '内容': ['内容'] * rows,
+                         '发布日期': [date(2026, 1, 5)] * rows,
+                         '发布时间': [time(9 + i // 60 % 6, i % 60, 0) for i in range(rows)]})
+
+
+def hot_search(rows, seed=7):
+    """stock_hot_search_baidu 结构的百度热搜数据"""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({'名称/代码': [f'热搜{i}({600000 + i % 1000})' for i in range(rows)],
+                         '涨跌幅': [f"{v:+.2f}%" for v in rng.uniform(-5, 10, rows)],
+                         '综合热度': rng.integers(1000, 900000, rows)})
+
+
+def hot_rank(rows, seed=8):
+    """stock_hot_rank_em 结构的东方财富热度榜数据"""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({'当前排名': np.arange(1, rows + 1), '代码': [f'SZ00{i % 10000:04d}' for i in range(rows)],
+                         '股票名称': [f'人气{i}' for i in range(rows)], '最新价': rng.uniform(2, 90, rows),
+                         '涨跌额': rng.uniform(-3, 3, rows), '涨跌幅': rng.uniform(-10, 10, rows)})
+
+
+def market_activity():
+    """stock_market_activity_legu 结构的市场活跃度数据"""
+    items = ['上涨', '涨停', '真实涨停', 'st st*涨停', '下跌', '跌停', '真实跌停', 'st st*跌停', '平盘', '停牌', '活跃度', '统计日期']
+    values = [3000, 80, 60, 5, 2000, 10, 6, 2, 100, 5, '60.00%', '2026-01-05 15:00:00']
+    return pd.DataFrame({'item': items, 'value': values})
+
+
+def report_inputs(pool_rows=60):
+    """generate_limit_up_pool_html 的全部参数，涨停股池为 pool_rows 行，其余数据集使用常见规模"""
+    return {
+        'today_pool': limit_up_pool(pool_rows),
+        'yesterday_pool': limit_up_pool(50, seed=9),
+        'board_info': board_concept(300),
+        'industry_info': board_industry(90),
+        'capital_flow_data': fund_flow_windows(400),
+        'industry_flow_data': fund_flow_windows(90, seed=11),
+        'yz_lhb_data': {'陈小群': yyb_lhb(40), '章盟主': yyb_lhb(30, seed=12), '赵老哥': pd.DataFrame()},
+        'cls_news': news(20),
+        'ths_news': news(20, seed=13),
+        'hot_search_data': {'今日': hot_search(12), '1小时': hot_search(12, seed=14)},
+        'hot_rank_data': hot_rank(100),
+        'market_activity': market_activity(),
+    }
@@ -0,0 +1,99 @@
+# 响应体预压缩：内容生成时一次性压缩出 gzip / brotli 版本，请求时只按 Accept-Encoding 选择现成的字节
+import gzip
+import hashlib
+import os
+import threading
+from datetime import datetime, timezone
+
+try:
+    import brotli
+except ImportError:
+    # 未安装brotli时只提供gzip
+    brotli = None
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 9  # 11 压缩率略高但大报告要多花数秒，内容每次刷新都会重新压缩
+MIN_COMPRESS_SIZE = 1024  # 小于该字节数的内容压缩收益不大，只保留原文
+
+
+def compress_variants(body):
+    """返回 {编码: 字节} 字典，总是包含 identity（原文）"""
+    variants = {'identity': body}
+    if len(body) < MIN_COMPRESS_SIZE:
+        return variants
+    variants['gzip'] = gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+    if brotli is not None:
+        variants['br'] = brotli.compress(body, quality=BROTLI_QUALITY)
+    return variants
+
+
+def negotiate(accept_encodings, variants):
+    """按客户端的 Accept-Encoding 选择编码，优先 br 其次 gzip
+
+    accept_encodings 为 werkzeug 解析好的 request.accept_encodings。
+    """
+    offered = [encoding for encoding in ('br', 'gzip') if encoding in variants]
+    if not offered:
+        return 'identity'
+    return accept_encodings.best_match(offered) or 'identity'
+
+
+class Payload:
+    """一份预先序列化并压缩好的响应体，创建后不可修改"""
+
+    __slots__ = ('variants', 'etag', 'last_modified')
+
+    def __init__(self, variants, etag, last_modified):
+        object.__setattr__(self, 'variants', variants)
+        object.__setattr__(self, 'etag', etag)
+        object.__setattr__(self, 'last_modified', last_modified)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Payload 不可修改")
+
+
+class PrecompressedFile:
+    """磁盘文件的预压缩缓存，文件被重新生成（修改时间或大小变化）后才重新读取和压缩"""
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.stat_key = None
+        self.entry = None
+
+    def publish(self, body):
+        """发布新内容：先在内存中压缩好，再原子写入磁盘并替换当前版本，返回新的 Payload
+
+        压缩和写文件期间请求仍读取旧版本，不会被阻塞。
+        """
+        variants = compress_variants(body)
+        # 临时文件名带进程和线程编号：手动运行的 lb.py 可能与服务器同时写同一份报告
+        tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(body)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        stat = os.stat(self.path)
+        entry = Payload(variants, hashlib.sha256(body).hexdigest()[:32],
+                        datetime.fromtimestamp(int(stat.st_mtime), timezone.utc))
+        with self.lock:
+            self.stat_key = (stat.st_mtime_ns, stat.st_size)
+            self.entry = entry
+        return entry
+
+    def get(self):
+        """返回文件当前内容的 Payload；文件不存在时抛出 FileNotFoundError"""
+        stat = os.stat(self.path)
+        stat_key = (stat.st_mtime_ns, stat.st_size)
+        with self.lock:
+            if stat_key != self.stat_key:
+                with open(self.path, 'rb') as f:
+                    body = f.read()
+                self.entry = Payload(compress_variants(body), hashlib.sha256(body).hexdigest()[:32],
+                                     datetime.fromtimestamp(int(stat.st_mtime), timezone.utc))
+                self.stat_key = stat_key
+            return self.entry
@@ -0,0 +1,78 @@
+# 服务器推送（SSE）：数据更新后向所有已连接的页面推送一条小事件，页面再按需拉取变化的部分
+import json
+import queue
+import threading
+
+SSE_HEARTBEAT = 15  # 空闲时每15秒发送一次注释行，保持连接并及时发现已断开的客户端
+SSE_RETRY_MS = 5000  # 浏览器断线后的重连间隔
+SSE_CLIENT_QUEUE_SIZE = 100  # 单个客户端积压的事件数上限，超过后断开让其重连补齐
+
+
+def format_event(event, data, event_id=None):
+    """按 text/event-stream 格式编码一条事件"""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, ensure_ascii=False, separators=(',', ':'))}")
+    return "\n".join(lines) + "\n\n"
+
+
+class _Client:
+    """一个SSE连接的待发送事件队列"""
+
+    def __init__(self):
+        self.queue = queue.Queue(maxsize=SSE_CLIENT_QUEUE_SIZE)
+        self.dropped = False
+
+
+class EventBroker:
+    """把事件广播给所有已连接的SSE客户端
+
+    publish 只把编码好的事件放进各客户端的队列，不会被慢客户端阻塞；
+    积压过多的客户端会被断开，浏览器重连时带上 Last-Event-ID 补齐错过的更新。
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.clients = set()
+
+    def publish(self, event, data, event_id=None):
+        message = format_event(event, data, event_id)
+        with self.lock:
+            clients = list(self.clients)
+        for client in clients:
+            try:
+                client.queue.put_nowait(message)
+            except queue.Full:
+                client.dropped = True
+                self._remove(client)
+
+    def _remove(self, client):
+        with self.lock:
+            self.clients.discard(client)
+
+    @property
+    def client_count(self):
+        return len(self.clients)
+
+    def stream(self, initial=None):
+        """一个客户端连接的事件流生成器
+
+        initial 为可选的函数，在开始接收广播之后调用，返回连接建立时需要先发送的事件（已编码），
+        先订阅再取当前状态，保证两者之间发布的更新不会丢失。
+        """
+        client = _Client()
+        with self.lock:
+            self.clients.add(client)
+        try:
+            yield f"retry: {SSE_RETRY_MS}\n\n"
+            for message in (initial() if initial else ()):
+                yield message
+            while not client.dropped:
+                try:
+                    yield client.queue.get(timeout=SSE_HEARTBEAT)
+                except queue.Empty:
+                    yield ": ping\n\n"
+        finally:
+            self._remove(client)
@@ -2,20 +2,40 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-import akshare as ak
+from ak_cache import akc
+from metrics import LLM_REQUEST_SECONDS, LLM_TOKENS
+from profiler import profile_iter, stage, staged
+from report_format import (column_or, fmt_hhmm, fmt_int, fmt_num, fmt_str, fmt_thousands, parse_percent,
+                           render_rows, sign_class, split_name_code, stock_urls)
 import requests
 import json 
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 # 全局变量定义
 MIN_LIMIT_UP_DAYS = 3
 _market_data_cache = None
 ALI_QIAN_WEN = "sk-0cf24d6cc45a4d88bf150f8b565c1ef7"
 
+# LLM并发分析配置
+LLM_MAX_WORKERS = 8  # 同时进行的LLM请求数
+LLM_REQUESTS_PER_SECOND = 5  # 每秒最多发起的LLM请求数，0表示不限速
+LLM_MODEL = "qwen-turbo"
+LLM_BATCH_SIZE = 15  # 批量模式下每个提示词包含的股票数，设为1时逐只调用
+LLM_CACHE_ENABLED = True  # 是否使用本地缓存复用当天已分析过的涨停原因
+# 参与缓存指纹的股票字段：这些字段不变时认为涨停原因不变，价格、成交额等盘中波动字段不参与
+LLM_FINGERPRINT_FIELDS = ['名称', '代码', '所属行业', '连板数', '涨停统计', '首次封板时间']
+_llm_reason_cache = None
+_llm_reason_cache_lock = threading.Lock()
+
 
 def get_cls_news():
     """获取财联社电报数据"""
     try:
-        df = ak.stock_info_global_cls(symbol="全部")
+        df = akc.stock_info_global_cls(symbol="全部")
         print(f"成功获取财联社电报数据，共 {len(df)} 条")
         return df
     except Exception as e:
@@ -26,7 +46,7 @@ def get_cls_news():
 def get_ths_news():
     """获取同花顺财经直播数据"""
     try:
-        df = ak.stock_info_global_ths()
+        df = akc.stock_info_global_ths()
         print(f"成功获取同花顺财经直播数据，共 {len(df)} 条")
         return df
     except Exception as e:
@@ -34,10 +54,22 @@ def get_ths_news():
         return pd.DataFrame()
 
 
+def load_limit_up_pool(date):
+    """获取指定日期的涨停股池，收盘后的数据优先从本地存储读取"""
+    from pool_store import get_pool_store
+    return get_pool_store().get_or_fetch("zt_pool", date, lambda: akc.stock_zt_pool_em(date=date))
+
+
+def load_previous_limit_up_pool(date):
+    """获取指定日期的昨日涨停股池（stock_zt_pool_previous_em），收盘后的数据优先从本地存储读取"""
+    from pool_store import get_pool_store
+    return get_pool_store().get_or_fetch("zt_pool_previous", date, lambda: akc.stock_zt_pool_previous_em(date=date))
+
+
 def get_ths_limit_up_analysis():
     """获取同花顺涨停异动解读数据"""
     try:
-        df = ak.stock_zt_pool_em(date=datetime.now().strftime('%Y%m%d'))
+        df = load_limit_up_pool(datetime.now().strftime('%Y%m%d'))
         print(f"成功获取同花顺涨停异动解读数据，共 {len(df)} 条")
         return df
     except Exception as e:
@@ -48,7 +80,7 @@ def get_ths_limit_up_analysis():
 def get_stock_concepts(stock_code):
     """获取股票的概念板块信息"""
     try:
-        df = ak.stock_board_concept_cons_em(symbol=stock_code)
+        df = akc.stock_board_concept_cons_em(symbol=stock_code)
         if not df.empty:
             concepts = df['板块名称'].tolist()
             return concepts[:5]
@@ -58,19 +90,73 @@ def get_stock_concepts(stock_code):
         return []
 
 
-def analyze_limit_up_detailed(stock_name, stock_code, zt_pool_data=None):
+def find_stock_info(zt_pool_data, stock_name, stock_code):
+    """从涨停股池中查找单只股票的信息，找不到时返回空字符串（与提示词中的写法一致）"""
+    if zt_pool_data is None or zt_pool_data.empty:
+        return ""
+    stock_row = zt_pool_data[(zt_pool_data['名称'] == stock_name) | (zt_pool_data['代码'] == stock_code)]
+    if stock_row.empty:
+        return ""
+    return stock_row.iloc[0].to_dict()
+
+
+@staged('llm')
+def call_qwen_llm(prompt, max_tokens, rate_limiter=None):
+    """调用阿里千文turbo模型，成功返回输出文本，HTTP失败返回None"""
+    url = "https://dashscope.aliyuncs.com/api/v1/services/aigc/text-generation/generation"
+    headers = {
+        "Authorization": f"Bearer {ALI_QIAN_WEN}",
+        "Content-Type": "application/json"
+    }
+    data = {
+        "model": LLM_MODEL,
+        "input": {
+            "messages": [
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ]
+        },
+        "parameters": {
+            "max_tokens": max_tokens,
+            "temperature": 0,    # 重中之重：0=绝对精准输出，不脑补、不废话、不发散
+            "top_p": 0.9       # 0.9=90%概率质量，1=100%概率质量        
+        }
+    }
+    
+    if rate_limiter is not None:
+        rate_limiter.acquire()
+    started = time.monotonic()
+    try:
+        response = requests.post(url, headers=headers, json=data, timeout=30)
+    except Exception:
+        LLM_REQUEST_SECONDS.observe(time.monotonic() - started, model=LLM_MODEL, outcome='error')
+        raise
+    
+    if response.status_code == 200:
+        LLM_REQUEST_SECONDS.observe(time.monotonic() - started, model=LLM_MODEL, outcome='ok')
+        result = response.json()
+        usage = result.get('usage') or {}
+        for kind in ('input_tokens', 'output_tokens'):
+            if usage.get(kind):
+                LLM_TOKENS.inc(usage[kind], model=LLM_MODEL, kind=kind.split('_')[0])
+        return result['output']['text'].strip()
+    LLM_REQUEST_SECONDS.observe(time.monotonic() - started, model=LLM_MODEL, outcome='error')
+    print(f"LLM调用失败: {response.status_code} - {response.text}")
+    return None
+
+
+def analyze_limit_up_detailed(stock_name, stock_code, zt_pool_data=None, rate_limiter=None, concepts=None):
     """使用LLM详细分析涨停原因和概念"""
     try:
         if zt_pool_data is None or zt_pool_data.empty:
             zt_pool_data = get_ths_limit_up_analysis()
         
-        stock_info = ""
-        if not zt_pool_data.empty:
-            stock_row = zt_pool_data[(zt_pool_data['名称'] == stock_name) | (zt_pool_data['代码'] == stock_code)]
-            if not stock_row.empty:
-                stock_info = stock_row.iloc[0].to_dict()
+        stock_info = find_stock_info(zt_pool_data, stock_name, stock_code)
         
-        concepts = get_stock_concepts(stock_code)
+        if concepts is None:
+            concepts = get_stock_concepts(stock_code)
         concept_str = "、".join(concepts) if concepts else "未知"
         
         prompt = f"""请分析股票{stock_name}({stock_code})的涨停原因。
@@ -82,39 +168,14 @@ def analyze_limit_up_detailed(stock_name, stock_code, zt_pool_data=None):
         1.仅输出涨停核心热点概念和原因，直接说结果不要有无任何多余文字描述
         2.极致简洁,不超过30字,无标点,无废话"""
 
-        url = "https://dashscope.aliyuncs.com/api/v1/services/aigc/text-generation/generation"
-        headers = {
-            "Authorization": f"Bearer {ALI_QIAN_WEN}",
-            "Content-Type": "application/json"
-        }
-        data = {
-            "model": "qwen-turbo",
-            "input": {
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ]
-            },
-            "parameters": {
-                "max_tokens": 60,
-                "temperature": 0,
-                "top_p": 0.9
-            }
-        }
-        
-        response = requests.post(url, headers=headers, json=data, timeout=30)
+        reason = call_qwen_llm(prompt, 60, rate_limiter)
         
-        if response.status_code == 200:
-            result = response.json()
-            reason = result['output']['text'].strip()
+        if reason is not None:
             if len(reason) > 20:
                 reason = reason[:20]
             print(f"股票{stock_name}涨停原因分析: {reason}")
             return reason, concept_str
         else:
-            print(f"LLM调用失败: {response.status_code} - {response.text}")
             return "分析失败", concept_str
             
     except Exception as e:
@@ -122,17 +183,73 @@ def analyze_limit_up_detailed(stock_name, stock_code, zt_pool_data=None):
         return "分析失败", ""
 
 
-def analyze_limit_up_reason_with_llm(stock_name, stock_code, zt_pool_data=None):
-    """使用阿里千文turbo模型分析涨停原因"""
+class RateLimiter:
+    """线程安全的限速器，保证多个线程合计的调用频率不超过 rate 次/秒"""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0
+        self.lock = threading.Lock()
+        self.next_time = 0
+
+    def acquire(self):
+        """阻塞直到允许发起下一次调用"""
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            slot = max(self.next_time, now)
+            self.next_time = slot + self.interval
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
+def get_llm_reason_cache():
+    """获取全局LLM涨停原因缓存，首次调用时打开SQLite文件；禁用或打开失败时返回None"""
+    global _llm_reason_cache
+    if not LLM_CACHE_ENABLED:
+        return None
+    with _llm_reason_cache_lock:
+        if _llm_reason_cache is None:
+            try:
+                from llm_cache import LLMReasonCache
+                _llm_reason_cache = LLMReasonCache()
+            except Exception as e:
+                print(f"打开LLM缓存失败，本次不使用缓存: {e}")
+                return None
+        return _llm_reason_cache
+
+
+def reason_prompt_fingerprint(stock_name, stock_code, stock_info, kind="reason"):
+    """计算涨停原因提示词输入的指纹"""
+    from llm_cache import prompt_fingerprint
+    info = stock_info if isinstance(stock_info, dict) else {}
+    fields = {field: info.get(field) for field in LLM_FINGERPRINT_FIELDS}
+    return prompt_fingerprint(kind, LLM_MODEL, stock_name, str(stock_code), fields)
+
+
+def analyze_limit_up_reason_with_llm(stock_name, stock_code, zt_pool_data=None, rate_limiter=None, cache_miss=None):
+    """使用阿里千文turbo模型分析涨停原因
+
+    cache_miss 为调用方已查过缓存且未命中时的 (股票信息, 提示词指纹)，此时不再重复查询缓存（避免重复计入未命中次数）。
+    """
     try:
-        if zt_pool_data is None or zt_pool_data.empty:
-            zt_pool_data = get_ths_limit_up_analysis()
+        cache = get_llm_reason_cache()
+        trade_date = datetime.now().strftime('%Y%m%d')
+        if cache_miss is not None:
+            stock_info, fingerprint = cache_miss
+        else:
+            if zt_pool_data is None or zt_pool_data.empty:
+                zt_pool_data = get_ths_limit_up_analysis()
+            stock_info = find_stock_info(zt_pool_data, stock_name, stock_code)
+            fingerprint = reason_prompt_fingerprint(stock_name, stock_code, stock_info)
         
-        stock_info = ""
-        if not zt_pool_data.empty:
-            stock_row = zt_pool_data[(zt_pool_data['名称'] == stock_name) | (zt_pool_data['代码'] == stock_code)]
-            if not stock_row.empty:
-                stock_info = stock_row.iloc[0].to_dict()
+        # 先查本地缓存，当天同一只股票的关键信息未变化时直接复用
+        if cache is not None and cache_miss is None:
+            cached_reason = cache.get(trade_date, stock_code, fingerprint)
+            if cached_reason is not None:
+                print(f"股票{stock_name}涨停原因(缓存): {cached_reason}")
+                return cached_reason
         
         prompt = f"""请分析股票{stock_name}({stock_code})的涨停原因。
 
@@ -142,39 +259,16 @@ def analyze_limit_up_reason_with_llm(stock_name, stock_code, zt_pool_data=None):
         1.仅输出涨停核心热点概念和原因，直接说结果不要有无任何多余文字描述
         2.极致简洁,不超过30字,无标点,无废话"""
 
-        url = "https://dashscope.aliyuncs.com/api/v1/services/aigc/text-generation/generation"
-        headers = {
-            "Authorization": f"Bearer {ALI_QIAN_WEN}",
-            "Content-Type": "application/json"
-        }
-        data = {
-            "model": "qwen-turbo",
-            "input": {
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ]
-            },
-            "parameters": {
-                "max_tokens": 50,
-                "temperature": 0,    # 重中之重：0=绝对精准输出，不脑补、不废话、不发散
-                "top_p": 0.9       # 0.9=90%概率质量，1=100%概率质量        
-            }
-        }
-        
-        response = requests.post(url, headers=headers, json=data, timeout=30)
+        reason = call_qwen_llm(prompt, 50, rate_limiter)
         
-        if response.status_code == 200:
-            result = response.json()
-            reason = result['output']['text'].strip()
+        if reason is not None:
             if len(reason) > 20:
                 reason = reason[:20]
             print(f"股票{stock_name}涨停原因分析: {reason}")
+            if cache is not None and reason:
+                cache.set(trade_date, stock_code, fingerprint, reason)
             return reason
         else:
-            print(f"LLM调用失败: {response.status_code} - {response.text}")
             return "分析失败"
             
     except ImportError:
@@ -185,6 +279,174 @@ def analyze_limit_up_reason_with_llm(stock_name, stock_code, zt_pool_data=None):
         return "分析失败"
 
 
+def build_batch_reason_prompt(entries):
+    """把多只股票拼成一个结构化提示词，entries 为 [{'name', 'code', 'info', 'concepts'}]"""
+    lines = []
+    for i, entry in enumerate(entries, 1):
+        line = f"{i}. {entry['name']}({entry['code']}) 股票信息：{entry['info']}"
+        if entry.get('concepts') is not None:
+            line += f" 所属概念板块：{entry['concepts']}"
+        lines.append(line)
+    stock_lines = "\n".join(lines)
+    return f"""请分别分析以下{len(entries)}只股票的涨停原因。
+
+{stock_lines}
+
+依据所属概念板块+同花顺涨停解读总结，要求：
+1.每只股票单独输出一行，格式为：股票代码|涨停原因，按上面的顺序输出，不要遗漏
+2.仅输出涨停核心热点概念和原因，直接说结果不要有无任何多余文字描述
+3.每只极致简洁,不超过30字,无标点,无废话"""
+
+
+def parse_batch_reasons(text, codes):
+    """从批量回答中解析每只股票的涨停原因，返回 {代码: 原因}，无法解析的股票不在结果中"""
+    wanted = {str(code) for code in codes}
+    reasons = {}
+    for line in (text or "").splitlines():
+        match = re.search(r"(?<!\d)(\d{6})(?!\d)[^|｜:：]*[|｜:：]\s*(.+?)\s*$", line)
+        if not match:
+            continue
+        code, reason = match.group(1), match.group(2)
+        if code in wanted and code not in reasons and reason:
+            reasons[code] = reason[:20]
+    return reasons
+
+
+def analyze_limit_up_batch(entries, rate_limiter=None):
+    """一次LLM调用分析一批股票，返回 {代码: 原因}；调用失败时返回空字典"""
+    if not entries:
+        return {}
+    try:
+        prompt = build_batch_reason_prompt(entries)
+        # 每只股票约50个token的输出，再留一点余量给代码和分隔符
+        text = call_qwen_llm(prompt, 60 * len(entries) + 20, rate_limiter)
+        reasons = parse_batch_reasons(text, [entry['code'] for entry in entries])
+        print(f"批量分析 {len(entries)} 只股票，成功解析 {len(reasons)} 只")
+        return reasons
+    except Exception as e:
+        print(f"LLM批量分析涨停原因失败: {e}")
+        return {}
+
+
+def _split_batches(items, batch_size):
+    return [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+
+
+def analyze_limit_up_reasons(stocks, zt_pool_data=None, max_workers=LLM_MAX_WORKERS, requests_per_second=LLM_REQUESTS_PER_SECOND, batch_size=None):
+    """并发分析多只股票的涨停原因
+
+    stocks 为 [(名称, 代码), ...]，返回的原因列表与输入顺序一致；
+    名称或代码为空的股票直接记为"未知"。
+    batch_size 大于1时（默认取 LLM_BATCH_SIZE）先查缓存，未命中的股票按批打包成一个提示词，
+    批量回答中解析不出的股票再逐只调用LLM。
+    """
+    if not stocks:
+        return []
+    if zt_pool_data is None or zt_pool_data.empty:
+        zt_pool_data = get_ths_limit_up_analysis()
+    if batch_size is None:
+        batch_size = LLM_BATCH_SIZE
+
+    rate_limiter = RateLimiter(requests_per_second)
+
+    def analyze(stock):
+        stock_name, stock_code = stock
+        if not (stock_name and stock_code):
+            return "未知"
+        return analyze_limit_up_reason_with_llm(stock_name, stock_code, zt_pool_data, rate_limiter)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="llm") as executor:
+        if batch_size > 1:
+            reasons = _analyze_reasons_batched(stocks, zt_pool_data, batch_size, rate_limiter, executor)
+        else:
+            reasons = list(executor.map(analyze, stocks))
+    print(f"LLM并发分析 {len(stocks)} 只股票，耗时 {time.perf_counter() - started:.1f}s（并发 {max_workers}，限速 {requests_per_second or '不限'}次/秒，每批 {batch_size} 只）")
+    return reasons
+
+
+def _analyze_reasons_batched(stocks, zt_pool_data, batch_size, rate_limiter, executor):
+    """批量模式：缓存命中的直接返回，其余按批调用LLM，解析失败的逐只回退（回退时不再查询缓存）"""
+    cache = get_llm_reason_cache()
+    trade_date = datetime.now().strftime('%Y%m%d')
+    reasons = [None] * len(stocks)
+    pending = []
+    for i, (stock_name, stock_code) in enumerate(stocks):
+        if not (stock_name and stock_code):
+            reasons[i] = "未知"
+            continue
+        stock_info = find_stock_info(zt_pool_data, stock_name, stock_code)
+        fingerprint = reason_prompt_fingerprint(stock_name, stock_code, stock_info)
+        cached_reason = cache.get(trade_date, stock_code, fingerprint) if cache is not None else None
+        if cached_reason is not None:
+            reasons[i] = cached_reason
+            continue
+        pending.append((i, {'name': stock_name, 'code': str(stock_code), 'info': stock_info, 'fingerprint': fingerprint}))
+
+    batches = _split_batches(pending, batch_size)
+    batch_results = executor.map(lambda batch: analyze_limit_up_batch([entry for _, entry in batch], rate_limiter), batches)
+
+    fallback = []
+    for batch, parsed in zip(batches, batch_results):
+        for i, entry in batch:
+            reason = parsed.get(entry['code'])
+            if reason is None:
+                fallback.append((i, entry))
+                continue
+            reasons[i] = reason
+            if cache is not None:
+                cache.set(trade_date, entry['code'], entry['fingerprint'], reason)
+
+    if fallback:
+        print(f"{len(fallback)} 只股票批量结果无法解析，改为逐只分析")
+        def analyze(item):
+            i, entry = item
+            return analyze_limit_up_reason_with_llm(entry['name'], entry['code'], zt_pool_data, rate_limiter,
+                                                    cache_miss=(entry['info'], entry['fingerprint']))
+
+        for (i, _), reason in zip(fallback, executor.map(analyze, fallback)):
+            reasons[i] = reason
+    print(f"缓存命中 {len(stocks) - len(pending)} 只，批量调用 {len(batches)} 次，逐只回退 {len(fallback)} 只")
+    return reasons
+
+
+def analyze_limit_up_detailed_batch(stocks, zt_pool_data=None, max_workers=LLM_MAX_WORKERS, requests_per_second=LLM_REQUESTS_PER_SECOND, batch_size=None):
+    """批量版 analyze_limit_up_detailed，返回与输入顺序一致的 [(原因, 概念), ...]"""
+    if not stocks:
+        return []
+    if zt_pool_data is None or zt_pool_data.empty:
+        zt_pool_data = get_ths_limit_up_analysis()
+    if batch_size is None:
+        batch_size = LLM_BATCH_SIZE
+    batch_size = max(1, batch_size)
+
+    rate_limiter = RateLimiter(requests_per_second)
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="llm") as executor:
+        concept_lists = list(executor.map(lambda stock: get_stock_concepts(stock[1]), stocks))
+        entries = []
+        for (stock_name, stock_code), concepts in zip(stocks, concept_lists):
+            entries.append({
+                'name': stock_name,
+                'code': str(stock_code),
+                'info': find_stock_info(zt_pool_data, stock_name, stock_code),
+                'concepts': "、".join(concepts) if concepts else "未知"
+            })
+        batches = _split_batches(entries, batch_size)
+        parsed = {}
+        for batch_parsed in executor.map(lambda batch: analyze_limit_up_batch(batch, rate_limiter), batches):
+            parsed.update(batch_parsed)
+
+        def analyze(index):
+            reason = parsed.get(entries[index]['code'])
+            if reason is not None:
+                return reason, entries[index]['concepts']
+            stock_name, stock_code = stocks[index]
+            return analyze_limit_up_detailed(stock_name, stock_code, zt_pool_data, rate_limiter, concept_lists[index])
+
+        return list(executor.map(analyze, range(len(stocks))))
+
+
+@staged('transform')
 def analyze_limit_up_statistics(today_pool):
     """分析涨停股池统计数据"""
     if today_pool.empty:
@@ -199,11 +461,9 @@ def analyze_limit_up_statistics(today_pool):
     industry_stats = today_pool['所属行业'].value_counts().to_dict()
     
     # 行业股票列表
-    industry_stocks = {}
-    for industry in today_pool['所属行业'].unique():
-        stocks_in_industry = today_pool[today_pool['所属行业'] == industry][['名称', '代码']]
-        stock_list = [f"{row['名称']}({row['代码']})" for _, row in stocks_in_industry.iterrows()]
-        industry_stocks[industry] = stock_list
+    stock_labels = pd.Series(fmt_str(today_pool['名称']) + '(' + fmt_str(today_pool['代码']) + ')', index=today_pool.index)
+    grouped_labels = stock_labels.groupby(today_pool['所属行业'], sort=False).agg(list)
+    industry_stocks = {industry: grouped_labels.get(industry, []) for industry in today_pool['所属行业'].unique()}
     
     # 概念统计（从涨停原因中提取）
     concept_stats = {}
@@ -233,23 +493,15 @@ def get_today_limit_up_pool():
     """获取今天涨停股池数据"""
     try:
         today = datetime.now().strftime('%Y%m%d')
-        df = ak.stock_zt_pool_em(date=today)
+        df = load_limit_up_pool(today)
         print(f"成功获取今天涨停股池数据，共 {len(df)} 只股票")
         
         if not df.empty:
             print("\n开始分析涨停原因...")
-            zt_pool_data = get_ths_limit_up_analysis()
-            
-            limit_up_reasons = []
-            for idx, row in df.iterrows():
-                stock_name = row.get('名称', '')
-                stock_code = row.get('代码', '')
-                
-                if stock_name and stock_code:
-                    reason = analyze_limit_up_reason_with_llm(stock_name, stock_code, zt_pool_data)
-                    limit_up_reasons.append(reason)
-                else:
-                    limit_up_reasons.append("未知")
+            # 同花顺涨停解读与今天的涨停股池是同一份数据，直接传入，不再重新获取和写入本地存储
+            stocks = list(zip(df['名称'].fillna(''), df['代码'].fillna('')))
+            with stage('llm:analyze_limit_up_reasons', 'llm'):
+                limit_up_reasons = analyze_limit_up_reasons(stocks, df)
             
             df['涨停原因'] = limit_up_reasons
             print(f"涨停原因分析完成，共分析 {len(limit_up_reasons)} 只股票")
@@ -277,11 +529,136 @@ def get_stock_url(stock_code):
         return f"https://quote.eastmoney.com/{stock_code_str}.html"
 
 
+STREAK_WINDOW_DAYS = 8  # 多日涨停统计窗口（交易日数）
+
+
+def get_recent_trade_dates(days, end_date=None):
+    """获取截至 end_date（默认今天）的最近 days 个交易日，格式 YYYYMMDD，按时间升序"""
+    end_date = end_date or datetime.now().strftime('%Y%m%d')
+    try:
+        calendar = akc.tool_trade_date_hist_sina()
+        trade_dates = pd.to_datetime(calendar['trade_date']).dt.strftime('%Y%m%d')
+        trade_dates = trade_dates[trade_dates <= end_date]
+        return trade_dates.tail(days).tolist()
+    except Exception as e:
+        # 交易日历获取失败时退回按工作日推算（不考虑节假日）
+        print(f"获取交易日历失败，按工作日推算: {e}")
+        workdays = pd.bdate_range(end=pd.Timestamp(end_date), periods=days)
+        return workdays.strftime('%Y%m%d').tolist()
+
+
+def load_limit_up_window(days=STREAK_WINDOW_DAYS, max_workers=4):
+    """加载最近 days 个交易日的涨停股池，返回 {日期: DataFrame}
+
+    收盘定型的历史股池缓存在 _market_data_cache 中，同一进程内重复运行只重新获取当天的股池；
+    跨进程则由本地股池存储避免重复下载。
+    """
+    global _market_data_cache
+    from pool_store import is_final
+
+    trade_dates = get_recent_trade_dates(days)
+    if _market_data_cache is None:
+        _market_data_cache = {}
+    cached_pools = _market_data_cache.setdefault('pools', {})
+
+    def load(date):
+        if date in cached_pools:
+            return cached_pools[date]
+        try:
+            df = load_limit_up_pool(date)
+        except Exception as e:
+            print(f"获取 {date} 涨停股池失败: {e}")
+            return pd.DataFrame()
+        if is_final(date) and not df.empty:
+            cached_pools[date] = df
+        return df
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="zt-window") as executor:
+        pools = dict(zip(trade_dates, executor.map(load, trade_dates)))
+
+    # 只保留窗口内的日期，避免缓存无限增长
+    for date in list(cached_pools):
+        if date not in pools:
+            del cached_pools[date]
+    _market_data_cache['dates'] = trade_dates
+    return pools
+
+
+@staged('transform')
+def compute_limit_up_streaks(pools, min_days=MIN_LIMIT_UP_DAYS):
+    """由多日涨停股池计算每只股票的涨停次数和连板情况
+
+    把股池展开成 股票×交易日 的布尔矩阵，一次向量化计算出：
+    涨停次数、截至最后一日的连续涨停天数、窗口内最长连续涨停天数，以及是否满足"N日内至少 min_days 次涨停"。
+    返回按涨停次数、当前连续天数降序排列的DataFrame。
+    """
+    dates = sorted(pools)
+    frames = []
+    for day_idx, date in enumerate(dates):
+        df = pools[date]
+        if df is None or df.empty or '代码' not in df.columns:
+            continue
+        columns = [col for col in ['代码', '名称', '所属行业'] if col in df.columns]
+        frame = df[columns].copy()
+        frame['day_idx'] = day_idx
+        frames.append(frame)
+
+    columns = ['代码', '名称', '所属行业', '涨停次数', '当前连续', '最长连续', '最近涨停', '涨停分布', '满足条件']
+    if not frames:
+        return pd.DataFrame(columns=columns)
+
+    long_df = pd.concat(frames, ignore_index=True)
+    codes, uniques = pd.factorize(long_df['代码'].astype(str))
+    matrix = np.zeros((len(uniques), len(dates)), dtype=bool)
+    matrix[codes, long_df['day_idx'].to_numpy()] = True
+
+    counts = matrix.sum(axis=1)
+    # 从最后一日往前连续为True的天数
+    current_streak = np.cumprod(matrix[:, ::-1], axis=1).sum(axis=1)
+    # 最长连续：累计和减去最近一次中断位置的累计和
+    cumulative = np.cumsum(matrix, axis=1)
+    last_break = np.maximum.accumulate(np.where(matrix, 0, cumulative), axis=1)
+    longest_streak = (cumulative - last_break).max(axis=1)
+    last_day = len(dates) - 1 - np.argmax(matrix[:, ::-1], axis=1)
+    pattern = np.where(matrix, '●', '○')
+
+    # 名称和行业取最近一次出现时的值
+    latest = long_df.assign(code_idx=codes).sort_values('day_idx').drop_duplicates('code_idx', keep='last').set_index('code_idx')
+    result = pd.DataFrame({
+        '代码': uniques,
+        '名称': latest['名称'].reindex(range(len(uniques))).to_numpy() if '名称' in latest else '',
+        '所属行业': latest['所属行业'].reindex(range(len(uniques))).to_numpy() if '所属行业' in latest else '',
+        '涨停次数': counts,
+        '当前连续': current_streak,
+        '最长连续': longest_streak,
+        '最近涨停': np.asarray(dates)[last_day],
+        '涨停分布': [''.join(row) for row in pattern],
+        '满足条件': counts >= min_days
+    })
+    return result.sort_values(['涨停次数', '当前连续', '最长连续'], ascending=False, kind='stable').reset_index(drop=True)
+
+
+def get_multi_day_limit_up_stocks(days=STREAK_WINDOW_DAYS, min_days=MIN_LIMIT_UP_DAYS):
+    """统计最近 days 个交易日内涨停不少于 min_days 次的股票
+
+    返回 {'dates': 交易日列表, 'min_days': min_days, 'stocks': 满足条件的股票DataFrame}
+    """
+    try:
+        pools = load_limit_up_window(days)
+        streaks = compute_limit_up_streaks(pools, min_days)
+        stocks = streaks[streaks['满足条件']].drop(columns=['满足条件']).reset_index(drop=True)
+        print(f"近{days}个交易日涨停不少于{min_days}次的股票共 {len(stocks)} 只")
+        return {'dates': sorted(pools), 'min_days': min_days, 'stocks': stocks}
+    except Exception as e:
+        print(f"多日涨停统计失败: {e}")
+        return {'dates': [], 'min_days': min_days, 'stocks': pd.DataFrame()}
+
+
 def get_yesterday_limit_up_pool():
     """获取昨日涨停股池数据"""
     try:
         yesterday = (datetime.now() - timedelta(days=1)).strftime('%Y%m%d')
-        df = ak.stock_zt_pool_previous_em(date=yesterday)
+        df = load_previous_limit_up_pool(yesterday)
         print(f"成功获取昨日涨停股池数据，共 {len(df)} 只股票")
         return df
     except Exception as e:
@@ -292,7 +669,7 @@ def get_yesterday_limit_up_pool():
 def get_board_concept_info():
     """获取概念板块信息数据"""
     try:
-        df = ak.stock_board_concept_name_em()
+        df = akc.stock_board_concept_name_em()
         print(f"成功获取概念板块信息数据，共 {len(df)} 个板块")
         return df
     except Exception as e:
@@ -303,7 +680,7 @@ def get_board_concept_info():
 def get_board_industry_info():
     """获取行业板块信息数据"""
     try:
-        df = ak.stock_board_industry_summary_ths()
+        df = akc.stock_board_industry_summary_ths()
         print(f"成功获取行业板块信息数据，共 {len(df)} 个板块")
         return df
     except Exception as e:
@@ -311,119 +688,125 @@ def get_board_industry_info():
         return pd.DataFrame()
 
 
-def get_capital_flow_data():
-    """获取资金流向数据"""
+# 资金流向排行窗口：报告中的键 -> akshare symbol 参数
+FUND_FLOW_WINDOWS = {
+    "即时": "即时",
+    "3日": "3日排行",
+    "5日": "5日排行",
+    "10日": "10日排行",
+    "20日": "20日排行"
+}
+
+
+def get_concept_flow(window):
+    """获取单个窗口的概念资金流向数据"""
     try:
-        # 获取即时资金流向
-        realtime_df = ak.stock_fund_flow_concept(symbol="即时")
-        print(f"成功获取即时资金流向数据，共 {len(realtime_df)} 个概念板块")
-        
-        # 获取3日排行
-        day3_df = ak.stock_fund_flow_concept(symbol="3日排行")
-        print(f"成功获取3日资金流向排行，共 {len(day3_df)} 个概念板块")
-        
-        # 获取5日排行
-        day5_df = ak.stock_fund_flow_concept(symbol="5日排行")
-        print(f"成功获取5日资金流向排行，共 {len(day5_df)} 个概念板块")
-        
-        # 获取10日排行
-        day10_df = ak.stock_fund_flow_concept(symbol="10日排行")
-        print(f"成功获取10日资金流向排行，共 {len(day10_df)} 个概念板块")
-        
-        # 获取20日排行
-        day20_df = ak.stock_fund_flow_concept(symbol="20日排行")
-        print(f"成功获取20日资金流向排行，共 {len(day20_df)} 个概念板块")
-        
-        return {
-            "即时": realtime_df,
-            "3日": day3_df,
-            "5日": day5_df,
-            "10日": day10_df,
-            "20日": day20_df
-        }
+        df = akc.stock_fund_flow_concept(symbol=FUND_FLOW_WINDOWS[window])
+        print(f"成功获取{window}概念资金流向数据，共 {len(df)} 个概念板块")
+        return df
     except Exception as e:
-        print(f"获取资金流向数据失败: {e}")
-        return {}
+        print(f"获取{window}概念资金流向数据失败: {e}")
+        return pd.DataFrame()
+
+
+def get_industry_flow(window):
+    """获取单个窗口的行业资金流向数据"""
+    try:
+        df = akc.stock_fund_flow_industry(symbol=FUND_FLOW_WINDOWS[window])
+        print(f"成功获取{window}行业资金流向数据，共 {len(df)} 个行业")
+        return df
+    except Exception as e:
+        print(f"获取{window}行业资金流向数据失败: {e}")
+        return pd.DataFrame()
+
+
+def get_capital_flow_data():
+    """获取资金流向数据"""
+    return {window: get_concept_flow(window) for window in FUND_FLOW_WINDOWS}
+
 
 def get_industry_flow_data():
     """获取行业资金流向数据"""
-    try:
-        # 获取即时资金流向
-        realtime_df = ak.stock_fund_flow_industry(symbol="即时")
-        print(f"成功获取即时行业资金流向数据，共 {len(realtime_df)} 个行业")
-        
-        # 获取3日排行
-        day3_df = ak.stock_fund_flow_industry(symbol="3日排行")
-        print(f"成功获取3日行业资金流向排行，共 {len(day3_df)} 个行业")
-        
-        # 获取5日排行
-        day5_df = ak.stock_fund_flow_industry(symbol="5日排行")
-        print(f"成功获取5日行业资金流向排行，共 {len(day5_df)} 个行业")
-        
-        # 获取10日排行
-        day10_df = ak.stock_fund_flow_industry(symbol="10日排行")
-        print(f"成功获取10日行业资金流向排行，共 {len(day10_df)} 个行业")
-        
-        # 获取20日排行
-        day20_df = ak.stock_fund_flow_industry(symbol="20日排行")
-        print(f"成功获取20日行业资金流向排行，共 {len(day20_df)} 个行业")
-        
-        return {
-            "即时": realtime_df,
-            "3日": day3_df,
-            "5日": day5_df,
-            "10日": day10_df,
-            "20日": day20_df
+    return {window: get_industry_flow(window) for window in FUND_FLOW_WINDOWS}
+
+
+FUND_FLOW_TOP_N = 20  # 资金流排行每个窗口保留的前N/后N名
+
+
+def rank_fund_flow(flow_data, top_n=FUND_FLOW_TOP_N):
+    """按净额对每个窗口取净流入前N名和后N名
+
+    使用 nlargest/nsmallest 部分选择，不对整表排序；结果保留原始索引（报告中的排名列由索引生成）。
+    空表或缺少 净额 列的窗口不出现在结果中。
+    """
+    rankings = {}
+    for window, df in (flow_data or {}).items():
+        if df is None or df.empty or '净额' not in df.columns:
+            continue
+        net_amount = pd.to_numeric(df['净额'], errors='coerce')
+        rankings[window] = {
+            'top': df.loc[net_amount.nlargest(top_n).index],
+            'bottom': df.loc[net_amount.nsmallest(top_n).index]
         }
-    except Exception as e:
-        print(f"获取行业资金流向数据失败: {e}")
-        return {}
+    return rankings
+
+
+def get_fund_flow_rankings(capital_flow_data, industry_flow_data, top_n=FUND_FLOW_TOP_N):
+    """概念与行业资金流各窗口的排行，每次刷新数据后计算一次，供HTML报告和JSON接口共用"""
+    return {
+        'concept': rank_fund_flow(capital_flow_data, top_n),
+        'industry': rank_fund_flow(industry_flow_data, top_n)
+    }
+
+
+def fund_flow_rankings_to_records(rankings):
+    """把资金流排行转换为可JSON序列化的结构，rank 为在原始数据中的位置"""
+    result = {}
+    for kind, windows in rankings.items():
+        result[kind] = {}
+        for window, ranked in windows.items():
+            result[kind][window] = {}
+            for side, df in ranked.items():
+                records = df.astype(object).where(df.notna(), None).to_dict('records')
+                for position, record in zip(df.index, records):
+                    record['rank'] = int(position) + 1
+                result[kind][window][side] = records
+    return result
+
 
 def get_yyb_lhb_data(yyb_code="210204000015668"):
     """获取营业部龙虎榜数据"""
     try:
-        lhb_df = ak.stock_lhb_yyb_detail_em(symbol=yyb_code)
+        lhb_df = akc.stock_lhb_yyb_detail_em(symbol=yyb_code)
         print(f"成功获取营业部龙虎榜数据，共 {len(lhb_df)} 条记录")
         return lhb_df
     except Exception as e:
         print(f"获取营业部龙虎榜数据失败: {e}")
         return pd.DataFrame()
 
-def get_hot_search_data():
-    """获取百度热搜股票数据"""
+def get_hot_search_baidu(time_range):
+    """获取百度热搜股票数据（time_range: 今日 / 1小时）"""
     try:
         today_str = datetime.now().strftime('%Y%m%d')
-        print(f"尝试获取百度热搜股票数据，日期: {today_str}")
-        
-        try:
-            hot_today_df = ak.stock_hot_search_baidu(symbol="A股", date=today_str, time="今日")
-            print(f"成功获取百度热搜股票数据（今日），共 {len(hot_today_df)} 条记录")
-            if not hot_today_df.empty:
-                print(f"今日热搜数据列名: {hot_today_df.columns.tolist()}")
-        except Exception as e:
-            print(f"获取今日热搜数据失败: {e}")
-            hot_today_df = pd.DataFrame()
-        
-        try:
-            hot_hour_df = ak.stock_hot_search_baidu(symbol="A股", date=today_str, time="1小时")
-            print(f"成功获取百度热搜股票数据（1小时），共 {len(hot_hour_df)} 条记录")
-            if not hot_hour_df.empty:
-                print(f"1小时热搜数据列名: {hot_hour_df.columns.tolist()}")
-        except Exception as e:
-            print(f"获取1小时热搜数据失败: {e}")
-            hot_hour_df = pd.DataFrame()
-        
-        return {"今日": hot_today_df, "1小时": hot_hour_df}
+        df = akc.stock_hot_search_baidu(symbol="A股", date=today_str, time=time_range)
+        print(f"成功获取百度热搜股票数据（{time_range}），共 {len(df)} 条记录")
+        if not df.empty:
+            print(f"{time_range}热搜数据列名: {df.columns.tolist()}")
+        return df
     except Exception as e:
-        print(f"获取百度热搜股票数据失败: {e}")
-        import traceback
-        traceback.print_exc()
-        return {"今日": pd.DataFrame(), "1小时": pd.DataFrame()}
+        print(f"获取{time_range}热搜数据失败: {e}")
+        return pd.DataFrame()
+
+
+def get_hot_search_data():
+    """获取百度热搜股票数据"""
+    print(f"尝试获取百度热搜股票数据，日期: {datetime.now().strftime('%Y%m%d')}")
+    return {"今日": get_hot_search_baidu("今日"), "1小时": get_hot_search_baidu("1小时")}
 
 def get_hot_rank_em():
     """获取东方财富热度榜数据"""
     try:
-        hot_rank_df = ak.stock_hot_rank_em()
+        hot_rank_df = akc.stock_hot_rank_em()
         print(f"成功获取东方财富热度榜数据，共 {len(hot_rank_df)} 条记录")
         return hot_rank_df
     except Exception as e:
@@ -433,2127 +816,2312 @@ def get_hot_rank_em():
         return pd.DataFrame()
 
 
-
-
-
-def generate_limit_up_pool_html(today_pool, yesterday_pool, board_info, industry_info, capital_flow_data=None, industry_flow_data=None, yz_lhb_data=None, cls_news=None, ths_news=None, hot_search_data=None, hot_rank_data=None):
-    # 获取股票市场活跃度数据
+def get_market_activity():
+    """获取股票市场活跃度数据"""
     try:
-        market_activity = ak.stock_market_activity_legu()
+        market_activity = akc.stock_market_activity_legu()
         print(f"成功获取股票市场活跃度数据")
+        return market_activity
     except Exception as e:
         print(f"获取股票市场活跃度数据失败: {e}")
-        market_activity = pd.DataFrame()
-    
-    # 如果没有提供新闻数据，则获取
-    if cls_news is None:
-        cls_news = get_cls_news()
-    if ths_news is None:
-        ths_news = get_ths_news()
-    
-    # 生成新闻HTML
-    news_html = ""
-    news_items = []
-    icons = ['📰', '📊', '💹', '📈', '💼', '🏢', '💡', '⚡', '🔔', '📢']
-    
-    # 添加财联社新闻
-    if not cls_news.empty:
-        for idx, row in cls_news.iterrows():
-            title = str(row.get('标题', ''))
-            time_str = str(row.get('发布时间', ''))
-            icon = icons[idx % len(icons)]
-            news_items.append(f"<span class='news-item'>{icon} [财联社 {time_str}] {title}</span>")
-    
-    # 添加同花顺新闻
-    if not ths_news.empty:
-        start_idx = len(news_items)
-        for idx, row in ths_news.iterrows():
-            title = str(row.get('标题', ''))
-            time_str = str(row.get('发布时间', ''))
-            icon = icons[(start_idx + idx) % len(icons)]
-            news_items.append(f"<span class='news-item'>{icon} [同花顺 {time_str}] {title}</span>")
-    
-    # 如果有新闻，则使用新闻数据
-    if news_items:
-        # 重复新闻以实现无缝滚动
-        news_html = '\n                    '.join(news_items + news_items)
+        return pd.DataFrame()
+
+
+# 定义游资列表（游资名称: 营业部代码列表，支持多个ID）
+YZ_LIST = {
+    "陈小群": ["10030463"],
+    "章盟主": ["10000526029"],
+    "赵老哥": ["10023543"],
+    "炒股养家": ["10028416","10028419"],
+    "宁波桑田路": ["10456710"],
+    "逍闲派": ["10026729"]
+}
+
+
+@staged('transform')
+def merge_yz_lhb_data(yyb_frames):
+    """合并同一游资多个营业部的龙虎榜数据，只保留前40条"""
+    all_data = [data for data in yyb_frames if not data.empty]
+    if not all_data:
+        return pd.DataFrame()
+    merged = pd.concat(all_data, ignore_index=True)
+    if '序号' in merged.columns:
+        merged = merged[merged['序号'] <= 40]
+    return merged
+
+
+# 各数据源的超时时间（秒），未列出的使用 FETCH_DEFAULT_TIMEOUT
+FETCH_MAX_WORKERS = 8
+FETCH_DEFAULT_TIMEOUT = 60
+FETCH_TIMEOUTS = {
+    "today_pool": 900,  # 含逐只股票的LLM分析
+}
+
+
+def fetch_report_data(max_workers=FETCH_MAX_WORKERS, timeouts=None, yz_list=None, provided=None):
+    """并发获取生成报告所需的全部数据
+
+    各数据源声明为依赖图交给 FetchOrchestrator 执行，返回 (数据字典, 编排器)。
+    数据字典的键与 generate_limit_up_pool_html 的参数名一致。
+    provided 为调用方已有的数据（如服务器缓存的新闻、热点、资金流），其中的键直接使用，不再抓取。
+    """
+    from orchestrator import FetchOrchestrator
+
+    timeouts = dict(FETCH_TIMEOUTS, **(timeouts or {}))
+    yz_list = yz_list or YZ_LIST
+    provided = provided or {}
+    orch = FetchOrchestrator(max_workers=max_workers, default_timeout=FETCH_DEFAULT_TIMEOUT)
+
+    def add(name, func, deps=(), default=pd.DataFrame):
+        if name in provided:
+            return orch.add(name, lambda: provided[name], default=default)
+        # --profile 时每个任务作为一个阶段统计：没有依赖的是抓取，汇总依赖结果的是数据处理
+        kind = 'transform' if deps else 'fetch'
+        return orch.add(name, lambda *args: timed_task(name, kind, func, args), deps,
+                        timeout=timeouts.get(name), default=default)
+
+    def timed_task(name, kind, func, args):
+        with stage(f"{kind}:{name}", kind):
+            return func(*args)
+
+    add("today_pool", get_today_limit_up_pool)
+    add("yesterday_pool", get_yesterday_limit_up_pool)
+    add("board_info", get_board_concept_info)
+    add("industry_info", get_board_industry_info)
+    add("market_activity", get_market_activity)
+    add("cls_news", get_cls_news)
+    add("ths_news", get_ths_news)
+    add("hot_rank_data", get_hot_rank_em)
+    add("streak_data", get_multi_day_limit_up_stocks, default=None)
+
+    # 资金流向：10个窗口各自独立抓取，再汇总成字典
+    concept_tasks = [add(f"concept_flow_{w}", lambda w=w: get_concept_flow(w))
+                     for w in FUND_FLOW_WINDOWS if "capital_flow_data" not in provided]
+    industry_tasks = [add(f"industry_flow_{w}", lambda w=w: get_industry_flow(w))
+                      for w in FUND_FLOW_WINDOWS if "industry_flow_data" not in provided]
+    add("capital_flow_data", lambda *dfs: dict(zip(FUND_FLOW_WINDOWS, dfs)), concept_tasks, default=dict)
+    add("industry_flow_data", lambda *dfs: dict(zip(FUND_FLOW_WINDOWS, dfs)), industry_tasks, default=dict)
+    add("fund_flow_rankings", get_fund_flow_rankings, ["capital_flow_data", "industry_flow_data"], default=None)
+
+    # 百度热搜：今日 / 1小时
+    hot_search_tasks = [add(f"hot_search_{t}", lambda t=t: get_hot_search_baidu(t))
+                        for t in ("今日", "1小时") if "hot_search_data" not in provided]
+    add("hot_search_data", lambda today_df, hour_df: {"今日": today_df, "1小时": hour_df}, hot_search_tasks, default=dict)
+
+    # 游资龙虎榜：每个营业部独立抓取，再按游资合并
+    yz_tasks = {}
+    for yz_name, yyb_codes in yz_list.items():
+        deps = [add(f"lhb_{yz_name}_{code}", lambda code=code: get_yyb_lhb_data(yyb_code=code)) for code in yyb_codes]
+        yz_tasks[yz_name] = add(f"lhb_{yz_name}", lambda *dfs: merge_yz_lhb_data(dfs), deps)
+    add("yz_lhb_data", lambda *dfs: dict(zip(yz_tasks, dfs)), list(yz_tasks.values()), default=dict)
+
+    results = orch.run()
+    data_keys = ["today_pool", "yesterday_pool", "board_info", "industry_info", "capital_flow_data",
+                 "industry_flow_data", "yz_lhb_data", "cls_news", "ths_news", "hot_search_data",
+                 "hot_rank_data", "market_activity", "streak_data", "fund_flow_rankings"]
+    return {key: results[key] for key in data_keys}, orch
+
+
+# ========== 报告表格行渲染 ==========
+# 每个表格先按列一次性算出显示文本（数值格式、亿元换算、时间格式、行情链接、涨跌样式），
+# 再用 render_rows 按模板拼接成整段HTML，不再逐行 iterrows 格式化
+
+STOCK_LINK_STYLE = 'style="color: #3498db; text-decoration: none; font-weight: 500;"'
+
+
+def render_news_items(news_df, source, start_idx=0):
+    """新闻滚动条的条目列表"""
+    icons = np.array(['📰', '📊', '💹', '📈', '💼', '🏢', '💡', '⚡', '🔔', '📢'], dtype=object)
+    icon = icons[(news_df.index.to_numpy() + start_idx) % len(icons)]
+    title = fmt_str(column_or(news_df, '标题', ''))
+    time_str = fmt_str(column_or(news_df, '发布时间', ''))
+    items = "<span class='news-item'>" + icon + f" [{source} " + time_str + "] " + title + "</span>"
+    return list(items)
+
+
+def render_lianban_stocks(group):
+    """连板卡片中的股票列表"""
+    return render_rows("""
+                        <div class="lianban-stock-item" style="cursor: pointer; transition: all 0.3s ease;" onclick="window.open('{url}', '_blank')">
+                            <div class="stock-code">{code}</div>
+                            <div class="stock-name">{name}</div>
+                            <div class="stock-change {change_class}">{change}%</div>
+                        </div>
+                    """, {
+        'url': stock_urls(group['代码']),
+        'code': fmt_str(group['代码']),
+        'name': fmt_str(group['名称']),
+        'change_class': sign_class(group['涨跌幅']),
+        'change': fmt_num(group['涨跌幅']),
+    })
+
+
+def render_limit_up_rows(df):
+    """涨停股池表格行"""
+    return render_rows("""
+                        <tr>
+                            <td>{seq}</td>
+                            <td>{code}</td>
+                            <td><a href="{url}" target="_blank" """ + STOCK_LINK_STYLE + """>{name}</a></td>
+                            <td class="{change_class}">{change}</td>
+                            <td>{price}</td>
+                            <td>{amount}</td>
+                            <td>{float_cap}</td>
+                            <td>{turnover}</td>
+                            <td>{seal_fund}</td>
+                            <td>{first_time}</td>
+                            <td>{last_time}</td>
+                            <td>{broken}</td>
+                            <td>{stats}</td>
+                            <td>{boards}</td>
+                            <td>{industry}</td>
+                            <td style="color: #e74c3c; font-weight: 500;">{reason}</td>
+                        </tr>
+            """, {
+        'seq': fmt_int(df['序号']),
+        'code': fmt_str(df['代码']),
+        'url': stock_urls(df['代码']),
+        'name': fmt_str(df['名称']),
+        'change_class': sign_class(df['涨跌幅']),
+        'change': fmt_num(df['涨跌幅']),
+        'price': fmt_num(df['最新价']),
+        'amount': fmt_num(df['成交额'], scale=100000000),
+        'float_cap': fmt_num(df['流通市值'], scale=100000000),
+        'turnover': fmt_num(df['换手率']),
+        'seal_fund': fmt_num(df['封板资金'], scale=100000000),
+        'first_time': fmt_hhmm(df['首次封板时间']),
+        'last_time': fmt_hhmm(df['最后封板时间']),
+        'broken': fmt_int(df['炸板次数']),
+        'stats': fmt_str(df['涨停统计']),
+        'boards': fmt_int(df['连板数']),
+        'industry': fmt_str(df['所属行业']),
+        'reason': fmt_str(column_or(df, '涨停原因', '未知')),
+    })
+
+
+def render_streak_rows(df):
+    """多日涨停统计表格行"""
+    return render_rows("""
+                        <tr>
+                            <td>{seq}</td>
+                            <td>{code}</td>
+                            <td><a href="{url}" target="_blank" """ + STOCK_LINK_STYLE + """>{name}</a></td>
+                            <td>{industry}</td>
+                            <td class="positive">{count}</td>
+                            <td>{current}</td>
+                            <td>{longest}</td>
+                            <td>{last_date}</td>
+                            <td style="letter-spacing: 2px; color: #e74c3c;">{pattern}</td>
+                        </tr>
+                """, {
+        'seq': fmt_str(df.index.to_series() + 1),
+        'code': fmt_str(df['代码']),
+        'url': stock_urls(df['代码']),
+        'name': fmt_str(df['名称']),
+        'industry': fmt_str(df['所属行业']),
+        'count': fmt_int(df['涨停次数']),
+        'current': fmt_int(df['当前连续']),
+        'longest': fmt_int(df['最长连续']),
+        'last_date': fmt_str(df['最近涨停']),
+        'pattern': fmt_str(df['涨停分布']),
+    })
+
+
+def render_hot_search_rows(df):
+    """百度热搜表格行，名称/代码 列拆分为名称和代码"""
+    stock_name, stock_code = split_name_code(column_or(df, '名称/代码', ''))
+    change_pct = column_or(df, '涨跌幅', '0%')
+    return render_rows("""
+                                <tr>
+                                    <td>{rank}</td>
+                                    <td><a href="{url}" target="_blank" """ + STOCK_LINK_STYLE + """>{name}</a></td>
+                                    <td class="{change_class}">{change}</td>
+                                    <td>{hot}</td>
+                                </tr>
+                """, {
+        'rank': fmt_str(df.index.to_series() + 1),
+        'url': stock_urls(stock_code),
+        'name': stock_name,
+        'change_class': sign_class(parse_percent(change_pct)),
+        'change': fmt_str(change_pct),
+        'hot': fmt_thousands(column_or(df, '综合热度', 0)),
+    })
+
+
+def render_hot_rank_rows(df):
+    """东方财富热度榜表格行"""
+    rank = df['当前排名'] if '当前排名' in df.columns else df.index.to_series() + 1
+    stock_code = column_or(df, '代码', '')
+    change_pct = column_or(df, '涨跌幅', 0)
+    return render_rows("""
+                                <tr>
+                                    <td>{rank}</td>
+                                    <td>{code}</td>
+                                    <td><a href="{url}" target="_blank" """ + STOCK_LINK_STYLE + """>{name}</a></td>
+                                    <td>{price}</td>
+                                    <td>{change_amount}</td>
+                                    <td class="{change_class}">{change}</td>
+                                </tr>
+                """, {
+        'rank': fmt_int(rank),
+        'code': fmt_str(stock_code),
+        'url': stock_urls(stock_code),
+        'name': fmt_str(column_or(df, '股票名称', '')),
+        'price': fmt_num(column_or(df, '最新价', 0)),
+        'change_amount': fmt_num(column_or(df, '涨跌额', 0)),
+        'change_class': sign_class(change_pct),
+        'change': fmt_num(change_pct),
+    })
+
+
+def render_fund_flow_rows(df, instant=False):
+    """资金流排行表格行
+
+    即时排行的涨跌幅列为 行业-涨跌幅（数值，显示时补 %），其余窗口为 阶段涨跌幅（带 % 的文本，原样显示）。
+    主力净流入占比 = 净额 / (流入资金 + 流出资金) * 100。
+    """
+    change_pct = column_or(df, '行业-涨跌幅' if instant else '阶段涨跌幅', '0%')
+    change_value = parse_percent(change_pct)
+    if instant:
+        is_text = change_pct.map(lambda value: isinstance(value, str) and '%' in value).to_numpy()
+        display_pct = np.where(is_text, fmt_str(change_pct), np.char.mod('%.2f%%', change_value).astype(object))
     else:
-        # 默认新闻
-        default_news = [
-            "📈 沪指今日收涨0.5%，创业板指涨1.2%",
-            "💰 北向资金净流入50亿元，连续3日净买入",
-            "🚀 新能源板块强势领涨，多股涨停",
-            "📊 央行今日开展1000亿元逆回购操作",
-            "🔥 科技股持续活跃，人工智能概念受关注"
-        ]
-        news_html = '\n                    '.join([f"<span class='news-item'>{news}</span>" for news in default_news * 2])
-    
-    """生成涨停股池HTML报告"""
-    today_str = datetime.now().strftime('%Y-%m-%d')
-    yesterday_str = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
+        display_pct = fmt_str(change_pct)
+
+    net_amount = column_or(df, '净额', 0).to_numpy(dtype=float)
+    total = (column_or(df, '流入资金', 0) + column_or(df, '流出资金', 0)).to_numpy(dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        net_flow_ratio = np.where(total != 0, net_amount / total * 100, 0)
+
+    return render_rows("""
+                                <tr>
+                                    <td>{rank}</td>
+                                    <td>{name}</td>
+                                    <td class="{net_class}">{net}</td>
+                                    <td class="{change_class}">{change}</td>
+                                    <td class="{ratio_class}">{ratio}</td>
+                                </tr>
+            """, {
+        'rank': fmt_str(df.index.to_series() + 1),
+        'name': fmt_str(df['行业']),
+        'net_class': sign_class(df['净额']),
+        'net': fmt_num(df['净额']),
+        'change_class': sign_class(change_value),
+        'change': display_pct,
+        'ratio_class': sign_class(net_flow_ratio),
+        'ratio': fmt_num(pd.Series(net_flow_ratio)),
+    })
+
+
+def render_board_concept_rows(df):
+    """概念板块表格行"""
+    change_class = sign_class(df['涨跌幅'])
+    return render_rows("""
+                                <tr>
+                                    <td>{rank}</td>
+                                    <td>{name}</td>
+                                    <td>{code}</td>
+                                    <td>{price}</td>
+                                    <td class="{change_class}">{change}</td>
+                                    <td>{market_cap}</td>
+                                    <td>{turnover}</td>
+                                    <td>{up}</td>
+                                    <td>{down}</td>
+                                    <td>{leader}</td>
+                                    <td class="{change_class}">{leader_change}</td>
+                                </tr>
+            """, {
+        'rank': fmt_int(df['排名']),
+        'name': fmt_str(df['板块名称']),
+        'code': fmt_str(df['板块代码']),
+        'price': fmt_num(df['最新价']),
+        'change_class': change_class,
+        'change': fmt_num(df['涨跌幅']),
+        'market_cap': fmt_num(df['总市值'], scale=100000000),
+        'turnover': fmt_num(df['换手率']),
+        'up': fmt_int(df['上涨家数']),
+        'down': fmt_int(df['下跌家数']),
+        'leader': fmt_str(df['领涨股票']),
+        'leader_change': fmt_num(df['领涨股票-涨跌幅']),
+    })
+
+
+def render_board_industry_rows(df):
+    """行业板块表格行"""
+    change_class = sign_class(df['涨跌幅'])
+    return render_rows("""
+                                <tr>
+                                    <td>{rank}</td>
+                                    <td>{name}</td>
+                                    <td class="{change_class}">{change}</td>
+                                    <td>{volume}</td>
+                                    <td>{amount}</td>
+                                    <td>{net_inflow}</td>
+                                    <td>{up}</td>
+                                    <td>{down}</td>
+                                    <td>{avg_price}</td>
+                                    <td>{leader}</td>
+                                    <td>{leader_price}</td>
+                                    <td class="{change_class}">{leader_change}</td>
+                                </tr>
+            """, {
+        'rank': fmt_int(df['序号']),
+        'name': fmt_str(df['板块']),
+        'change_class': change_class,
+        'change': fmt_num(df['涨跌幅']),
+        'volume': fmt_num(df['总成交量']),
+        'amount': fmt_num(df['总成交额']),
+        'net_inflow': fmt_num(df['净流入']),
+        'up': fmt_int(df['上涨家数']),
+        'down': fmt_int(df['下跌家数']),
+        'avg_price': fmt_num(df['均价']),
+        'leader': fmt_str(df['领涨股']),
+        'leader_price': fmt_num(df['领涨股-最新价']),
+        'leader_change': fmt_num(df['领涨股-涨跌幅']),
+    })
+
+
+def render_lhb_rows(df):
+    """游资龙虎榜表格行，金额换算为万元"""
+    return render_rows("""
+                            <tr>
+                                <td>{seq}</td>
+                                <td>{code}</td>
+                                <td><a href="{url}" target="_blank" """ + STOCK_LINK_STYLE + """>{name}</a></td>
+                                <td>{trade_date}</td>
+                                <td class="{change_class}">{change}</td>
+                                <td>{buy}</td>
+                                <td>{sell}</td>
+                                <td class="{net_class}">{net}</td>
+                                <td>{reason}</td>
+                            </tr>
+                    """, {
+        'seq': fmt_int(df['序号']),
+        'code': fmt_str(df['股票代码']),
+        'url': stock_urls(df['股票代码']),
+        'name': fmt_str(df['股票名称']),
+        'trade_date': fmt_str(df['交易日期']),
+        'change_class': sign_class(df['涨跌幅']),
+        'change': fmt_num(df['涨跌幅']),
+        'buy': fmt_num(df['买入金额'], scale=10000),
+        'sell': fmt_num(df['卖出金额'], scale=10000),
+        'net_class': sign_class(df['净额']),
+        'net': fmt_num(df['净额'], scale=10000),
+        'reason': fmt_str(df['上榜原因']),
+    })
+
+
+def iter_limit_up_page(today_pool, streak_data):
+    """涨停股池页：连板梯队、涨停原因统计、涨停股池表和多日涨停统计"""
+    today_str = datetime.now().strftime('%Y-%m-%d')
     
-    def format_time(time_str):
-        """将时间格式从HHMMSS转换为HH:MM"""
-        if pd.isna(time_str) or time_str == '':
-            return ''
-        try:
-            time_str = str(time_str)
-            if len(time_str) >= 4:
-                return f"{time_str[:2]}:{time_str[2:4]}"
-            return time_str
-        except:
-            return str(time_str)
+    # 添加连板分类区域
+    if not today_pool.empty:
+        # 提取连板数大于1的股票
+        lianban_stocks = today_pool[today_pool['连板数'] > 1]
+        
+        if not lianban_stocks.empty:
+            # 按连板数分组
+            lianban_groups = lianban_stocks.groupby('连板数')
+            
+            yield """
+            <div class="lianban-section">
+                <div class="lianban-cards">
+            """
+            
+            for lianban_num, group in sorted(lianban_groups):
+                # 为每个连板数分配不同底色（低饱和度）
+                colors = ['#e3ddd7', '#d7e3de', '#d7e1e3', '#ded7e3']
+                color_idx = (lianban_num - 2) % len(colors)
+                bg_color = colors[color_idx]
+                
+                yield f"""
+                    <div class="lianban-card" style="background-color: {bg_color};">
+                        <div class="lianban-title">{lianban_num}连板</div>
+                        <div class="lianban-divider"></div>
+                        <div class="lianban-count">共 {len(group)} 只</div>
+                        <div class="lianban-stocks">
+                            {render_lianban_stocks(group)}
+                        </div>
+                    </div>
+                """
+            
+            yield """
+                </div>
+            </div>
+            """
     
-    html = f"""
-    <!DOCTYPE html>
-    <html lang="zh-CN">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>涨停股池数据</title>
-        <style>
-            * {{
-                margin: 0;
-                padding: 0;
-                box-sizing: border-box;
-                font-family: 'Microsoft YaHei', 'PingFang SC', sans-serif;
-            }}
-            body {{
-                font-family: 'Microsoft YaHei', 'PingFang SC', sans-serif;
-                background: linear-gradient(135deg, #2c3e50 0%, #34495e 100%);
-                min-height: 100vh;
-                padding: 0;
-                display: flex;
-                margin: 0;
-            }}
-            .news-ticker {{
-                position: fixed;
-                top: 0;
-                left: 0;
-                right: 0;
-                height: 55px;
-                background: linear-gradient(90deg, #1a252f 0%, #2c3e50 100%);
-                color: white;
-                display: flex;
-                align-items: center;
-                overflow: hidden;
-                z-index: 1000;
-                border-bottom: 2px solid rgba(255, 255, 255, 0.1);
-            }}
-            .news-label {{
-                background: #e74c3c;
-                color: white;
-                padding: 0 20px;
-                height: 100%;
-                display: flex;
-                align-items: center;
-                font-weight: 600;
-                font-size: 16px;
-                white-space: nowrap;
-                z-index: 10;
-            }}
-            .news-content {{
-                flex: 1;
-                overflow: hidden;
-                position: relative;
-                height: 100%;
-                display: flex;
-                align-items: center;
-            }}
-            .news-scroll {{
-                display: flex;
-                animation: scroll 280s linear infinite;
-                white-space: nowrap;
-            }}
-            .news-scroll:hover {{
-                animation-play-state: paused;
-            }}
-            .news-item {{
-                display: inline-block;
-                padding: 0 40px;
-                font-size: 16px;
-                color: rgba(255, 255, 255, 0.95);
-            }}
-            .news-item a {{
-                color: rgba(255, 255, 255, 0.9);
-                text-decoration: none;
-                transition: color 0.3s ease;
-            }}
-            .news-item a:hover {{
-                color: #3498db;
-            }}
-            @keyframes scroll {{
-                0% {{
-                    transform: translateX(0);
-                }}
-                100% {{
-                    transform: translateX(-50%);
-                }}
-            }}
-            .sidebar {{
-                width: 250px;
-                background: rgba(0, 0, 0, 0.3);
-                backdrop-filter: blur(10px);
-                padding: 30px 20px;
-                display: flex;
-                flex-direction: column;
-                position: fixed;
-                height: 100vh;
-                overflow-y: auto;
-                border-right: 1px solid rgba(255, 255, 255, 0.1);
-                top: 55px;
-            }}
-            .sidebar-title {{
-                color: white;
-                font-size: 1.8rem;
-                font-weight: 700;
-                margin-bottom: 30px;
-                text-align: center;
-                padding-bottom: 20px;
-                border-bottom: 2px solid rgba(255, 255, 255, 0.2);
-            }}
-            .nav-menu {{
-                display: flex;
-                flex-direction: column;
-                gap: 10px;
-            }}
-            .nav-item {{
-                padding: 15px 20px;
-                color: rgba(255, 255, 255, 0.8);
-                text-decoration: none;
-                border-radius: 8px;
-                transition: all 0.3s ease;
-                font-size: 1rem;
-                font-weight: 500;
-                cursor: pointer;
-            }}
-            .nav-item:hover {{
-                background: rgba(255, 255, 255, 0.15);
-                color: white;
-                transform: translateX(5px);
-            }}
-            .nav-item.active {{
-                background: rgba(255, 255, 255, 0.2);
-                color: white;
-                font-weight: 600;
-            }}
-            .main-content {{
-                flex: 1;
-                margin-left: 250px;
-                padding: 20px;
-                margin-top: 55px;
-            }}
-            .header {{
-                text-align: center;
-                margin-bottom: 30px;
-                color: white;
-            }}
-            h1 {{
-                font-size: 2.5rem;
-                font-weight: 700;
-                margin-bottom: 10px;
-                text-shadow: 2px 2px 4px rgba(0,0,0,0.2);
-            }}
-            .subtitle {{
-                font-size: 1.1rem;
-                color: rgba(255,255,255,0.9);
-            }}
-            .refresh-btn {{
-                display: block;
-                margin: 0 auto 30px;
-                padding: 12px 30px;
-                background: rgba(255,255,255,0.2);
-                color: white;
-                border: 2px solid white;
-                border-radius: 8px;
-                cursor: pointer;
-                font-size: 16px;
-                font-weight: 600;
-                transition: all 0.3s ease;
-            }}
-            .refresh-btn:hover {{
-                background: rgba(255,255,255,0.3);
-                transform: translateY(-2px);
-            }}
-            .container {{
-                display: flex;
-                flex-direction: column;
-                gap: 40px;
-                max-width: 100%;
-                margin: 0 auto;
-                width: 100%;
-            }}
-            .section {{
-                background: white;
-                border-radius: 0;
-                box-shadow: none;
-                border-bottom: 2px solid #e0e0e0;
-                padding: 25px 0;
-                transition: all 0.3s ease;
-            }}
-            .section:hover {{
-                box-shadow: none;
-            }}
-            h2 {{
-                color: #2c3e50;
-                margin-bottom: 20px;
-                font-size: 1.5rem;
-                font-weight: 600;
-                border-bottom: 3px solid #a3b3b4;
-                padding-bottom: 10px;
-            }}
-            .table-container {{
-                max-height: 600px;
-                overflow-x: auto;
-                overflow-y: auto;
-                border-radius: 8px;
-                border: 1px solid #e0e0e0;
-            }}
-            table {{
-                width: 100%;
-                border-collapse: collapse;
-            }}
-            th {{
-                background: linear-gradient(135deg, #2c3e50 0%, #34495e 100%);
-                color: white;
-                padding: 12px 10px;
-                text-align: center;
-                font-weight: 600;
-                position: sticky;
-                top: 0;
-                z-index: 10;
-                font-size: 13px;
-                white-space: nowrap;
-            }}
-            td {{
-                padding: 10px;
-                text-align: center;
-                border-bottom: 1px solid #f0f0f0;
-                color: #333;
-                font-size: 13px;
-            }}
-            tr:hover {{
-                background-color: #f8f9fa;
-                transition: all 0.2s ease;
-            }}
-            tr:nth-child(even) {{
-                background-color: #fafafa;
-            }}
-            .positive {{
-                color: #e74c3c;
-                font-weight: 600;
-            }}
-            .negative {{
-                color: #27ae60;
-                font-weight: 600;
-            }}
-            .highlight {{
-                background: linear-gradient(135deg, #2c3e5015 0%, #34495e15 100%) !important;
-            }}
-            .market-activity-container {{
-                margin-top: 20px;
-            }}
-            .activity-grid {{
-                display: grid;
-                grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-                gap: 15px;
-                margin-top: 20px;
-            }}
-            .activity-card {{
-                background: white;
-                border-radius: 12px;
-                padding: 15px;
-                box-shadow: 0 4px 12px rgba(0,0,0,0.08);
-                text-align: center;
-                transition: all 0.3s ease;
-                border-left: 4px solid;
-            }}
-            .activity-card:hover {{
-                transform: translateY(-5px);
-                box-shadow: 0 8px 20px rgba(0,0,0,0.12);
-            }}
-            .activity-card.positive {{
-                border-left-color: #27ae60;
-            }}
-            .activity-card.negative {{
-                border-left-color: #e74c3c;
-            }}
-            .activity-card.neutral {{
-                border-left-color: #95a5a6;
-            }}
-            .activity-icon {{
-                font-size: 2rem;
-                margin-bottom: 8px;
-            }}
-            .activity-title {{
-                font-size: 0.9rem;
-                color: #666;
-                margin-bottom: 8px;
-                font-weight: 600;
-            }}
-            .activity-value {{
-                 font-size: 1.8rem;
-                 font-weight: 700;
-                 color: #2c3e50;
-             }}
-            
-            /* Scrollbar styling */
-            .table-container::-webkit-scrollbar {{
-                width: 8px;
-            }}
-            .table-container::-webkit-scrollbar-track {{
-                background: #f1f1f1;
-                border-radius: 4px;
-            }}
-            .table-container::-webkit-scrollbar-thumb {{
-                background: #a3b3b4;
-                border-radius: 4px;
-            }}
-            .table-container::-webkit-scrollbar-thumb:hover {{
-                background: #5a6c7d;
-                border-radius: 4px;
-                transition: background 0.2s ease;
-            }}
-            
-            /* Chart styling */
-            .chart-container {{
-                display: flex;
-                justify-content: space-around;
-                flex-wrap: wrap;
-                gap: 30px;
-                margin-top: 30px;
-            }}
-            .chart-card {{
-                background: white;
-                border-radius: 12px;
-                padding: 25px;
-                box-shadow: 0 4px 12px rgba(0,0,0,0.08);
-                width: 450px;
-                text-align: center;
-            }}
-            .chart-title {{
-                font-size: 1.3rem;
-                color: #2c3e50;
-                margin-bottom: 20px;
-                font-weight: 600;
-            }}
-            .chart-canvas {{
-                width: 100% !important;
-                height: 300px !important;
-            }}
-            .lianban-section {{
-                margin-bottom: 30px;
-                background: linear-gradient(135deg, #f8f9fa 0%, #e9ecef 100%);
-            }}
-            .lianban-cards {{
-                display: flex;
-                gap: 10px;
-                flex-wrap: nowrap;
-                width: 100%;
-            }}
-            .lianban-card {{
-                flex: 1;
-                min-width: 0;
-                max-width: none;
-                background: white;
-                border-radius: 0;
-                box-shadow: none;
-                padding: 20px;
-                transition: all 0.3s ease;
-            }}
-            .lianban-card:hover {{
-                box-shadow: 0 4px 8px rgba(0,0,0,0.1);
-            }}
-            .lianban-title {{
-                font-size: 1.8rem;
-                font-weight: 700;
-                color: #e74c3c;
-                margin-bottom: 5px;
-            }}
-            .lianban-count {{
-                font-size: 0.9rem;
-                color: #666;
-                margin-bottom: 15px;
-            }}
-            .lianban-divider {{
-                height: 2px;
-                background: #a3b3b4;
-                margin: 10px 0;
-            }}
-            .lianban-stocks {{
-                display: flex;
-                flex-direction: column;
-                gap: 10px;
-            }}
-            .lianban-stock-item {{
-                display: flex;
-                justify-content: space-between;
-                align-items: center;
-                padding: 10px;
-                background: #f8f9fa;
-                border-radius: 6px;
-                transition: all 0.2s ease;
-            }}
-            .lianban-stock-item:hover {{
-                background: #e9ecef;
-            }}
-            .stock-code {{
-                font-weight: 600;
-                color: #2c3e50;
-                font-size: 0.9rem;
-            }}
-            .stock-name {{
-                flex: 1;
-                text-align: center;
-                font-weight: 500;
-                color: #333;
-                font-size: 0.95rem;
-            }}
-            .stock-change {{
-                font-weight: 600;
-                font-size: 0.9rem;
-                padding: 4px 8px;
-                border-radius: 4px;
-            }}
-            .stock-change.positive {{
-                color: #e74c3c;
-            }}
-            .stock-change.negative {{
-                color: #27ae60;
-            }}
-            @media (max-width: 1200px) {{
-                .lianban-card {{
-                    flex: 1 1 calc(50% - 20px);
-                }}
-            }}
-            @media (max-width: 768px) {{
-                .lianban-card {{
-                    flex: 1 1 100%;
-                }}
-            }}
-        </style>
-        <script src="https://cdn.jsdelivr.net/npm/chart.js@4.4.8/dist/chart.umd.min.js"></script>
-        <script src="https://cdn.jsdelivr.net/npm/chartjs-plugin-datalabels@2.2.0/dist/chartjs-plugin-datalabels.min.js"></script>
-        <script>
-            function showPage(pageId) {{
-                var limitUpPage = document.getElementById('limit-up-page');
-                var boardInfoPage = document.getElementById('board-info-page');
-                var capitalFlowPage = document.getElementById('capital-flow-page');
-                var chenXiaoqunPage = document.getElementById('chen-xiaoqun-page');
-                var hotRankPage = document.getElementById('hot-rank-page');
-                var navItems = document.querySelectorAll('.nav-item');
-                var headerTitle = document.querySelector('h1');
-                var headerSubtitle = document.querySelector('.subtitle');
-                
-                if (pageId === 'limit-up') {{
-                    limitUpPage.style.display = 'block';
-                    boardInfoPage.style.display = 'none';
-                    capitalFlowPage.style.display = 'none';
-                    chenXiaoqunPage.style.display = 'none';
-                    hotRankPage.style.display = 'none';
-                    navItems[0].classList.remove('active');
-                    navItems[1].classList.remove('active');
-                    navItems[2].classList.remove('active');
-                    navItems[3].classList.add('active');
-                    navItems[4].classList.remove('active');
-                    headerTitle.textContent = '🚀 涨停股池数据';
-                    headerSubtitle.textContent = '实时更新的涨停板行情数据';
-                    initLimitUpCharts();
-                }} else if (pageId === 'board-info') {{
-                    limitUpPage.style.display = 'none';
-                    boardInfoPage.style.display = 'block';
-                    capitalFlowPage.style.display = 'none';
-                    chenXiaoqunPage.style.display = 'none';
-                    hotRankPage.style.display = 'none';
-                    navItems[0].classList.remove('active');
-                    navItems[1].classList.remove('active');
-                    navItems[2].classList.add('active');
-                    navItems[3].classList.remove('active');
-                    navItems[4].classList.remove('active');
-                    headerTitle.textContent = '📊 概念板块信息';
-                    headerSubtitle.textContent = '实时更新的概念板块行情数据';
-                    initCharts();
-                }} else if (pageId === 'capital-flow') {{
-                    limitUpPage.style.display = 'none';
-                    boardInfoPage.style.display = 'none';
-                    capitalFlowPage.style.display = 'block';
-                    chenXiaoqunPage.style.display = 'none';
-                    hotRankPage.style.display = 'none';
-                    navItems[0].classList.remove('active');
-                    navItems[1].classList.add('active');
-                    navItems[2].classList.remove('active');
-                    navItems[3].classList.remove('active');
-                    navItems[4].classList.remove('active');
-                    headerTitle.textContent = '💰 资金流向数据';
-                    headerSubtitle.textContent = '实时更新的资金流向统计数据';
-                }} else if (pageId === 'chen-xiaoqun') {{
-                    limitUpPage.style.display = 'none';
-                    boardInfoPage.style.display = 'none';
-                    capitalFlowPage.style.display = 'none';
-                    chenXiaoqunPage.style.display = 'block';
-                    hotRankPage.style.display = 'none';
-                    navItems[0].classList.remove('active');
-                    navItems[1].classList.remove('active');
-                    navItems[2].classList.remove('active');
-                    navItems[3].classList.remove('active');
-                    navItems[4].classList.add('active');
-                    headerTitle.textContent = '👤 游资追踪';
-                    headerSubtitle.textContent = '知名游资龙虎榜追踪';
-                }} else if (pageId === 'hot-rank') {{
-                    limitUpPage.style.display = 'none';
-                    boardInfoPage.style.display = 'none';
-                    capitalFlowPage.style.display = 'none';
-                    chenXiaoqunPage.style.display = 'none';
-                    hotRankPage.style.display = 'block';
-                    navItems[0].classList.add('active');
-                    navItems[1].classList.remove('active');
-                    navItems[2].classList.remove('active');
-                    navItems[3].classList.remove('active');
-                    navItems[4].classList.remove('active');
-                    headerTitle.textContent = '🔥 市场热点股票';
-                    headerSubtitle.textContent = '实时更新的热点人气排行榜';
-                }}
-            }}
-            
-            function exportToCSV() {{
-                const table = document.querySelector('#limit-up-page table');
-                if (!table) {{
-                    alert('未找到数据表');
-                    return;
-                }}
-                
-                let csv = [];
-                const rows = table.querySelectorAll('tr');
-                
-                for (let i = 0; i < rows.length; i++) {{
-                    const row = [], cols = rows[i].querySelectorAll('td, th');
-                    
-                    for (let j = 0; j < cols.length; j++) {{
-                        let text = cols[j].innerText.replace(/,/g, '，').replace(/\\n/g, ' ');
-                        row.push('"' + text + '"');
-                    }}
-                    
-                    csv.push(row.join(','));
-                }}
-                
-                const csvFile = new Blob([csv.join('\\n')], {{ type: 'text/csv;charset=utf-8;' }});
-                const downloadLink = document.createElement('a');
-                downloadLink.download = '涨停股池_' + new Date().toISOString().slice(0, 10) + '.csv';
-                downloadLink.href = window.URL.createObjectURL(csvFile);
-                downloadLink.style.display = 'none';
-                document.body.appendChild(downloadLink);
-                downloadLink.click();
-                document.body.removeChild(downloadLink);
-            }}
-            
-            function changeYz() {{
-                const select = document.getElementById('yz-select');
-                const selectedYz = select.value;
-                
-                const allTbodies = document.querySelectorAll('#yz-table tbody');
-                allTbodies.forEach(tbody => {{
-                    tbody.style.display = 'none';
-                }});
-                
-                const selectedTbody = document.getElementById('yz-data-' + selectedYz);
-                if (selectedTbody) {{
-                    selectedTbody.style.display = 'table-row-group';
-                }}
-            }}
-            
-            function refreshCurrentPage() {{
-                const activeNavItem = document.querySelector('.nav-item.active');
-                if (activeNavItem) {{
-                    const pageId = activeNavItem.onclick.toString().match(/'([^']+)'/)[1];
-                    showPage(pageId);
-                    updateRefreshTime();
-                    if (pageId === 'limit-up') {{
-                        initLimitUpCharts();
-                    }}
-                }}
-            }}
-            
-            function updateRefreshTime() {{
-                const now = new Date();
-                const timeStr = now.toLocaleString('zh-CN', {{
-                    year: 'numeric',
-                    month: '2-digit',
-                    day: '2-digit',
-                    hour: '2-digit',
-                    minute: '2-digit',
-                    second: '2-digit'
-                }});
-                const refreshTimeElements = document.querySelectorAll('.refresh-time');
-                refreshTimeElements.forEach(element => {{
-                    element.textContent = '最后刷新: ' + timeStr;
-                }});
-            }}
-            
-            window.onload = function() {{
-                updateRefreshTime();
-                startAutoRefresh();
-                initLimitUpCharts();
-            }}
-            
-            function startAutoRefresh() {{
-                setInterval(function() {{
-                    console.log('15分钟自动刷新页面以更新新闻...');
-                    location.reload();
-                }}, 15 * 60 * 1000);
-            }}
-            
-            // 实时更新滚动新闻
-            function updateNewsScroll() {{
-                fetch('/api/news')
-                    .then(response => response.json())
-                    .then(data => {{
-                        const newsScroll = document.getElementById('newsScroll');
-                        if (newsScroll && data.news && data.news.length > 0) {{
-                            let newsHtml = '';
-                            data.news.forEach(news => {{
-                                newsHtml += `<span class='news-item'>${{news.icon}} [${{news.source}} ${{news.time}}] ${{news.title}}</span>`;
-                            }});
-                            // 重复新闻以实现无缝滚动
-                            newsScroll.innerHTML = newsHtml + newsHtml;
-                            console.log('新闻更新成功，共', data.news.length, '条');
-                        }}
-                    }})
-                    .catch(error => {{
-                        console.error('更新新闻失败:', error);
-                    }});
-            }}
-            
-            // 实时更新市场热点追踪
-            function updateHotRank() {{
-                fetch('/api/hot-rank')
-                    .then(response => response.json())
-                    .then(data => {{
-                        // 更新百度热搜今日数据
-                        if (data.hot_search && data.hot_search.length > 0) {{
-                            const hotSearchTodayTable = document.getElementById('hot-search-today-tbody');
-                            if (hotSearchTodayTable) {{
-                                let html = '';
-                                data.hot_search.forEach(item => {{
-                                    const changeClass = item.change > 0 ? 'positive' : (item.change < 0 ? 'negative' : '');
-                                    const stockUrl = item.code ? `https://quote.eastmoney.com/${{item.code}}.html` : '#';
-                                    html += `<tr>
-                                        <td>${{item.rank}}</td>
-                                        <td><a href="${{stockUrl}}" target="_blank" style="color: #3498db; text-decoration: none; font-weight: 500;">${{item.name}}</a></td>
-                                        <td class="${{changeClass}}">${{item.change}}</td>
-                                        <td>${{item.heat}}</td>
-                                    </tr>`;
-                                }});
-                                hotSearchTodayTable.innerHTML = html;
-                                console.log('百度热搜今日更新成功，共', data.hot_search.length, '条');
-                            }}
-                        }}
-                        
-                        // 更新东方财富热度榜数据
-                        if (data.hot_rank && data.hot_rank.length > 0) {{
-                            const hotRankTable = document.getElementById('hot-rank-tbody');
-                            if (hotRankTable) {{
-                                let html = '';
-                                data.hot_rank.forEach(item => {{
-                                    const changeClass = item.change > 0 ? 'positive' : (item.change < 0 ? 'negative' : '');
-                                    const stockUrl = item.code ? `https://quote.eastmoney.com/${{item.code}}.html` : '#';
-                                    html += `<tr>
-                                        <td>${{item.rank}}</td>
-                                        <td>${{item.code}}</td>
-                                        <td><a href="${{stockUrl}}" target="_blank" style="color: #3498db; text-decoration: none; font-weight: 500;">${{item.name}}</a></td>
-                                        <td>${{item.price.toFixed(2)}}</td>
-                                        <td>${{(item.price * item.change / 100).toFixed(2)}}</td>
-                                        <td class="${{changeClass}}">${{item.change.toFixed(2)}}%</td>
-                                    </tr>`;
-                                }});
-                                hotRankTable.innerHTML = html;
-                                console.log('东方财富热度榜更新成功，共', data.hot_rank.length, '条');
-                            }}
-                        }}
-                    }})
-                    .catch(error => {{
-                        console.error('更新市场热点失败:', error);
-                    }});
-            }}
-            
-            // 每5分钟更新一次新闻
-            setInterval(updateNewsScroll, 5 * 60 * 1000);
-            
-            // 每10分钟更新一次市场热点
-            setInterval(updateHotRank, 10 * 60 * 1000);
-            
-            // 页面加载完成后立即执行一次更新
-            setTimeout(updateNewsScroll, 1000);
-            setTimeout(updateHotRank, 2000);
-
-            function initCharts() {{
-            // 上涨下跌饼图
-            const upDownCtx = document.getElementById('upDownChart').getContext('2d');
-            new Chart(upDownCtx, {{
-                type: 'doughnut',
-                plugins: [ChartDataLabels],
-                    data: {{
-                        labels: ['上涨', '下跌', '平盘'],
-                        datasets: [{{
-                            data: [{market_activity.loc[market_activity['item'] == '上涨', 'value'].iloc[0] if not market_activity.empty and '上涨' in market_activity['item'].values else 0}, {market_activity.loc[market_activity['item'] == '下跌', 'value'].iloc[0] if not market_activity.empty and '下跌' in market_activity['item'].values else 0}, {market_activity.loc[market_activity['item'] == '平盘', 'value'].iloc[0] if not market_activity.empty and '平盘' in market_activity['item'].values else 0}],
-                            backgroundColor: ['#f5cac3', '#84a98c', '#cad2c5'],
-                            borderWidth: 0
-                        }}]
-                    }},
-                    options: {{
-                        responsive: true,
-                        maintainAspectRatio: false,
-                        plugins: {{
-                            legend: {{
-                                position: 'bottom',
-                                labels: {{
-                                    font: {{
-                                        size: 12
-                                    }}
-                                }}
-                            }},
-                            title: {{
-                                display: true,
-                                text: '市场赚钱效应',
-                                font: {{
-                                    size: 12,
-                                    weight: 'bold'
-                                }}
-                            }},
-                            tooltip: {{
-                                callbacks: {{
-                                    label: function(context) {{
-                                        return context.label + ': ' + context.raw;
-                                    }}
-                                }}
-                            }},
-                            datalabels: {{
-                                display: true,
-                                color: '#ffffff',
-                                font: {{
-                                    size: 12,
-                                    weight: 'bold'
-                                }},
-                                formatter: function(value, context) {{
-                                    return value;
-                                }}
-                            }}
-                        }}
-                    }}
-                }});
+    yield """
+            <div class="section">
+                <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 20px;">
+                    <h2 style="margin-bottom: 0;">📈 今日涨停股池 - """ + today_str + """ <span style="font-size: 0.8em; color: #666;">(共 """ + str(len(today_pool)) + """ 只)</span></h2>
+                    <button onclick="exportToCSV()" style="padding: 8px 16px; background: #27ae60; color: white; border: none; border-radius: 5px; cursor: pointer; font-size: 14px; font-weight: 600; transition: all 0.3s ease;">📥 导出CSV</button>
+                </div>
                 
-                // 涨停跌停饼图
-            const limitCtx = document.getElementById('limitChart').getContext('2d');
-            new Chart(limitCtx, {{
-                type: 'doughnut',
-                plugins: [ChartDataLabels],
-                    data: {{
-                        labels: ['真实涨停', '一字涨停', '真实跌停', '一字跌停'],
-                        datasets: [{{
-                            data: [{market_activity.loc[market_activity['item'] == '真实涨停', 'value'].iloc[0] if not market_activity.empty and '真实涨停' in market_activity['item'].values else 0}, {market_activity.loc[market_activity['item'] == '涨停', 'value'].iloc[0] - (market_activity.loc[market_activity['item'] == '真实涨停', 'value'].iloc[0] if not market_activity.empty and '真实涨停' in market_activity['item'].values else 0) if not market_activity.empty and '涨停' in market_activity['item'].values else 0}, {market_activity.loc[market_activity['item'] == '真实跌停', 'value'].iloc[0] if not market_activity.empty and '真实跌停' in market_activity['item'].values else 0}, {market_activity.loc[market_activity['item'] == '跌停', 'value'].iloc[0] - (market_activity.loc[market_activity['item'] == '真实跌停', 'value'].iloc[0] if not market_activity.empty and '真实跌停' in market_activity['item'].values else 0) if not market_activity.empty and '跌停' in market_activity['item'].values else 0}],
-                            backgroundColor: ['#f28482', '#e5989b', '#84a98c', '#52796f'],
-                            borderWidth: 0
-                        }}]
-                    }},
-                    options: {{
-                        responsive: true,
-                        maintainAspectRatio: false,
-                        plugins: {{
-                            legend: {{
-                                position: 'bottom',
-                                labels: {{
-                                    font: {{
-                                        size: 12
-                                    }}
-                                }}
-                            }},
-                            title: {{
-                                display: true,
-                                text: '涨停跌停分布（总数=真实+一字）',
-                                font: {{
-                                    size: 14,
-                                    weight: 'bold'
-                                }}
-                            }},
-                            tooltip: {{
-                                callbacks: {{
-                                    label: function(context) {{
-                                        return context.label + ': ' + context.raw;
-                                    }}
-                                }}
-                            }},
-                            datalabels: {{
-                                display: true,
-                                color: '#ffffff',
-                                font: {{
-                                    size: 12,
-                                    weight: 'bold'
-                                }},
-                                formatter: function(value, context) {{
-                                    return value;
-                                }}
-                            }}
-                        }}
-                    }}
-                }});
-            }}
+                <div class="charts-section" style="display: flex; gap: 20px; margin-bottom: 30px; flex-wrap: wrap;">
+                    <div class="chart-card" style="flex: 1; min-width: 300px; background: #f8f9fa; border-radius: 10px; padding: 20px; box-shadow: 0 2px 8px rgba(0,0,0,0.1);">
+                        <h3 style="text-align: center; color: #2c3e50; margin-bottom: 15px; font-size: 1.2rem;">📊 行业分布</h3>
+                        <div style="position: relative; height: 300px;">
+                            <canvas id="industryChart"></canvas>
+                        </div>
+                    </div>
+                    
+                    <div class="chart-card" style="flex: 1; min-width: 300px; background: #f8f9fa; border-radius: 10px; padding: 20px; box-shadow: 0 2px 8px rgba(0,0,0,0.1);">
+                        <h3 style="text-align: center; color: #2c3e50; margin-bottom: 15px; font-size: 1.2rem;">📈 连板统计</h3>
+                        <div style="position: relative; height: 300px;">
+                            <canvas id="boardChart"></canvas>
+                        </div>
+                    </div>
+                </div>
+                
+                <div class="table-container">
+                    <table>
+                        <tr>
+                            <th>序号</th>
+                            <th>代码</th>
+                            <th>名称</th>
+                            <th>涨跌幅(%)</th>
+                            <th>最新价</th>
+                            <th>成交额(亿)</th>
+                            <th>流通市值(亿)</th>
+                            <th>换手率(%)</th>
+                            <th>封板资金(亿)</th>
+                            <th>首次封板时间</th>
+                            <th>最后封板时间</th>
+                            <th>炸板次数</th>
+                            <th>涨停统计</th>
+                            <th>连板数</th>
+                            <th>所属行业</th>
+                            <th>涨停原因</th>
+                        </tr>
+    """
+    
+    if not today_pool.empty:
+        yield render_limit_up_rows(today_pool)
+    else:
+        yield """
+                        <tr>
+                            <td colspan="17" style="text-align: center; padding: 20px; color: #999;">暂无数据</td>
+                        </tr>
+        """
+    
+    yield """
+                    </table>
+                </div>
+            </div>
+            """
+    
+    # 多日涨停统计区域
+    if streak_data is not None:
+        streak_stocks = streak_data['stocks']
+        streak_dates = streak_data['dates']
+        date_range = f"{streak_dates[0]}-{streak_dates[-1]}" if streak_dates else ""
+        yield f"""
+            <div class="section">
+                <h2>📅 近{len(streak_dates)}个交易日涨停≥{streak_data['min_days']}次 <span style="font-size: 0.8em; color: #666;">{date_range} (共 {len(streak_stocks)} 只)</span></h2>
+                <div class="table-container">
+                    <table>
+                        <tr>
+                            <th>序号</th>
+                            <th>代码</th>
+                            <th>名称</th>
+                            <th>所属行业</th>
+                            <th>涨停次数</th>
+                            <th>当前连续</th>
+                            <th>最长连续</th>
+                            <th>最近涨停</th>
+                            <th>涨停分布</th>
+                        </tr>
+        """
+        if not streak_stocks.empty:
+            yield render_streak_rows(streak_stocks)
+        else:
+            yield """
+                        <tr>
+                            <td colspan="9" style="text-align: center; padding: 20px; color: #999;">暂无数据</td>
+                        </tr>
+            """
+        yield """
+                    </table>
+                </div>
+            </div>
+        """
+
+
+def iter_hot_rank_page(hot_search_data, hot_rank_data):
+    """市场热点页：百度热搜（今日/1小时）与东方财富热度榜"""
+    yield """
+            <div style="display: flex; gap: 20px; width: 100%;">
+                <div class="section" style="flex: 1; min-width: 0;">
+                    <h2>🔥 百度热搜股票 - 今日</h2>
+                    <div class="table-container">
+                        <table>
+                            <tr>
+                                <th>排名</th>
+                                <th>股票名称</th>
+                                <th>涨跌幅(%)</th>
+                                <th>综合热度</th>
+                            </tr>
+                            <tbody id="hot-search-today-tbody">
+                            """
+    if hot_search_data and "今日" in hot_search_data and not hot_search_data["今日"].empty:
+        yield render_hot_search_rows(hot_search_data["今日"])
+    else:
+        yield """
+                                <tr>
+                                    <td colspan="4" style="text-align: center; padding: 40px; color: #999;">暂无数据</td>
+                                </tr>
+            """
+    yield """
+                            </tbody>
+                        </table>
+                    </div>
+                </div>
+                <div class="section" style="flex: 1; min-width: 0;">
+                    <h2>🔥 百度热搜股票 - 1小时</h2>
+                    <div class="table-container">
+                        <table>
+                            <tr>
+                                <th>排名</th>
+                                <th>股票名称</th>
+                                <th>涨跌幅(%)</th>
+                                <th>综合热度</th>
+                            </tr>
+                            <tbody id="hot-search-hour-tbody">
+                            """
+    if hot_search_data and "1小时" in hot_search_data and not hot_search_data["1小时"].empty:
+        yield render_hot_search_rows(hot_search_data["1小时"])
+    else:
+        yield """
+                                <tr>
+                                    <td colspan="4" style="text-align: center; padding: 40px; color: #999;">暂无数据</td>
+                                </tr>
+            """
+    yield """
+                            </tbody>
+                        </table>
+                    </div>
+                </div>
+                <div class="section" style="flex: 1; min-width: 0;">
+                    <h2>📈 东方财富热度榜</h2>
+                    <div class="table-container">
+                        <table>
+                            <tr>
+                                <th>排名</th>
+                                <th>股票代码</th>
+                                <th>股票名称</th>
+                                <th>最新价</th>
+                                <th>涨跌额</th>
+                                <th>涨跌幅(%)</th>
+                            </tr>
+                            <tbody id="hot-rank-tbody">
+                            """
+    if hot_rank_data is not None and not hot_rank_data.empty:
+        yield render_hot_rank_rows(hot_rank_data)
+    else:
+        yield """
+                                <tr>
+                                    <td colspan="6" style="text-align: center; padding: 40px; color: #999;">暂无数据</td>
+                                </tr>
+            """
+    yield """
+                            </tbody>
+                        </table>
+                    </div>
+                </div>
+            </div>
+    """
+
+
+def iter_capital_flow_page(fund_flow_rankings):
+    """资金流向页：概念与行业各窗口的净额排行"""
+    yield """
+            <div class="section">
+                <h2>📊 概念资金流排行</h2>
+                <div style="display: flex; gap: 10px; width: 100%; overflow-x: auto;">
+                    <div style="flex: 1; min-width: 0;">
+                        <h3>即时排行</h3>
+                        <div class="table-container" style="width: 100%;">
+                            <table>
+                                <tr>
+                                    <th style="width: 12%;">排名</th>
+                                    <th style="width: 48%;">概念板块</th>
+                                    <th style="width: 12%;">净额(亿)</th>
+                                    <th style="width: 12%;">阶段涨跌幅</th>
+                                    <th style="width: 16%;">主力净流入占比(%)</th>
+                                </tr>
+                                """
+    if "即时" in fund_flow_rankings["concept"]:
+        sorted_df = fund_flow_rankings["concept"]["即时"]["top"]
+        yield render_fund_flow_rows(sorted_df, instant=True)
+    else:
+        yield """
+                                <tr>
+                                    <td colspan="5" style="text-align: center; padding: 20px; color: #999;">暂无数据</td>
+                                </tr>
+        """
+    yield """
+                            </table>
+                        </div>
+                    </div>
+                    
+                    <div style="flex: 1; min-width: 0;">
+                        <h3>3日排行</h3>
+                        <div class="table-container" style="width: 100%;">
+                            <table>
+                                <tr>
+                                    <th style="width: 12%;">排名</th>
+                                    <th style="width: 48%;">概念板块</th>
+                                    <th style="width: 12%;">净额(亿)</th>
+                                    <th style="width: 12%;">阶段涨跌幅</th>
+                                    <th style="width: 16%;">主力净流入占比(%)</th>
+                                </tr>
+                                """
+    if "3日" in fund_flow_rankings["concept"]:
+        # 按净流入降序的前20名（已在数据刷新时预先计算）
+        sorted_df = fund_flow_rankings["concept"]["3日"]["top"]
+        yield render_fund_flow_rows(sorted_df)
+    else:
+        yield """
+                                <tr>
+                                    <td colspan="5" style="text-align: center; padding: 20px; color: #999;">暂无数据</td>
+                                </tr>
+        """
+    yield """
+                            </table>
+                        </div>
+                    </div>
+                    
+                    <div style="flex: 1;">
+                        <h3>5日排行</h3>
+                        <div class="table-container" style="width: 100%;">
+                            <table>
+                                <tr>
+                                    <th style="width: 12%;">排名</th>
+                                    <th style="width: 48%;">概念板块</th>
+                                    <th style="width: 12%;">净额(亿)</th>
+                                    <th style="width: 12%;">阶段涨跌幅</th>
+                                    <th style="width: 16%;">主力净流入占比(%)</th>
+                                </tr>
+                                """
+    if "5日" in fund_flow_rankings["concept"]:
+        # 按净流入降序的前20名（已在数据刷新时预先计算）
+        sorted_df = fund_flow_rankings["concept"]["5日"]["top"]
+        yield render_fund_flow_rows(sorted_df)
+    else:
+        yield """
+                                <tr>
+                                    <td colspan="5" style="text-align: center; padding: 20px; color: #999;">暂无数据</td>
+                                </tr>
+        """
+    yield """
+                            </table>
+                        </div>
+                    </div>
+                    
+                    <div style="flex: 1; min-width: 0;">
+                        <h3>10日排行</h3>
+                        <div class="table-container" style="width: 100%;">
+                            <table>
+                                <tr>
+                                    <th style="width: 12%;">排名</th>
+                                    <th style="width: 48%;">概念板块</th>
+                                    <th style="width: 12%;">净额(亿)</th>
+                                    <th style="width: 12%;">阶段涨跌幅</th>
+                                    <th style="width: 16%;">主力净流入占比(%)</th>
+                                </tr>
+                                """
+    if "10日" in fund_flow_rankings["concept"]:
+        # 按净流入降序的前20名（已在数据刷新时预先计算）
+        sorted_df = fund_flow_rankings["concept"]["10日"]["top"]
+        yield render_fund_flow_rows(sorted_df)
+    else:
+        yield """
+                                <tr>
+                                    <td colspan="5" style="text-align: center; padding: 20px; color: #999;">暂无数据</td>
+                                </tr>
+        """
+    yield """
+                            </table>
+                        </div>
+                    </div>
+                    
+                    <div style="flex: 1;">
+                        <h3>20日排行</h3>
+                        <div class="table-container" style="width: 100%;">
+                            <table>
+                                <tr>
+                                    <th style="width: 12%;">排名</th>
+                                    <th style="width: 48%;">概念板块</th>
+                                    <th style="width: 12%;">净额(亿)</th>
+                                    <th style="width: 12%;">阶段涨跌幅</th>
+                                    <th style="width: 16%;">主力净流入占比(%)</th>
+                                </tr>
+                                """
+    if "20日" in fund_flow_rankings["concept"]:
+        # 按净流入降序的前20名（已在数据刷新时预先计算）
+        sorted_df = fund_flow_rankings["concept"]["20日"]["top"]
+        yield render_fund_flow_rows(sorted_df)
+    else:
+        yield """
+                                <tr>
+                                    <td colspan="4" style="text-align: center; padding: 20px; color: #999;">暂无数据</td>
+                                </tr>
+        """
+    yield """
+                            </table>
+                        </div>
+                    </div>
+                </div>
+            </div>
             
-            function initLimitUpCharts() {{
-                const industryData = {json.dumps(analyze_limit_up_statistics(today_pool)['industry_stats'], ensure_ascii=False)};
-                const industryStocks = {json.dumps(analyze_limit_up_statistics(today_pool)['industry_stocks'], ensure_ascii=False)};
-                const boardData = {json.dumps(analyze_limit_up_statistics(today_pool)['board_stats'], ensure_ascii=False)};
-                
-                // 行业分布饼图
-                const industryCtx = document.getElementById('industryChart');
-                if (industryCtx) {{
-                    const industryLabels = Object.keys(industryData).slice(0, 10);
-                    const industryValues = industryLabels.map(k => industryData[k]);
-                    const colors = ['#e74c3c', '#3498db', '#2ecc71', '#f39c12', '#9b59b6', '#1abc9c', '#e67e22', '#34495e', '#16a085', '#c0392b'];
+            <div class="section">
+                <h2>📊 行业资金流排行</h2>
+                <div style="display: flex; gap: 10px; width: 100%; overflow-x: auto;">
+                    <div style="flex: 1; min-width: 0;">
+                        <h3>即时排行</h3>
+                        <div class="table-container" style="width: 100%;">
+                            <table>
+                                <tr>
+                                    <th style="width: 12%;">排名</th>
+                                    <th style="width: 48%;">行业板块</th>
+                                    <th style="width: 12%;">净额(亿)</th>
+                                    <th style="width: 12%;">阶段涨跌幅</th>
+                                    <th style="width: 16%;">主力净流入占比(%)</th>
+                                </tr>
+                                """
+    if "即时" in fund_flow_rankings["industry"]:
+        sorted_df = fund_flow_rankings["industry"]["即时"]["top"]
+        yield render_fund_flow_rows(sorted_df, instant=True)
+    else:
+        yield """
+                                <tr>
+                                    <td colspan="4" style="text-align: center; padding: 20px; color: #999;">暂无数据</td>
+                                </tr>
+        """
+    yield """
+                            </table>
+                        </div>
+                    </div>
                     
-                    new Chart(industryCtx, {{
-                        type: 'pie',
-                        data: {{
-                            labels: industryLabels,
-                            datasets: [{{
-                                data: industryValues,
-                                backgroundColor: colors,
-                                borderWidth: 2,
-                                borderColor: '#fff'
-                            }}]
-                        }},
-                        options: {{
-                            responsive: true,
-                            maintainAspectRatio: false,
-                            plugins: {{
-                                legend: {{
-                                    position: 'right',
-                                    labels: {{
-                                        font: {{ size: 11 }},
-                                        padding: 8
-                                    }}
-                                }},
-                                tooltip: {{
-                                    callbacks: {{
-                                        label: function(context) {{
-                                            const total = context.dataset.data.reduce((a, b) => a + b, 0);
-                                            const percentage = ((context.raw / total) * 100).toFixed(1);
-                                            const industryName = context.label;
-                                            const stocks = industryStocks[industryName] || [];
-                                            let stockText = stocks.length > 0 ? '\\n股票: ' + stocks.join(', ') : '';
-                                            return context.label + ': ' + context.raw + '只 (' + percentage + '%)' + stockText;
-                                        }}
-                                    }}
-                                }}
-                            }}
-                        }}
-                    }});
-                }}
-                
-                // 连板统计饼图
-                const boardCtx = document.getElementById('boardChart');
-                if (boardCtx) {{
-                    const boardLabels = Object.keys(boardData);
-                    const boardValues = boardLabels.map(k => boardData[k]);
-                    const boardColors = ['#2ecc71', '#f39c12', '#e74c3c'];
+                    <div style="flex: 1; min-width: 0;">
+                        <h3>3日排行</h3>
+                        <div class="table-container" style="width: 100%;">
+                            <table>
+                                <tr>
+                                    <th style="width: 12%;">排名</th>
+                                    <th style="width: 48%;">行业板块</th>
+                                    <th style="width: 12%;">净额(亿)</th>
+                                    <th style="width: 12%;">阶段涨跌幅</th>
+                                    <th style="width: 16%;">主力净流入占比(%)</th>
+                                </tr>
+                                """
+    if "3日" in fund_flow_rankings["industry"]:
+        # 按净流入降序的前20名（已在数据刷新时预先计算）
+        sorted_df = fund_flow_rankings["industry"]["3日"]["top"]
+        yield render_fund_flow_rows(sorted_df)
+    else:
+        yield """
+                                <tr>
+                                    <td colspan="5" style="text-align: center; padding: 20px; color: #999;">暂无数据</td>
+                                </tr>
+        """
+    yield """
+                            </table>
+                        </div>
+                    </div>
                     
-                    new Chart(boardCtx, {{
-                        type: 'doughnut',
-                        data: {{
-                            labels: boardLabels,
-                            datasets: [{{
-                                data: boardValues,
-                                backgroundColor: boardColors,
-                                borderWidth: 3,
-                                borderColor: '#fff'
-                            }}]
-                        }},
-                        options: {{
-                            responsive: true,
-                            maintainAspectRatio: false,
-                            plugins: {{
-                                legend: {{
-                                    position: 'bottom',
-                                    labels: {{
-                                        font: {{ size: 14, weight: 'bold' }},
-                                        padding: 15
-                                    }}
-                                }},
-                                tooltip: {{
-                                    callbacks: {{
-                                        label: function(context) {{
-                                            const total = context.dataset.data.reduce((a, b) => a + b, 0);
-                                            const percentage = ((context.raw / total) * 100).toFixed(1);
-                                            return context.label + ': ' + context.raw + '只 (' + percentage + '%)';
-                                        }}
-                                    }}
-                                }}
-                            }}
-                        }}
-                    }});
-                }}
-            }}
-        </script>
-    </head>
-    <body>
-        <div class="news-ticker">
-            <div class="news-label">📰 财经快讯</div>
-            <div class="news-content">
-                <div class="news-scroll" id="newsScroll">
-                    """ + news_html + """
+                    <div style="flex: 1; min-width: 0;">
+                        <h3>5日排行</h3>
+                        <div class="table-container" style="width: 100%;">
+                            <table>
+                                <tr>
+                                    <th style="width: 12%;">排名</th>
+                                    <th style="width: 48%;">行业板块</th>
+                                    <th style="width: 12%;">净额(亿)</th>
+                                    <th style="width: 12%;">阶段涨跌幅</th>
+                                    <th style="width: 16%;">主力净流入占比(%)</th>
+                                </tr>
+                                """
+    if "5日" in fund_flow_rankings["industry"]:
+        # 按净流入降序的前20名（已在数据刷新时预先计算）
+        sorted_df = fund_flow_rankings["industry"]["5日"]["top"]
+        yield render_fund_flow_rows(sorted_df)
+    else:
+        yield """
+                                <tr>
+                                    <td colspan="5" style="text-align: center; padding: 20px; color: #999;">暂无数据</td>
+                                </tr>
+        """
+    yield """
+                            </table>
+                        </div>
+                    </div>
+                    
+                    <div style="flex: 1; min-width: 0;">
+                        <h3>10日排行</h3>
+                        <div class="table-container" style="width: 100%;">
+                            <table>
+                                <tr>
+                                    <th style="width: 12%;">排名</th>
+                                    <th style="width: 48%;">行业板块</th>
+                                    <th style="width: 12%;">净额(亿)</th>
+                                    <th style="width: 12%;">阶段涨跌幅</th>
+                                    <th style="width: 16%;">主力净流入占比(%)</th>
+                                </tr>
+                                """
+    if "10日" in fund_flow_rankings["industry"]:
+        # 按净流入降序的前20名（已在数据刷新时预先计算）
+        sorted_df = fund_flow_rankings["industry"]["10日"]["top"]
+        yield render_fund_flow_rows(sorted_df)
+    else:
+        yield """
+                                <tr>
+                                    <td colspan="5" style="text-align: center; padding: 20px; color: #999;">暂无数据</td>
+                                </tr>
+        """
+    yield """
+                            </table>
+                        </div>
+                    </div>
+                    
+                    <div style="flex: 1; min-width: 0;">
+                        <h3>20日排行</h3>
+                        <div class="table-container" style="width: 100%;">
+                            <table>
+                                <tr>
+                                    <th style="width: 12%;">排名</th>
+                                    <th style="width: 48%;">行业板块</th>
+                                    <th style="width: 12%;">净额(亿)</th>
+                                    <th style="width: 12%;">阶段涨跌幅</th>
+                                    <th style="width: 16%;">主力净流入占比(%)</th>
+                                </tr>
+                                """
+    if "20日" in fund_flow_rankings["industry"]:
+        # 按净流入降序的前20名（已在数据刷新时预先计算）
+        sorted_df = fund_flow_rankings["industry"]["20日"]["top"]
+        yield render_fund_flow_rows(sorted_df)
+    else:
+        yield """
+                                <tr>
+                                    <td colspan="4" style="text-align: center; padding: 20px; color: #999;">暂无数据</td>
+                                </tr>
+        """
+    yield """
+                            </table>
+                        </div>
+                    </div>
                 </div>
             </div>
-        </div>
-        <div class="sidebar">
-            <div class="sidebar-title">📊 复盘助手</div>
-            <div class="nav-menu">
-                <div class="nav-item" onclick="showPage('hot-rank')">🔥 市场热点股票</div>
-                <div class="nav-item" onclick="showPage('capital-flow')">💰 资金流向</div>
-                <div class="nav-item" onclick="showPage('board-info')">📊 板块信息</div>
-                <div class="nav-item active" onclick="showPage('limit-up')">📈 涨停股池数据</div>
-                <div class="nav-item" onclick="showPage('chen-xiaoqun')">👤 游资追踪</div>
-            </div>
-        </div>
-        <div class="main-content">
-            <div class="header">
-                <h1>🚀 涨停股池数据</h1>
-                <p class="subtitle">实时更新的涨停板行情数据</p>
-                <p class="refresh-time" style="color: rgba(255,255,255,0.7); font-size: 0.9em; margin-top: 5px;"></p>
-            </div>
-            <button class="refresh-btn" onclick="refreshCurrentPage()">🔄 刷新数据</button>
-            <div class="container">
-            <div id="limit-up-page" class="page-content">
-            
     """
-    
-    # 添加连板分类区域
-    if not today_pool.empty:
-        # 提取连板数大于1的股票
-        lianban_stocks = today_pool[today_pool['连板数'] > 1]
-        
-        if not lianban_stocks.empty:
-            # 按连板数分组
-            lianban_groups = lianban_stocks.groupby('连板数')
-            
-            html += """
-            <div class="lianban-section">
-                <div class="lianban-cards">
-            """
-            
-            for lianban_num, group in sorted(lianban_groups):
-                # 为每个连板数分配不同底色（低饱和度）
-                colors = ['#e3ddd7', '#d7e3de', '#d7e1e3', '#ded7e3']
-                color_idx = (lianban_num - 2) % len(colors)
-                bg_color = colors[color_idx]
-                
-                stocks_list = []
-                for _, row in group.iterrows():
-                    stock_url = get_stock_url(row['代码'])
-                    stocks_list.append(f"""
-                        <div class="lianban-stock-item" style="cursor: pointer; transition: all 0.3s ease;" onclick="window.open('{stock_url}', '_blank')">
-                            <div class="stock-code">{row['代码']}</div>
-                            <div class="stock-name">{row['名称']}</div>
-                            <div class="stock-change {'positive' if row['涨跌幅'] > 0 else 'negative'}">{row['涨跌幅']:.2f}%</div>
+
+
+def market_activity_chart_data(market_activity):
+    """板块信息页两个饼图的数据：[上涨, 下跌, 平盘] 和 [真实涨停, 一字涨停, 真实跌停, 一字跌停]"""
+    def value(item):
+        if market_activity.empty or item not in market_activity['item'].values:
+            return 0
+        found = market_activity.loc[market_activity['item'] == item, 'value'].iloc[0]
+        return found.item() if hasattr(found, 'item') else found
+
+    up_down = [value('上涨'), value('下跌'), value('平盘')]
+    limit = [value('真实涨停'), value('涨停') - value('真实涨停') if value('涨停') else 0,
+             value('真实跌停'), value('跌停') - value('真实跌停') if value('跌停') else 0]
+    return up_down, limit
+
+
+def iter_board_info_page(board_info, industry_info, market_activity):
+    """板块信息页：市场赚钱效应、概念与行业板块列表
+
+    饼图的数据放在画布的 data-values 上，随页面内容一起按需获取和重新加载，由页面脚本的 initCharts 绘制。
+    """
+    up_down_data, limit_data = market_activity_chart_data(market_activity)
+    yield """
+            <div class="section">
+                <h2>� 市场赚钱效应 <span style="font-size: 0.8em; color: #666;">实时统计</span></h2>
+                <div class="market-activity-container">
+                    <div class="activity-grid">
+                        <div class="activity-card positive">
+                            <div class="activity-icon">📈</div>
+                            <div class="activity-title">上涨家数</div>
+                            <div class="activity-value">""" + str(market_activity.loc[market_activity['item'] == '上涨', 'value'].iloc[0] if not market_activity.empty and '上涨' in market_activity['item'].values else '0') + """</div>
                         </div>
-                    """)
-                
-                html += f"""
-                    <div class="lianban-card" style="background-color: {bg_color};">
-                        <div class="lianban-title">{lianban_num}连板</div>
-                        <div class="lianban-divider"></div>
-                        <div class="lianban-count">共 {len(group)} 只</div>
-                        <div class="lianban-stocks">
-                            {''.join(stocks_list)}
+                        <div class="activity-card positive">
+                            <div class="activity-icon">🔥</div>
+                            <div class="activity-title">涨停家数</div>
+                            <div class="activity-value">""" + str(market_activity.loc[market_activity['item'] == '涨停', 'value'].iloc[0] if not market_activity.empty and '涨停' in market_activity['item'].values else '0') + """</div>
+                        </div>
+                        <div class="activity-card positive">
+                            <div class="activity-icon">💎</div>
+                            <div class="activity-title">真实涨停</div>
+                            <div class="activity-value">""" + str(market_activity.loc[market_activity['item'] == '真实涨停', 'value'].iloc[0] if not market_activity.empty and '真实涨停' in market_activity['item'].values else '0') + """</div>
+                        </div>
+                        <div class="activity-card negative">
+                            <div class="activity-icon">📉</div>
+                            <div class="activity-title">下跌家数</div>
+                            <div class="activity-value">""" + str(market_activity.loc[market_activity['item'] == '下跌', 'value'].iloc[0] if not market_activity.empty and '下跌' in market_activity['item'].values else '0') + """</div>
+                        </div>
+                        <div class="activity-card negative">
+                            <div class="activity-icon">💧</div>
+                            <div class="activity-title">跌停家数</div>
+                            <div class="activity-value">""" + str(market_activity.loc[market_activity['item'] == '跌停', 'value'].iloc[0] if not market_activity.empty and '跌停' in market_activity['item'].values else '0') + """</div>
+                        </div>
+                        <div class="activity-card negative">
+                            <div class="activity-icon">💣</div>
+                            <div class="activity-title">真实跌停</div>
+                            <div class="activity-value">""" + str(market_activity.loc[market_activity['item'] == '真实跌停', 'value'].iloc[0] if not market_activity.empty and '真实跌停' in market_activity['item'].values else '0') + """</div>
+                        </div>
+                        <div class="activity-card neutral">
+                            <div class="activity-icon">📊</div>
+                            <div class="activity-title">市场活跃度</div>
+                            <div class="activity-value">""" + str(market_activity.loc[market_activity['item'] == '活跃度', 'value'].iloc[0] if not market_activity.empty and '活跃度' in market_activity['item'].values else '0%') + """</div>
+                        </div>
+                        <div class="activity-card neutral">
+                            <div class="activity-icon">⏸️</div>
+                            <div class="activity-title">平盘家数</div>
+                            <div class="activity-value">""" + str(market_activity.loc[market_activity['item'] == '平盘', 'value'].iloc[0] if not market_activity.empty and '平盘' in market_activity['item'].values else '0') + """</div>
+                        </div>
+                        <div class="activity-card neutral">
+                            <div class="activity-icon">🚫</div>
+                            <div class="activity-title">停牌家数</div>
+                            <div class="activity-value">""" + str(market_activity.loc[market_activity['item'] == '停牌', 'value'].iloc[0] if not market_activity.empty and '停牌' in market_activity['item'].values else '0') + """</div>
                         </div>
                     </div>
-                """
-            
-            html += """
                 </div>
             </div>
-            """
-    
-    html += """
             <div class="section">
-                <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 20px;">
-                    <h2 style="margin-bottom: 0;">📈 今日涨停股池 - """ + today_str + """ <span style="font-size: 0.8em; color: #666;">(共 """ + str(len(today_pool)) + """ 只)</span></h2>
-                    <button onclick="exportToCSV()" style="padding: 8px 16px; background: #27ae60; color: white; border: none; border-radius: 5px; cursor: pointer; font-size: 14px; font-weight: 600; transition: all 0.3s ease;">📥 导出CSV</button>
-                </div>
-                
-                <div class="charts-section" style="display: flex; gap: 20px; margin-bottom: 30px; flex-wrap: wrap;">
-                    <div class="chart-card" style="flex: 1; min-width: 300px; background: #f8f9fa; border-radius: 10px; padding: 20px; box-shadow: 0 2px 8px rgba(0,0,0,0.1);">
-                        <h3 style="text-align: center; color: #2c3e50; margin-bottom: 15px; font-size: 1.2rem;">📊 行业分布</h3>
-                        <div style="position: relative; height: 300px;">
-                            <canvas id="industryChart"></canvas>
-                        </div>
+                <h2>📊 市场分布饼图 <span style="font-size: 0.8em; color: #666;">可视化分析</span></h2>
+                <div class="chart-container">
+                    <div class="chart-card">
+                        <div class="chart-title">上涨下跌分布</div>
+                        <canvas id="upDownChart" class="chart-canvas" data-values='""" + json.dumps(up_down_data) + """'></canvas>
                     </div>
-                    
-                    <div class="chart-card" style="flex: 1; min-width: 300px; background: #f8f9fa; border-radius: 10px; padding: 20px; box-shadow: 0 2px 8px rgba(0,0,0,0.1);">
-                        <h3 style="text-align: center; color: #2c3e50; margin-bottom: 15px; font-size: 1.2rem;">📈 连板统计</h3>
-                        <div style="position: relative; height: 300px;">
-                            <canvas id="boardChart"></canvas>
-                        </div>
+                    <div class="chart-card">
+                        <div class="chart-title">涨停跌停分布</div>
+                        <canvas id="limitChart" class="chart-canvas" data-values='""" + json.dumps(limit_data) + """'></canvas>
                     </div>
                 </div>
-                
-                <div class="table-container">
-                    <table>
-                        <tr>
-                            <th>序号</th>
-                            <th>代码</th>
-                            <th>名称</th>
-                            <th>涨跌幅(%)</th>
-                            <th>最新价</th>
-                            <th>成交额(亿)</th>
-                            <th>流通市值(亿)</th>
-                            <th>换手率(%)</th>
-                            <th>封板资金(亿)</th>
-                            <th>首次封板时间</th>
-                            <th>最后封板时间</th>
-                            <th>炸板次数</th>
-                            <th>涨停统计</th>
-                            <th>连板数</th>
-                            <th>所属行业</th>
-                            <th>涨停原因</th>
-                        </tr>
+            </div>
+            <div class="section">
+                <h2>�� 板块信息 <span style="font-size: 0.8em; color: #666;">概念与行业</span></h2>
+                <div style="display: flex; gap: 20px; width: 100%;">
+                    <div style="flex: 1; margin-right: 10px;">
+                        <h3>概念板块 (共 """ + str(len(board_info)) + """ 个)</h3>
+                        <div class="table-container" style="width: 100%;">
+                            <table>
+                                <tr>
+                                    <th>排名</th>
+                                    <th>板块名称</th>
+                                    <th>板块代码</th>
+                                    <th>最新价</th>
+                                    <th>涨跌幅(%)</th>
+                                    <th>总市值(亿)</th>
+                                    <th>换手率(%)</th>
+                                    <th>上涨家数</th>
+                                    <th>下跌家数</th>
+                                    <th>领涨股票</th>
+                                    <th>领涨股票-涨跌幅(%)</th>
+                                </tr>
     """
     
-    if not today_pool.empty:
-        for _, row in today_pool.iterrows():
-            change_class = 'positive' if row['涨跌幅'] > 0 else 'negative'
-            limit_up_reason = row.get('涨停原因', '未知')
-            stock_url = get_stock_url(row['代码'])
-            html += f"""
-                        <tr>
-                            <td>{int(row['序号'])}</td>
-                            <td>{row['代码']}</td>
-                            <td><a href="{stock_url}" target="_blank" style="color: #3498db; text-decoration: none; font-weight: 500;">{row['名称']}</a></td>
-                            <td class="{change_class}">{row['涨跌幅']:.2f}</td>
-                            <td>{row['最新价']:.2f}</td>
-                            <td>{row['成交额']/100000000:.2f}</td>
-                            <td>{row['流通市值']/100000000:.2f}</td>
-                            <td>{row['换手率']:.2f}</td>
-                            <td>{row['封板资金']/100000000:.2f}</td>
-                            <td>{format_time(row['首次封板时间'])}</td>
-                            <td>{format_time(row['最后封板时间'])}</td>
-                            <td>{int(row['炸板次数'])}</td>
-                            <td>{row['涨停统计']}</td>
-                            <td>{int(row['连板数'])}</td>
-                            <td>{row['所属行业']}</td>
-                            <td style="color: #e74c3c; font-weight: 500;">{limit_up_reason}</td>
-                        </tr>
-            """
+    if not board_info.empty:
+        yield render_board_concept_rows(board_info)
     else:
-        html += """
-                        <tr>
-                            <td colspan="17" style="text-align: center; padding: 20px; color: #999;">暂无数据</td>
-                        </tr>
+        yield """
+                                <tr>
+                                    <td colspan="11" style="text-align: center; padding: 20px; color: #999;">暂无数据</td>
+                                </tr>
         """
     
-    html += """
-                    </table>
-                </div>
-            </div>
-            </div>
-            <div id="hot-rank-page" class="page-content" style="display: none;">
-            <div style="display: flex; gap: 20px; width: 100%;">
-                <div class="section" style="flex: 1; min-width: 0;">
-                    <h2>🔥 百度热搜股票 - 今日</h2>
-                    <div class="table-container">
-                        <table>
-                            <tr>
-                                <th>排名</th>
-                                <th>股票名称</th>
-                                <th>涨跌幅(%)</th>
-                                <th>综合热度</th>
-                            </tr>
-                            <tbody id="hot-search-today-tbody">
-                            """
-    if hot_search_data and "今日" in hot_search_data and not hot_search_data["今日"].empty:
-        for idx, row in hot_search_data["今日"].iterrows():
-            name_code = row.get('名称/代码', '')
-            change_pct = row.get('涨跌幅', '0%')
-            hot_value = row.get('综合热度', 0)
-            
-            stock_code = ''
-            stock_name = ''
-            if '(' in name_code and ')' in name_code:
-                stock_name = name_code.split('(')[0].strip()
-                stock_code = name_code.split('(')[1].split(')')[0].strip()
-            else:
-                stock_name = name_code
-            
-            if isinstance(change_pct, str):
-                change_value = float(change_pct.replace('%', '').replace('+', ''))
-            else:
-                change_value = float(change_pct) if pd.notna(change_pct) else 0
-            change_class = 'positive' if change_value > 0 else 'negative'
-            
-            stock_url = get_stock_url(stock_code) if stock_code else '#'
-            html += f"""
+    yield """
+                            </table>
+                        </div>
+                    </div>
+                    <div style="flex: 1; margin-left: 10px;">
+                        <h3>行业板块 (共 """ + str(len(industry_info)) + """ 个)</h3>
+                        <div class="table-container" style="width: 100%;">
+                            <table>
                                 <tr>
-                                    <td>{idx + 1}</td>
-                                    <td><a href="{stock_url}" target="_blank" style="color: #3498db; text-decoration: none; font-weight: 500;">{stock_name}</a></td>
-                                    <td class="{change_class}">{change_pct}</td>
-                                    <td>{hot_value:,}</td>
+                                    <th>排名</th>
+                                    <th>板块名称</th>
+                                    <th>涨跌幅(%)</th>
+                                    <th>总成交量(万手)</th>
+                                    <th>总成交额(亿元)</th>
+                                    <th>净流入(亿元)</th>
+                                    <th>上涨家数</th>
+                                    <th>下跌家数</th>
+                                    <th>均价</th>
+                                    <th>领涨股</th>
+                                    <th>领涨股-最新价</th>
+                                    <th>领涨股-涨跌幅(%)</th>
                                 </tr>
-                """
+    """
+    
+    if not industry_info.empty:
+        yield render_board_industry_rows(industry_info)
     else:
-        html += """
+        yield """
                                 <tr>
-                                    <td colspan="4" style="text-align: center; padding: 40px; color: #999;">暂无数据</td>
+                                    <td colspan="12" style="text-align: center; padding: 20px; color: #999;">暂无数据</td>
                                 </tr>
-            """
-    html += """
-                            </tbody>
-                        </table>
+        """
+    
+    yield """
+                            </table>
+                        </div>
                     </div>
                 </div>
-                <div class="section" style="flex: 1; min-width: 0;">
-                    <h2>🔥 百度热搜股票 - 1小时</h2>
-                    <div class="table-container">
-                        <table>
+            </div>
+    """
+
+
+def iter_yz_page(yz_lhb_data):
+    """游资追踪页：各游资的龙虎榜记录"""
+    yield """
+            <div class="section">
+                <h2>👤 游资龙虎榜追踪</h2>
+                <div style="margin-bottom: 15px;">
+                    <select id="yz-select" onchange="changeYz()" style="padding: 8px 12px; font-size: 14px; border-radius: 5px; border: 1px solid #ddd; background: #fff; cursor: pointer;">
+    """
+    if yz_lhb_data:
+        for yz_name in yz_lhb_data.keys():
+            yield f"""
+                        <option value="{yz_name}">{yz_name}</option>
+            """
+    yield """
+                    </select>
+                </div>
+                <div class="table-container">
+                    <table id="yz-table">
+                        <thead>
                             <tr>
-                                <th>排名</th>
+                                <th>序号</th>
+                                <th>股票代码</th>
                                 <th>股票名称</th>
+                                <th>交易日期</th>
                                 <th>涨跌幅(%)</th>
-                                <th>综合热度</th>
+                                <th>买入金额(万)</th>
+                                <th>卖出金额(万)</th>
+                                <th>净额(万)</th>
+                                <th>上榜原因</th>
                             </tr>
-                            <tbody id="hot-search-hour-tbody">
-                            """
-    if hot_search_data and "1小时" in hot_search_data and not hot_search_data["1小时"].empty:
-        for idx, row in hot_search_data["1小时"].iterrows():
-            name_code = row.get('名称/代码', '')
-            change_pct = row.get('涨跌幅', '0%')
-            hot_value = row.get('综合热度', 0)
-            
-            stock_code = ''
-            stock_name = ''
-            if '(' in name_code and ')' in name_code:
-                stock_name = name_code.split('(')[0].strip()
-                stock_code = name_code.split('(')[1].split(')')[0].strip()
+                        </thead>
+                        """
+    if yz_lhb_data:
+        first_yz = list(yz_lhb_data.keys())[0]
+        for yz_name, yz_data in yz_lhb_data.items():
+            yield f"""
+                        <tbody id="yz-data-{yz_name}" style="display: {'table-row-group' if yz_name == first_yz else 'none'};">
+            """
+            if not yz_data.empty:
+                yield render_lhb_rows(yz_data)
             else:
-                stock_name = name_code
+                yield """
+                            <tr>
+                                <td colspan="9" style="text-align: center; padding: 40px; color: #999;">暂无数据</td>
+                            </tr>
+                """
+            yield """
+                        </tbody>
+            """
+    else:
+        yield """
+                        <tr>
+                            <td colspan="9" style="text-align: center; padding: 40px; color: #999;">暂无数据</td>
+                        </tr>
+        """
+    yield """
+                    </table>
+                </div>
+            </div>
+    """
+
+
+# 报告的各个标签页：页面id -> (生成函数, 参数名)，按页面在文档中的顺序排列
+REPORT_PAGE_RENDERERS = {
+    'limit-up': (iter_limit_up_page, ('today_pool', 'streak_data')),
+    'hot-rank': (iter_hot_rank_page, ('hot_search_data', 'hot_rank_data')),
+    'capital-flow': (iter_capital_flow_page, ('fund_flow_rankings',)),
+    'board-info': (iter_board_info_page, ('board_info', 'industry_info', 'market_activity')),
+    'chen-xiaoqun': (iter_yz_page, ('yz_lhb_data',)),
+}
+REPORT_PAGES = tuple(REPORT_PAGE_RENDERERS)
+DEFAULT_REPORT_PAGE = 'limit-up'
+# 按需加载的页面在外壳中只保留占位，首次打开时由页面脚本从 /api/page/<页面id> 获取
+REPORT_PAGE_PLACEHOLDER = """
+            <div class="section" style="text-align: center; padding: 40px; color: #999;">加载中...</div>
+"""
+
+
+def iter_report_page(page_id, data):
+    """逐段生成某个标签页的内容，data 中按名称提供该页面需要的数据"""
+    func, arg_names = REPORT_PAGE_RENDERERS[page_id]
+    return func(*(data.get(name) for name in arg_names))
+
+
+def render_report_pages(page_ids, data):
+    """把若干标签页分别渲染成HTML字符串，返回 {页面id: HTML}；data 的键与 fetch_report_data 的结果相同"""
+    if 'capital-flow' in page_ids and data.get('fund_flow_rankings') is None:
+        data = dict(data, fund_flow_rankings=get_fund_flow_rankings(data.get('capital_flow_data'), data.get('industry_flow_data')))
+    return {page_id: "".join(profile_iter(f"render:{page_id}", iter_report_page(page_id, data))) for page_id in page_ids}
+
+
+def iter_limit_up_pool_html(today_pool, yesterday_pool, board_info, industry_info, capital_flow_data=None, industry_flow_data=None, yz_lhb_data=None, cls_news=None, ths_news=None, hot_search_data=None, hot_rank_data=None, market_activity=None, streak_data=None, fund_flow_rankings=None, lazy_pages=(), rendered_pages=None):
+    """逐段生成涨停股池HTML报告
+
+    各段按顺序产出字符串片段，可直接写入文件或作为流式响应输出，
+    避免在循环中反复拼接整份文档。参数与 generate_limit_up_pool_html 相同。
+    lazy_pages 中的页面只输出占位（按需加载的页面外壳）；rendered_pages 为已渲染好的页面 {页面id: HTML}，直接使用。
+    """
+    # 资金流排行，未提供时按传入的资金流数据计算
+    if fund_flow_rankings is None:
+        fund_flow_rankings = get_fund_flow_rankings(capital_flow_data, industry_flow_data)
+    
+    # 获取股票市场活跃度数据
+    if market_activity is None:
+        market_activity = get_market_activity()
+    
+    # 如果没有提供新闻数据，则获取
+    if cls_news is None:
+        cls_news = get_cls_news()
+    if ths_news is None:
+        ths_news = get_ths_news()
+    
+    # 生成新闻HTML
+    news_html = ""
+    news_items = []
+    
+    # 添加财联社新闻
+    if not cls_news.empty:
+        news_items += render_news_items(cls_news, "财联社")
+    
+    # 添加同花顺新闻
+    if not ths_news.empty:
+        news_items += render_news_items(ths_news, "同花顺", start_idx=len(news_items))
+    
+    # 如果有新闻，则使用新闻数据
+    if news_items:
+        # 重复新闻以实现无缝滚动
+        news_html = '\n                    '.join(news_items + news_items)
+    else:
+        # 默认新闻
+        default_news = [
+            "📈 沪指今日收涨0.5%，创业板指涨1.2%",
+            "💰 北向资金净流入50亿元，连续3日净买入",
+            "🚀 新能源板块强势领涨，多股涨停",
+            "📊 央行今日开展1000亿元逆回购操作",
+            "🔥 科技股持续活跃，人工智能概念受关注"
+        ]
+        news_html = '\n                    '.join([f"<span class='news-item'>{news}</span>" for news in default_news * 2])
+    
+    rendered_pages = rendered_pages or {}
+    page_data = {
+        'today_pool': today_pool, 'streak_data': streak_data, 'hot_search_data': hot_search_data,
+        'hot_rank_data': hot_rank_data, 'fund_flow_rankings': fund_flow_rankings, 'board_info': board_info,
+        'industry_info': industry_info, 'market_activity': market_activity, 'yz_lhb_data': yz_lhb_data
+    }
+    
+    yield f"""
+    <!DOCTYPE html>
+    <html lang="zh-CN">
+    <head>
+        <meta charset="UTF-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1.0">
+        <title>涨停股池数据</title>
+        <style>
+            * {{
+                margin: 0;
+                padding: 0;
+                box-sizing: border-box;
+                font-family: 'Microsoft YaHei', 'PingFang SC', sans-serif;
+            }}
+            body {{
+                font-family: 'Microsoft YaHei', 'PingFang SC', sans-serif;
+                background: linear-gradient(135deg, #2c3e50 0%, #34495e 100%);
+                min-height: 100vh;
+                padding: 0;
+                display: flex;
+                margin: 0;
+            }}
+            .news-ticker {{
+                position: fixed;
+                top: 0;
+                left: 0;
+                right: 0;
+                height: 55px;
+                background: linear-gradient(90deg, #1a252f 0%, #2c3e50 100%);
+                color: white;
+                display: flex;
+                align-items: center;
+                overflow: hidden;
+                z-index: 1000;
+                border-bottom: 2px solid rgba(255, 255, 255, 0.1);
+            }}
+            .news-label {{
+                background: #e74c3c;
+                color: white;
+                padding: 0 20px;
+                height: 100%;
+                display: flex;
+                align-items: center;
+                font-weight: 600;
+                font-size: 16px;
+                white-space: nowrap;
+                z-index: 10;
+            }}
+            .news-content {{
+                flex: 1;
+                overflow: hidden;
+                position: relative;
+                height: 100%;
+                display: flex;
+                align-items: center;
+            }}
+            .news-scroll {{
+                display: flex;
+                animation: scroll 280s linear infinite;
+                white-space: nowrap;
+            }}
+            .news-scroll:hover {{
+                animation-play-state: paused;
+            }}
+            .news-item {{
+                display: inline-block;
+                padding: 0 40px;
+                font-size: 16px;
+                color: rgba(255, 255, 255, 0.95);
+            }}
+            .news-item a {{
+                color: rgba(255, 255, 255, 0.9);
+                text-decoration: none;
+                transition: color 0.3s ease;
+            }}
+            .news-item a:hover {{
+                color: #3498db;
+            }}
+            @keyframes scroll {{
+                0% {{
+                    transform: translateX(0);
+                }}
+                100% {{
+                    transform: translateX(-50%);
+                }}
+            }}
+            .sidebar {{
+                width: 250px;
+                background: rgba(0, 0, 0, 0.3);
+                backdrop-filter: blur(10px);
+                padding: 30px 20px;
+                display: flex;
+                flex-direction: column;
+                position: fixed;
+                height: 100vh;
+                overflow-y: auto;
+                border-right: 1px solid rgba(255, 255, 255, 0.1);
+                top: 55px;
+            }}
+            .sidebar-title {{
+                color: white;
+                font-size: 1.8rem;
+                font-weight: 700;
+                margin-bottom: 30px;
+                text-align: center;
+                padding-bottom: 20px;
+                border-bottom: 2px solid rgba(255, 255, 255, 0.2);
+            }}
+            .nav-menu {{
+                display: flex;
+                flex-direction: column;
+                gap: 10px;
+            }}
+            .nav-item {{
+                padding: 15px 20px;
+                color: rgba(255, 255, 255, 0.8);
+                text-decoration: none;
+                border-radius: 8px;
+                transition: all 0.3s ease;
+                font-size: 1rem;
+                font-weight: 500;
+                cursor: pointer;
+            }}
+            .nav-item:hover {{
+                background: rgba(255, 255, 255, 0.15);
+                color: white;
+                transform: translateX(5px);
+            }}
+            .nav-item.active {{
+                background: rgba(255, 255, 255, 0.2);
+                color: white;
+                font-weight: 600;
+            }}
+            .main-content {{
+                flex: 1;
+                margin-left: 250px;
+                padding: 20px;
+                margin-top: 55px;
+            }}
+            .header {{
+                text-align: center;
+                margin-bottom: 30px;
+                color: white;
+            }}
+            h1 {{
+                font-size: 2.5rem;
+                font-weight: 700;
+                margin-bottom: 10px;
+                text-shadow: 2px 2px 4px rgba(0,0,0,0.2);
+            }}
+            .subtitle {{
+                font-size: 1.1rem;
+                color: rgba(255,255,255,0.9);
+            }}
+            .refresh-btn {{
+                display: block;
+                margin: 0 auto 30px;
+                padding: 12px 30px;
+                background: rgba(255,255,255,0.2);
+                color: white;
+                border: 2px solid white;
+                border-radius: 8px;
+                cursor: pointer;
+                font-size: 16px;
+                font-weight: 600;
+                transition: all 0.3s ease;
+            }}
+            .refresh-btn:hover {{
+                background: rgba(255,255,255,0.3);
+                transform: translateY(-2px);
+            }}
+            .container {{
+                display: flex;
+                flex-direction: column;
+                gap: 40px;
+                max-width: 100%;
+                margin: 0 auto;
+                width: 100%;
+            }}
+            .section {{
+                background: white;
+                border-radius: 0;
+                box-shadow: none;
+                border-bottom: 2px solid #e0e0e0;
+                padding: 25px 0;
+                transition: all 0.3s ease;
+            }}
+            .section:hover {{
+                box-shadow: none;
+            }}
+            h2 {{
+                color: #2c3e50;
+                margin-bottom: 20px;
+                font-size: 1.5rem;
+                font-weight: 600;
+                border-bottom: 3px solid #a3b3b4;
+                padding-bottom: 10px;
+            }}
+            .table-container {{
+                max-height: 600px;
+                overflow-x: auto;
+                overflow-y: auto;
+                border-radius: 8px;
+                border: 1px solid #e0e0e0;
+            }}
+            table {{
+                width: 100%;
+                border-collapse: collapse;
+            }}
+            th {{
+                background: linear-gradient(135deg, #2c3e50 0%, #34495e 100%);
+                color: white;
+                padding: 12px 10px;
+                text-align: center;
+                font-weight: 600;
+                position: sticky;
+                top: 0;
+                z-index: 10;
+                font-size: 13px;
+                white-space: nowrap;
+            }}
+            td {{
+                padding: 10px;
+                text-align: center;
+                border-bottom: 1px solid #f0f0f0;
+                color: #333;
+                font-size: 13px;
+            }}
+            tr:hover {{
+                background-color: #f8f9fa;
+                transition: all 0.2s ease;
+            }}
+            tr:nth-child(even) {{
+                background-color: #fafafa;
+            }}
+            .positive {{
+                color: #e74c3c;
+                font-weight: 600;
+            }}
+            .negative {{
+                color: #27ae60;
+                font-weight: 600;
+            }}
+            .highlight {{
+                background: linear-gradient(135deg, #2c3e5015 0%, #34495e15 100%) !important;
+            }}
+            .market-activity-container {{
+                margin-top: 20px;
+            }}
+            .activity-grid {{
+                display: grid;
+                grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
+                gap: 15px;
+                margin-top: 20px;
+            }}
+            .activity-card {{
+                background: white;
+                border-radius: 12px;
+                padding: 15px;
+                box-shadow: 0 4px 12px rgba(0,0,0,0.08);
+                text-align: center;
+                transition: all 0.3s ease;
+                border-left: 4px solid;
+            }}
+            .activity-card:hover {{
+                transform: translateY(-5px);
+                box-shadow: 0 8px 20px rgba(0,0,0,0.12);
+            }}
+            .activity-card.positive {{
+                border-left-color: #27ae60;
+            }}
+            .activity-card.negative {{
+                border-left-color: #e74c3c;
+            }}
+            .activity-card.neutral {{
+                border-left-color: #95a5a6;
+            }}
+            .activity-icon {{
+                font-size: 2rem;
+                margin-bottom: 8px;
+            }}
+            .activity-title {{
+                font-size: 0.9rem;
+                color: #666;
+                margin-bottom: 8px;
+                font-weight: 600;
+            }}
+            .activity-value {{
+                 font-size: 1.8rem;
+                 font-weight: 700;
+                 color: #2c3e50;
+             }}
             
-            if isinstance(change_pct, str):
-                change_value = float(change_pct.replace('%', '').replace('+', ''))
-            else:
-                change_value = float(change_pct) if pd.notna(change_pct) else 0
-            change_class = 'positive' if change_value > 0 else 'negative'
+            /* Scrollbar styling */
+            .table-container::-webkit-scrollbar {{
+                width: 8px;
+            }}
+            .table-container::-webkit-scrollbar-track {{
+                background: #f1f1f1;
+                border-radius: 4px;
+            }}
+            .table-container::-webkit-scrollbar-thumb {{
+                background: #a3b3b4;
+                border-radius: 4px;
+            }}
+            .table-container::-webkit-scrollbar-thumb:hover {{
+                background: #5a6c7d;
+                border-radius: 4px;
+                transition: background 0.2s ease;
+            }}
             
-            stock_url = get_stock_url(stock_code) if stock_code else '#'
-            html += f"""
-                                <tr>
-                                    <td>{idx + 1}</td>
-                                    <td><a href="{stock_url}" target="_blank" style="color: #3498db; text-decoration: none; font-weight: 500;">{stock_name}</a></td>
-                                    <td class="{change_class}">{change_pct}</td>
-                                    <td>{hot_value:,}</td>
-                                </tr>
-                """
-    else:
-        html += """
-                                <tr>
-                                    <td colspan="4" style="text-align: center; padding: 40px; color: #999;">暂无数据</td>
-                                </tr>
-            """
-    html += """
-                            </tbody>
-                        </table>
-                    </div>
-                </div>
-                <div class="section" style="flex: 1; min-width: 0;">
-                    <h2>📈 东方财富热度榜</h2>
-                    <div class="table-container">
-                        <table>
-                            <tr>
-                                <th>排名</th>
-                                <th>股票代码</th>
-                                <th>股票名称</th>
-                                <th>最新价</th>
-                                <th>涨跌额</th>
-                                <th>涨跌幅(%)</th>
-                            </tr>
-                            <tbody id="hot-rank-tbody">
-                            """
-    if hot_rank_data is not None and not hot_rank_data.empty:
-        for idx, row in hot_rank_data.iterrows():
-            stock_code = row.get('代码', '')
-            stock_name = row.get('股票名称', '')
-            latest_price = row.get('最新价', 0)
-            change_amount = row.get('涨跌额', 0)
-            change_pct = row.get('涨跌幅', 0)
+            /* Chart styling */
+            .chart-container {{
+                display: flex;
+                justify-content: space-around;
+                flex-wrap: wrap;
+                gap: 30px;
+                margin-top: 30px;
+            }}
+            .chart-card {{
+                background: white;
+                border-radius: 12px;
+                padding: 25px;
+                box-shadow: 0 4px 12px rgba(0,0,0,0.08);
+                width: 450px;
+                text-align: center;
+            }}
+            .chart-title {{
+                font-size: 1.3rem;
+                color: #2c3e50;
+                margin-bottom: 20px;
+                font-weight: 600;
+            }}
+            .chart-canvas {{
+                width: 100% !important;
+                height: 300px !important;
+            }}
+            .lianban-section {{
+                margin-bottom: 30px;
+                background: linear-gradient(135deg, #f8f9fa 0%, #e9ecef 100%);
+            }}
+            .lianban-cards {{
+                display: flex;
+                gap: 10px;
+                flex-wrap: nowrap;
+                width: 100%;
+            }}
+            .lianban-card {{
+                flex: 1;
+                min-width: 0;
+                max-width: none;
+                background: white;
+                border-radius: 0;
+                box-shadow: none;
+                padding: 20px;
+                transition: all 0.3s ease;
+            }}
+            .lianban-card:hover {{
+                box-shadow: 0 4px 8px rgba(0,0,0,0.1);
+            }}
+            .lianban-title {{
+                font-size: 1.8rem;
+                font-weight: 700;
+                color: #e74c3c;
+                margin-bottom: 5px;
+            }}
+            .lianban-count {{
+                font-size: 0.9rem;
+                color: #666;
+                margin-bottom: 15px;
+            }}
+            .lianban-divider {{
+                height: 2px;
+                background: #a3b3b4;
+                margin: 10px 0;
+            }}
+            .lianban-stocks {{
+                display: flex;
+                flex-direction: column;
+                gap: 10px;
+            }}
+            .lianban-stock-item {{
+                display: flex;
+                justify-content: space-between;
+                align-items: center;
+                padding: 10px;
+                background: #f8f9fa;
+                border-radius: 6px;
+                transition: all 0.2s ease;
+            }}
+            .lianban-stock-item:hover {{
+                background: #e9ecef;
+            }}
+            .stock-code {{
+                font-weight: 600;
+                color: #2c3e50;
+                font-size: 0.9rem;
+            }}
+            .stock-name {{
+                flex: 1;
+                text-align: center;
+                font-weight: 500;
+                color: #333;
+                font-size: 0.95rem;
+            }}
+            .stock-change {{
+                font-weight: 600;
+                font-size: 0.9rem;
+                padding: 4px 8px;
+                border-radius: 4px;
+            }}
+            .stock-change.positive {{
+                color: #e74c3c;
+            }}
+            .stock-change.negative {{
+                color: #27ae60;
+            }}
+            @media (max-width: 1200px) {{
+                .lianban-card {{
+                    flex: 1 1 calc(50% - 20px);
+                }}
+            }}
+            @media (max-width: 768px) {{
+                .lianban-card {{
+                    flex: 1 1 100%;
+                }}
+            }}
+        </style>
+        <script src="https://cdn.jsdelivr.net/npm/chart.js@4.4.8/dist/chart.umd.min.js"></script>
+        <script src="https://cdn.jsdelivr.net/npm/chartjs-plugin-datalabels@2.2.0/dist/chartjs-plugin-datalabels.min.js"></script>
+        <script>
+            function showPage(pageId) {{
+                var limitUpPage = document.getElementById('limit-up-page');
+                var boardInfoPage = document.getElementById('board-info-page');
+                var capitalFlowPage = document.getElementById('capital-flow-page');
+                var chenXiaoqunPage = document.getElementById('chen-xiaoqun-page');
+                var hotRankPage = document.getElementById('hot-rank-page');
+                var navItems = document.querySelectorAll('.nav-item');
+                var headerTitle = document.querySelector('h1');
+                var headerSubtitle = document.querySelector('.subtitle');
+                
+                if (pageId === 'limit-up') {{
+                    limitUpPage.style.display = 'block';
+                    boardInfoPage.style.display = 'none';
+                    capitalFlowPage.style.display = 'none';
+                    chenXiaoqunPage.style.display = 'none';
+                    hotRankPage.style.display = 'none';
+                    navItems[0].classList.remove('active');
+                    navItems[1].classList.remove('active');
+                    navItems[2].classList.remove('active');
+                    navItems[3].classList.add('active');
+                    navItems[4].classList.remove('active');
+                    headerTitle.textContent = '🚀 涨停股池数据';
+                    headerSubtitle.textContent = '实时更新的涨停板行情数据';
+                    initLimitUpCharts();
+                }} else if (pageId === 'board-info') {{
+                    limitUpPage.style.display = 'none';
+                    boardInfoPage.style.display = 'block';
+                    capitalFlowPage.style.display = 'none';
+                    chenXiaoqunPage.style.display = 'none';
+                    hotRankPage.style.display = 'none';
+                    navItems[0].classList.remove('active');
+                    navItems[1].classList.remove('active');
+                    navItems[2].classList.add('active');
+                    navItems[3].classList.remove('active');
+                    navItems[4].classList.remove('active');
+                    headerTitle.textContent = '📊 概念板块信息';
+                    headerSubtitle.textContent = '实时更新的概念板块行情数据';
+                    loadPage('board-info').then(initCharts);
+                }} else if (pageId === 'capital-flow') {{
+                    limitUpPage.style.display = 'none';
+                    boardInfoPage.style.display = 'none';
+                    capitalFlowPage.style.display = 'block';
+                    chenXiaoqunPage.style.display = 'none';
+                    hotRankPage.style.display = 'none';
+                    navItems[0].classList.remove('active');
+                    navItems[1].classList.add('active');
+                    navItems[2].classList.remove('active');
+                    navItems[3].classList.remove('active');
+                    navItems[4].classList.remove('active');
+                    headerTitle.textContent = '💰 资金流向数据';
+                    headerSubtitle.textContent = '实时更新的资金流向统计数据';
+                    loadPage('capital-flow');
+                }} else if (pageId === 'chen-xiaoqun') {{
+                    limitUpPage.style.display = 'none';
+                    boardInfoPage.style.display = 'none';
+                    capitalFlowPage.style.display = 'none';
+                    chenXiaoqunPage.style.display = 'block';
+                    hotRankPage.style.display = 'none';
+                    navItems[0].classList.remove('active');
+                    navItems[1].classList.remove('active');
+                    navItems[2].classList.remove('active');
+                    navItems[3].classList.remove('active');
+                    navItems[4].classList.add('active');
+                    headerTitle.textContent = '👤 游资追踪';
+                    headerSubtitle.textContent = '知名游资龙虎榜追踪';
+                    loadPage('chen-xiaoqun');
+                }} else if (pageId === 'hot-rank') {{
+                    limitUpPage.style.display = 'none';
+                    boardInfoPage.style.display = 'none';
+                    capitalFlowPage.style.display = 'none';
+                    chenXiaoqunPage.style.display = 'none';
+                    hotRankPage.style.display = 'block';
+                    navItems[0].classList.add('active');
+                    navItems[1].classList.remove('active');
+                    navItems[2].classList.remove('active');
+                    navItems[3].classList.remove('active');
+                    navItems[4].classList.remove('active');
+                    headerTitle.textContent = '🔥 市场热点股票';
+                    headerSubtitle.textContent = '实时更新的热点人气排行榜';
+                    loadPage('hot-rank');
+                }}
+            }}
             
-            change_class = 'positive' if change_pct > 0 else 'negative'
-            stock_url = get_stock_url(stock_code) if stock_code else '#'
-            html += f"""
-                                <tr>
-                                    <td>{int(row.get('当前排名', idx + 1))}</td>
-                                    <td>{stock_code}</td>
-                                    <td><a href="{stock_url}" target="_blank" style="color: #3498db; text-decoration: none; font-weight: 500;">{stock_name}</a></td>
-                                    <td>{latest_price:.2f}</td>
-                                    <td>{change_amount:.2f}</td>
-                                    <td class="{change_class}">{change_pct:.2f}</td>
-                                </tr>
-                """
-    else:
-        html += """
-                                <tr>
-                                    <td colspan="6" style="text-align: center; padding: 40px; color: #999;">暂无数据</td>
-                                </tr>
-            """
-    html += """
-                            </tbody>
-                        </table>
-                    </div>
-                </div>
-            </div>
-            </div>
-            <div id="capital-flow-page" class="page-content" style="display: none;">
-            <div class="section">
-                <h2>📊 概念资金流排行</h2>
-                <div style="display: flex; gap: 10px; width: 100%; overflow-x: auto;">
-                    <div style="flex: 1; min-width: 0;">
-                        <h3>即时排行</h3>
-                        <div class="table-container" style="width: 100%;">
-                            <table>
-                                <tr>
-                                    <th style="width: 12%;">排名</th>
-                                    <th style="width: 48%;">概念板块</th>
-                                    <th style="width: 12%;">净额(亿)</th>
-                                    <th style="width: 12%;">阶段涨跌幅</th>
-                                    <th style="width: 16%;">主力净流入占比(%)</th>
-                                </tr>
-                                """
-    if capital_flow_data and "即时" in capital_flow_data and not capital_flow_data["即时"].empty:
-        sorted_df = capital_flow_data["即时"].sort_values(by="净额", ascending=False).head(20)
-        for idx, row in sorted_df.iterrows():
-            change_pct = row.get('行业-涨跌幅', '0%')
-            if isinstance(change_pct, str) and '%' in change_pct:
-                change_value = float(change_pct.replace('%', ''))
-                display_pct = change_pct
-            else:
-                change_value = float(change_pct) if pd.notna(change_pct) else 0
-                display_pct = f"{change_value:.2f}%"
+            // 带 data-lazy 的页面只有占位，首次打开时从服务器获取内容；返回加载完成的 Promise
+            const loadedPages = {{}};
             
-            inflow = row.get('流入资金', 0)
-            outflow = row.get('流出资金', 0)
-            net_amount = row.get('净额', 0)
-            if inflow + outflow != 0:
-                net_flow_ratio = (net_amount / (inflow + outflow)) * 100
-            else:
-                net_flow_ratio = 0
-            net_flow_class = 'positive' if net_flow_ratio > 0 else 'negative'
+            function loadPage(pageId, reload) {{
+                const page = document.getElementById(pageId + '-page');
+                if (!page || !page.hasAttribute('data-lazy')) {{
+                    return Promise.resolve();
+                }}
+                if (loadedPages[pageId] && !reload) {{
+                    return loadedPages[pageId];
+                }}
+                loadedPages[pageId] = fetch('/api/page/' + pageId)
+                    .then(response => {{
+                        if (!response.ok) {{
+                            throw new Error('HTTP ' + response.status);
+                        }}
+                        return response.json();
+                    }})
+                    .then(data => {{
+                        page.innerHTML = data.html;
+                        if (pageId === 'board-info' && reload) {{
+                            initCharts();
+                        }}
+                        console.log('页面内容加载成功:', pageId);
+                    }})
+                    .catch(error => {{
+                        delete loadedPages[pageId];
+                        console.error('加载页面内容失败:', pageId, error);
+                    }});
+                return loadedPages[pageId];
+            }}
             
-            html += f"""
-                                <tr>
-                                    <td>{idx + 1}</td>
-                                    <td>{row['行业']}</td>
-                                    <td class="{'positive' if row['净额'] > 0 else 'negative'}">{row['净额']:.2f}</td>
-                                    <td class="{'positive' if change_value > 0 else 'negative'}">{display_pct}</td>
-                                    <td class="{net_flow_class}">{net_flow_ratio:.2f}</td>
-                                </tr>
-            """
-    else:
-        html += """
-                                <tr>
-                                    <td colspan="5" style="text-align: center; padding: 20px; color: #999;">暂无数据</td>
-                                </tr>
-        """
-    html += """
-                            </table>
-                        </div>
-                    </div>
+            function exportToCSV() {{
+                const table = document.querySelector('#limit-up-page table');
+                if (!table) {{
+                    alert('未找到数据表');
+                    return;
+                }}
+                
+                let csv = [];
+                const rows = table.querySelectorAll('tr');
+                
+                for (let i = 0; i < rows.length; i++) {{
+                    const row = [], cols = rows[i].querySelectorAll('td, th');
                     
-                    <div style="flex: 1; min-width: 0;">
-                        <h3>3日排行</h3>
-                        <div class="table-container" style="width: 100%;">
-                            <table>
-                                <tr>
-                                    <th style="width: 12%;">排名</th>
-                                    <th style="width: 48%;">概念板块</th>
-                                    <th style="width: 12%;">净额(亿)</th>
-                                    <th style="width: 12%;">阶段涨跌幅</th>
-                                    <th style="width: 16%;">主力净流入占比(%)</th>
-                                </tr>
-                                """
-    if capital_flow_data and "3日" in capital_flow_data and not capital_flow_data["3日"].empty:
-        # 按净流入降序排列
-        sorted_df = capital_flow_data["3日"].sort_values(by="净额", ascending=False).head(20)
-        for idx, row in sorted_df.iterrows():
-            change_pct = row.get('阶段涨跌幅', '0%')
-            if isinstance(change_pct, str) and '%' in change_pct:
-                change_value = float(change_pct.replace('%', ''))
-            else:
-                change_value = float(change_pct) if pd.notna(change_pct) else 0
-            
-            inflow = row.get('流入资金', 0)
-            outflow = row.get('流出资金', 0)
-            net_amount = row.get('净额', 0)
-            if inflow + outflow != 0:
-                net_flow_ratio = (net_amount / (inflow + outflow)) * 100
-            else:
-                net_flow_ratio = 0
-            net_flow_class = 'positive' if net_flow_ratio > 0 else 'negative'
-            
-            html += f"""
-                                <tr>
-                                    <td>{idx + 1}</td>
-                                    <td>{row['行业']}</td>
-                                    <td class="{'positive' if row['净额'] > 0 else 'negative'}">{row['净额']:.2f}</td>
-                                    <td class="{'positive' if change_value > 0 else 'negative'}">{change_pct}</td>
-                                    <td class="{net_flow_class}">{net_flow_ratio:.2f}</td>
-                                </tr>
-            """
-    else:
-        html += """
-                                <tr>
-                                    <td colspan="5" style="text-align: center; padding: 20px; color: #999;">暂无数据</td>
-                                </tr>
-        """
-    html += """
-                            </table>
-                        </div>
-                    </div>
+                    for (let j = 0; j < cols.length; j++) {{
+                        let text = cols[j].innerText.replace(/,/g, '，').replace(/\\n/g, ' ');
+                        row.push('"' + text + '"');
+                    }}
                     
-                    <div style="flex: 1;">
-                        <h3>5日排行</h3>
-                        <div class="table-container" style="width: 100%;">
-                            <table>
-                                <tr>
-                                    <th style="width: 12%;">排名</th>
-                                    <th style="width: 48%;">概念板块</th>
-                                    <th style="width: 12%;">净额(亿)</th>
-                                    <th style="width: 12%;">阶段涨跌幅</th>
-                                    <th style="width: 16%;">主力净流入占比(%)</th>
-                                </tr>
-                                """
-    if capital_flow_data and "5日" in capital_flow_data and not capital_flow_data["5日"].empty:
-        # 按净流入降序排列
-        sorted_df = capital_flow_data["5日"].sort_values(by="净额", ascending=False).head(20)
-        for idx, row in sorted_df.iterrows():
-            change_pct = row.get('阶段涨跌幅', '0%')
-            if isinstance(change_pct, str) and '%' in change_pct:
-                change_value = float(change_pct.replace('%', ''))
-            else:
-                change_value = float(change_pct) if pd.notna(change_pct) else 0
+                    csv.push(row.join(','));
+                }}
+                
+                const csvFile = new Blob([csv.join('\\n')], {{ type: 'text/csv;charset=utf-8;' }});
+                const downloadLink = document.createElement('a');
+                downloadLink.download = '涨停股池_' + new Date().toISOString().slice(0, 10) + '.csv';
+                downloadLink.href = window.URL.createObjectURL(csvFile);
+                downloadLink.style.display = 'none';
+                document.body.appendChild(downloadLink);
+                downloadLink.click();
+                document.body.removeChild(downloadLink);
+            }}
             
-            inflow = row.get('流入资金', 0)
-            outflow = row.get('流出资金', 0)
-            net_amount = row.get('净额', 0)
-            if inflow + outflow != 0:
-                net_flow_ratio = (net_amount / (inflow + outflow)) * 100
-            else:
-                net_flow_ratio = 0
-            net_flow_class = 'positive' if net_flow_ratio > 0 else 'negative'
+            function changeYz() {{
+                const select = document.getElementById('yz-select');
+                const selectedYz = select.value;
+                
+                const allTbodies = document.querySelectorAll('#yz-table tbody');
+                allTbodies.forEach(tbody => {{
+                    tbody.style.display = 'none';
+                }});
+                
+                const selectedTbody = document.getElementById('yz-data-' + selectedYz);
+                if (selectedTbody) {{
+                    selectedTbody.style.display = 'table-row-group';
+                }}
+            }}
             
-            html += f"""
-                                <tr>
-                                    <td>{idx + 1}</td>
-                                    <td>{row['行业']}</td>
-                                    <td class="{'positive' if row['净额'] > 0 else 'negative'}">{row['净额']:.2f}</td>
-                                    <td class="{'positive' if change_value > 0 else 'negative'}">{change_pct}</td>
-                                    <td class="{net_flow_class}">{net_flow_ratio:.2f}</td>
-                                </tr>
-            """
-    else:
-        html += """
-                                <tr>
-                                    <td colspan="5" style="text-align: center; padding: 20px; color: #999;">暂无数据</td>
-                                </tr>
-        """
-    html += """
-                            </table>
-                        </div>
-                    </div>
-                    
-                    <div style="flex: 1; min-width: 0;">
-                        <h3>10日排行</h3>
-                        <div class="table-container" style="width: 100%;">
-                            <table>
-                                <tr>
-                                    <th style="width: 12%;">排名</th>
-                                    <th style="width: 48%;">概念板块</th>
-                                    <th style="width: 12%;">净额(亿)</th>
-                                    <th style="width: 12%;">阶段涨跌幅</th>
-                                    <th style="width: 16%;">主力净流入占比(%)</th>
-                                </tr>
-                                """
-    if capital_flow_data and "10日" in capital_flow_data and not capital_flow_data["10日"].empty:
-        # 按净流入降序排列
-        sorted_df = capital_flow_data["10日"].sort_values(by="净额", ascending=False).head(20)
-        for idx, row in sorted_df.iterrows():
-            change_pct = row.get('阶段涨跌幅', '0%')
-            if isinstance(change_pct, str) and '%' in change_pct:
-                change_value = float(change_pct.replace('%', ''))
-            else:
-                change_value = float(change_pct) if pd.notna(change_pct) else 0
+            function refreshCurrentPage() {{
+                const activeNavItem = document.querySelector('.nav-item.active');
+                if (activeNavItem) {{
+                    const pageId = activeNavItem.onclick.toString().match(/'([^']+)'/)[1];
+                    showPage(pageId);
+                    updateRefreshTime();
+                    if (pageId === 'limit-up') {{
+                        initLimitUpCharts();
+                    }}
+                }}
+            }}
             
-            inflow = row.get('流入资金', 0)
-            outflow = row.get('流出资金', 0)
-            net_amount = row.get('净额', 0)
-            if inflow + outflow != 0:
-                net_flow_ratio = (net_amount / (inflow + outflow)) * 100
-            else:
-                net_flow_ratio = 0
-            net_flow_class = 'positive' if net_flow_ratio > 0 else 'negative'
+            function updateRefreshTime() {{
+                const now = new Date();
+                const timeStr = now.toLocaleString('zh-CN', {{
+                    year: 'numeric',
+                    month: '2-digit',
+                    day: '2-digit',
+                    hour: '2-digit',
+                    minute: '2-digit',
+                    second: '2-digit'
+                }});
+                const refreshTimeElements = document.querySelectorAll('.refresh-time');
+                refreshTimeElements.forEach(element => {{
+                    element.textContent = '最后刷新: ' + timeStr;
+                }});
+            }}
             
-            html += f"""
-                                <tr>
-                                    <td>{idx + 1}</td>
-                                    <td>{row['行业']}</td>
-                                    <td class="{'positive' if row['净额'] > 0 else 'negative'}">{row['净额']:.2f}</td>
-                                    <td class="{'positive' if change_value > 0 else 'negative'}">{change_pct}</td>
-                                    <td class="{net_flow_class}">{net_flow_ratio:.2f}</td>
-                                </tr>
-            """
-    else:
-        html += """
-                                <tr>
-                                    <td colspan="5" style="text-align: center; padding: 20px; color: #999;">暂无数据</td>
-                                </tr>
-        """
-    html += """
-                            </table>
-                        </div>
-                    </div>
-                    
-                    <div style="flex: 1;">
-                        <h3>20日排行</h3>
-                        <div class="table-container" style="width: 100%;">
-                            <table>
-                                <tr>
-                                    <th style="width: 12%;">排名</th>
-                                    <th style="width: 48%;">概念板块</th>
-                                    <th style="width: 12%;">净额(亿)</th>
-                                    <th style="width: 12%;">阶段涨跌幅</th>
-                                    <th style="width: 16%;">主力净流入占比(%)</th>
-                                </tr>
-                                """
-    if capital_flow_data and "20日" in capital_flow_data and not capital_flow_data["20日"].empty:
-        # 按净流入降序排列
-        sorted_df = capital_flow_data["20日"].sort_values(by="净额", ascending=False).head(20)
-        for idx, row in sorted_df.iterrows():
-            change_pct = row.get('阶段涨跌幅', '0%')
-            if isinstance(change_pct, str) and '%' in change_pct:
-                change_value = float(change_pct.replace('%', ''))
-            else:
-                change_value = float(change_pct) if pd.notna(change_pct) else 0
+            window.onload = function() {{
+                updateRefreshTime();
+                startAutoRefresh();
+                initLimitUpCharts();
+            }}
             
-            inflow = row.get('流入资金', 0)
-            outflow = row.get('流出资金', 0)
-            net_amount = row.get('净额', 0)
-            if inflow + outflow != 0:
-                net_flow_ratio = (net_amount / (inflow + outflow)) * 100
-            else:
-                net_flow_ratio = 0
-            net_flow_class = 'positive' if net_flow_ratio > 0 else 'negative'
+            // 服务器在数据更新后通过SSE推送事件，页面只拉取变化的数据源；不支持SSE时退回定时轮询
+            // 每个页面只有一条更新路径：按需加载的标签页由 page:<页面id> 事件整页重新获取，
+            // 数据接口的局部更新只用于内嵌在完整报告中的标签页（page 为该数据源所在的标签页）
+            const snapshotHandlers = {{
+                'news': {{update: updateNewsScroll}},
+                'hot_rank': {{update: updateHotRank, page: 'hot-rank'}}
+            }};
             
-            html += f"""
-                                <tr>
-                                    <td>{idx + 1}</td>
-                                    <td>{row['行业']}</td>
-                                    <td class="{'positive' if row['净额'] > 0 else 'negative'}">{row['净额']:.2f}</td>
-                                    <td class="{'positive' if change_value > 0 else 'negative'}">{change_pct}</td>
-                                    <td class="{net_flow_class}">{net_flow_ratio:.2f}</td>
-                                </tr>
-            """
-    else:
-        html += """
-                                <tr>
-                                    <td colspan="4" style="text-align: center; padding: 20px; color: #999;">暂无数据</td>
-                                </tr>
-        """
-    html += """
-                            </table>
-                        </div>
-                    </div>
-                </div>
-            </div>
+            function isLazyPage(pageId) {{
+                const page = document.getElementById(pageId + '-page');
+                return page !== null && page.hasAttribute('data-lazy');
+            }}
+            const loadedVersions = {{}};
+            let reportEtag = null;
             
-            <div class="section">
-                <h2>📊 行业资金流排行</h2>
-                <div style="display: flex; gap: 10px; width: 100%; overflow-x: auto;">
-                    <div style="flex: 1; min-width: 0;">
-                        <h3>即时排行</h3>
-                        <div class="table-container" style="width: 100%;">
-                            <table>
-                                <tr>
-                                    <th style="width: 12%;">排名</th>
-                                    <th style="width: 48%;">行业板块</th>
-                                    <th style="width: 12%;">净额(亿)</th>
-                                    <th style="width: 12%;">阶段涨跌幅</th>
-                                    <th style="width: 16%;">主力净流入占比(%)</th>
-                                </tr>
-                                """
-    if industry_flow_data and "即时" in industry_flow_data and not industry_flow_data["即时"].empty:
-        sorted_df = industry_flow_data["即时"].sort_values(by="净额", ascending=False).head(20)
-        for idx, row in sorted_df.iterrows():
-            change_pct = row.get('行业-涨跌幅', '0%')
-            if isinstance(change_pct, str) and '%' in change_pct:
-                change_value = float(change_pct.replace('%', ''))
-                display_pct = change_pct
-            else:
-                change_value = float(change_pct) if pd.notna(change_pct) else 0
-                display_pct = f"{change_value:.2f}%"
+            function startAutoRefresh() {{
+                if (!window.EventSource) {{
+                    startPolling();
+                    return;
+                }}
+                const source = new EventSource('/api/events');
+                source.addEventListener('snapshot', function(event) {{
+                    const info = JSON.parse(event.data);
+                    if (info.name.indexOf('page:') === 0) {{
+                        // 只重新获取已经打开过的页面，其余页面在首次打开时获取最新内容
+                        const pageId = info.name.slice(5);
+                        if (loadedPages[pageId] && loadedVersions[info.name] !== info.version) {{
+                            loadedVersions[info.name] = info.version;
+                            loadPage(pageId, true);
+                        }}
+                        return;
+                    }}
+                    const handler = snapshotHandlers[info.name];
+                    if (!handler || (handler.page && isLazyPage(handler.page))) {{
+                        return;
+                    }}
+                    if (loadedVersions[info.name] !== info.version) {{
+                        loadedVersions[info.name] = info.version;
+                        handler.update();
+                    }}
+                }});
+                source.addEventListener('report', function(event) {{
+                    const info = JSON.parse(event.data);
+                    if (reportEtag !== null && reportEtag !== info.etag) {{
+                        console.log('报告已重新生成，重新加载页面...');
+                        location.reload();
+                    }}
+                    reportEtag = info.etag;
+                }});
+                source.onerror = function() {{
+                    console.warn('推送连接断开，浏览器将自动重连');
+                }};
+            }}
             
-            inflow = row.get('流入资金', 0)
-            outflow = row.get('流出资金', 0)
-            net_amount = row.get('净额', 0)
-            if inflow + outflow != 0:
-                net_flow_ratio = (net_amount / (inflow + outflow)) * 100
-            else:
-                net_flow_ratio = 0
-            net_flow_class = 'positive' if net_flow_ratio > 0 else 'negative'
+            function startPolling() {{
+                // 每5分钟更新一次新闻，每10分钟更新一次市场热点，每15分钟刷新整个页面
+                setTimeout(updateNewsScroll, 1000);
+                setTimeout(updateHotRank, 2000);
+                setInterval(updateNewsScroll, 5 * 60 * 1000);
+                setInterval(updateHotRank, 10 * 60 * 1000);
+                setInterval(function() {{
+                    console.log('15分钟自动刷新页面以更新新闻...');
+                    location.reload();
+                }}, 15 * 60 * 1000);
+            }}
             
-            html += f"""
-                                <tr>
-                                    <td>{idx + 1}</td>
-                                    <td>{row['行业']}</td>
-                                    <td class="{'positive' if row['净额'] > 0 else 'negative'}">{row['净额']:.2f}</td>
-                                    <td class="{'positive' if change_value > 0 else 'negative'}">{display_pct}</td>
-                                    <td class="{net_flow_class}">{net_flow_ratio:.2f}</td>
-                                </tr>
-            """
-    else:
-        html += """
-                                <tr>
-                                    <td colspan="4" style="text-align: center; padding: 20px; color: #999;">暂无数据</td>
-                                </tr>
-        """
-    html += """
-                            </table>
-                        </div>
-                    </div>
-                    
-                    <div style="flex: 1; min-width: 0;">
-                        <h3>3日排行</h3>
-                        <div class="table-container" style="width: 100%;">
-                            <table>
-                                <tr>
-                                    <th style="width: 12%;">排名</th>
-                                    <th style="width: 48%;">行业板块</th>
-                                    <th style="width: 12%;">净额(亿)</th>
-                                    <th style="width: 12%;">阶段涨跌幅</th>
-                                    <th style="width: 16%;">主力净流入占比(%)</th>
-                                </tr>
-                                """
-    if industry_flow_data and "3日" in industry_flow_data and not industry_flow_data["3日"].empty:
-        # 按净流入降序排列
-        sorted_df = industry_flow_data["3日"].sort_values(by="净额", ascending=False).head(20)
-        for idx, row in sorted_df.iterrows():
-            change_pct = row.get('阶段涨跌幅', '0%')
-            if isinstance(change_pct, str) and '%' in change_pct:
-                change_value = float(change_pct.replace('%', ''))
-            else:
-                change_value = float(change_pct) if pd.notna(change_pct) else 0
+            // 实时更新滚动新闻：首次拉取全量，之后凭游标只拉取新增的新闻
+            const NEWS_DISPLAY_LIMIT = 100;
+            let newsItems = [];
+            let newsCursor = null;
             
-            inflow = row.get('流入资金', 0)
-            outflow = row.get('流出资金', 0)
-            net_amount = row.get('净额', 0)
-            if inflow + outflow != 0:
-                net_flow_ratio = (net_amount / (inflow + outflow)) * 100
-            else:
-                net_flow_ratio = 0
-            net_flow_class = 'positive' if net_flow_ratio > 0 else 'negative'
+            function renderNewsScroll() {{
+                const newsScroll = document.getElementById('newsScroll');
+                if (newsScroll && newsItems.length > 0) {{
+                    const newsHtml = newsItems.map(news =>
+                        `<span class='news-item'>${{news.icon}} [${{news.source}} ${{news.time}}] ${{news.title}}</span>`).join('');
+                    // 重复新闻以实现无缝滚动
+                    newsScroll.innerHTML = newsHtml + newsHtml;
+                }}
+            }}
             
-            html += f"""
-                                <tr>
-                                    <td>{idx + 1}</td>
-                                    <td>{row['行业']}</td>
-                                    <td class="{'positive' if row['净额'] > 0 else 'negative'}">{row['净额']:.2f}</td>
-                                    <td class="{'positive' if change_value > 0 else 'negative'}">{change_pct}</td>
-                                    <td class="{net_flow_class}">{net_flow_ratio:.2f}</td>
-                                </tr>
-            """
-    else:
-        html += """
-                                <tr>
-                                    <td colspan="5" style="text-align: center; padding: 20px; color: #999;">暂无数据</td>
-                                </tr>
-        """
-    html += """
-                            </table>
-                        </div>
-                    </div>
-                    
-                    <div style="flex: 1; min-width: 0;">
-                        <h3>5日排行</h3>
-                        <div class="table-container" style="width: 100%;">
-                            <table>
-                                <tr>
-                                    <th style="width: 12%;">排名</th>
-                                    <th style="width: 48%;">行业板块</th>
-                                    <th style="width: 12%;">净额(亿)</th>
-                                    <th style="width: 12%;">阶段涨跌幅</th>
-                                    <th style="width: 16%;">主力净流入占比(%)</th>
-                                </tr>
-                                """
-    if industry_flow_data and "5日" in industry_flow_data and not industry_flow_data["5日"].empty:
-        # 按净流入降序排列
-        sorted_df = industry_flow_data["5日"].sort_values(by="净额", ascending=False).head(20)
-        for idx, row in sorted_df.iterrows():
-            change_pct = row.get('阶段涨跌幅', '0%')
-            if isinstance(change_pct, str) and '%' in change_pct:
-                change_value = float(change_pct.replace('%', ''))
-            else:
-                change_value = float(change_pct) if pd.notna(change_pct) else 0
+            function updateNewsScroll() {{
+                const url = newsCursor === null ? '/api/news' : '/api/news?since=' + newsCursor;
+                fetch(url)
+                    .then(response => response.json())
+                    .then(data => {{
+                        if (data.reset) {{
+                            newsCursor = null;
+                            updateNewsScroll();
+                            return;
+                        }}
+                        const isDelta = newsCursor !== null;
+                        newsCursor = data.cursor;
+                        if (!data.news || data.news.length === 0) {{
+                            return;
+                        }}
+                        newsItems = isDelta ? data.news.concat(newsItems).slice(0, NEWS_DISPLAY_LIMIT) : data.news;
+                        renderNewsScroll();
+                        console.log(isDelta ? '新增新闻' : '新闻更新成功，共', data.news.length, '条');
+                    }})
+                    .catch(error => {{
+                        console.error('更新新闻失败:', error);
+                    }});
+            }}
+            
+            // 实时更新市场热点追踪
+            function updateHotRank() {{
+                fetch('/api/hot-rank')
+                    .then(response => response.json())
+                    .then(data => {{
+                        // 更新百度热搜今日数据
+                        if (data.hot_search && data.hot_search.length > 0) {{
+                            const hotSearchTodayTable = document.getElementById('hot-search-today-tbody');
+                            if (hotSearchTodayTable) {{
+                                let html = '';
+                                data.hot_search.forEach(item => {{
+                                    const changeClass = item.change > 0 ? 'positive' : (item.change < 0 ? 'negative' : '');
+                                    const stockUrl = item.code ? `https://quote.eastmoney.com/${{item.code}}.html` : '#';
+                                    html += `<tr>
+                                        <td>${{item.rank}}</td>
+                                        <td><a href="${{stockUrl}}" target="_blank" style="color: #3498db; text-decoration: none; font-weight: 500;">${{item.name}}</a></td>
+                                        <td class="${{changeClass}}">${{item.change}}</td>
+                                        <td>${{item.heat}}</td>
+                                    </tr>`;
+                                }});
+                                hotSearchTodayTable.innerHTML = html;
+                                console.log('百度热搜今日更新成功，共', data.hot_search.length, '条');
+                            }}
+                        }}
+                        
+                        // 更新东方财富热度榜数据
+                        if (data.hot_rank && data.hot_rank.length > 0) {{
+                            const hotRankTable = document.getElementById('hot-rank-tbody');
+                            if (hotRankTable) {{
+                                let html = '';
+                                data.hot_rank.forEach(item => {{
+                                    const changeClass = item.change > 0 ? 'positive' : (item.change < 0 ? 'negative' : '');
+                                    const stockUrl = item.code ? `https://quote.eastmoney.com/${{item.code}}.html` : '#';
+                                    html += `<tr>
+                                        <td>${{item.rank}}</td>
+                                        <td>${{item.code}}</td>
+                                        <td><a href="${{stockUrl}}" target="_blank" style="color: #3498db; text-decoration: none; font-weight: 500;">${{item.name}}</a></td>
+                                        <td>${{item.price.toFixed(2)}}</td>
+                                        <td>${{(item.price * item.change / 100).toFixed(2)}}</td>
+                                        <td class="${{changeClass}}">${{item.change.toFixed(2)}}%</td>
+                                    </tr>`;
+                                }});
+                                hotRankTable.innerHTML = html;
+                                console.log('东方财富热度榜更新成功，共', data.hot_rank.length, '条');
+                            }}
+                        }}
+                    }})
+                    .catch(error => {{
+                        console.error('更新市场热点失败:', error);
+                    }});
+            }}
+
+            // 饼图数据取自板块信息页内容中画布的 data-values，页面重新加载后用新数据重绘
+            function chartValues(canvas) {{
+                const existing = Chart.getChart(canvas);
+                if (existing) {{
+                    existing.destroy();
+                }}
+                return JSON.parse(canvas.dataset.values || '[]');
+            }}
             
-            inflow = row.get('流入资金', 0)
-            outflow = row.get('流出资金', 0)
-            net_amount = row.get('净额', 0)
-            if inflow + outflow != 0:
-                net_flow_ratio = (net_amount / (inflow + outflow)) * 100
-            else:
-                net_flow_ratio = 0
-            net_flow_class = 'positive' if net_flow_ratio > 0 else 'negative'
+            function initCharts() {{
+            // 上涨下跌饼图
+            const upDownCanvas = document.getElementById('upDownChart');
+            if (!upDownCanvas) {{
+                return;
+            }}
+            const upDownValues = chartValues(upDownCanvas);
+            new Chart(upDownCanvas.getContext('2d'), {{
+                type: 'doughnut',
+                plugins: [ChartDataLabels],
+                    data: {{
+                        labels: ['上涨', '下跌', '平盘'],
+                        datasets: [{{
+                            data: upDownValues,
+                            backgroundColor: ['#f5cac3', '#84a98c', '#cad2c5'],
+                            borderWidth: 0
+                        }}]
+                    }},
+                    options: {{
+                        responsive: true,
+                        maintainAspectRatio: false,
+                        plugins: {{
+                            legend: {{
+                                position: 'bottom',
+                                labels: {{
+                                    font: {{
+                                        size: 12
+                                    }}
+                                }}
+                            }},
+                            title: {{
+                                display: true,
+                                text: '市场赚钱效应',
+                                font: {{
+                                    size: 12,
+                                    weight: 'bold'
+                                }}
+                            }},
+                            tooltip: {{
+                                callbacks: {{
+                                    label: function(context) {{
+                                        return context.label + ': ' + context.raw;
+                                    }}
+                                }}
+                            }},
+                            datalabels: {{
+                                display: true,
+                                color: '#ffffff',
+                                font: {{
+                                    size: 12,
+                                    weight: 'bold'
+                                }},
+                                formatter: function(value, context) {{
+                                    return value;
+                                }}
+                            }}
+                        }}
+                    }}
+                }});
+                
+                // 涨停跌停饼图
+            const limitCanvas = document.getElementById('limitChart');
+            const limitValues = chartValues(limitCanvas);
+            new Chart(limitCanvas.getContext('2d'), {{
+                type: 'doughnut',
+                plugins: [ChartDataLabels],
+                    data: {{
+                        labels: ['真实涨停', '一字涨停', '真实跌停', '一字跌停'],
+                        datasets: [{{
+                            data: limitValues,
+                            backgroundColor: ['#f28482', '#e5989b', '#84a98c', '#52796f'],
+                            borderWidth: 0
+                        }}]
+                    }},
+                    options: {{
+                        responsive: true,
+                        maintainAspectRatio: false,
+                        plugins: {{
+                            legend: {{
+                                position: 'bottom',
+                                labels: {{
+                                    font: {{
+                                        size: 12
+                                    }}
+                                }}
+                            }},
+                            title: {{
+                                display: true,
+                                text: '涨停跌停分布（总数=真实+一字）',
+                                font: {{
+                                    size: 14,
+                                    weight: 'bold'
+                                }}
+                            }},
+                            tooltip: {{
+                                callbacks: {{
+                                    label: function(context) {{
+                                        return context.label + ': ' + context.raw;
+                                    }}
+                                }}
+                            }},
+                            datalabels: {{
+                                display: true,
+                                color: '#ffffff',
+                                font: {{
+                                    size: 12,
+                                    weight: 'bold'
+                                }},
+                                formatter: function(value, context) {{
+                                    return value;
+                                }}
+                            }}
+                        }}
+                    }}
+                }});
+            }}
             
-            html += f"""
-                                <tr>
-                                    <td>{idx + 1}</td>
-                                    <td>{row['行业']}</td>
-                                    <td class="{'positive' if row['净额'] > 0 else 'negative'}">{row['净额']:.2f}</td>
-                                    <td class="{'positive' if change_value > 0 else 'negative'}">{change_pct}</td>
-                                    <td class="{net_flow_class}">{net_flow_ratio:.2f}</td>
-                                </tr>
-            """
-    else:
-        html += """
-                                <tr>
-                                    <td colspan="5" style="text-align: center; padding: 20px; color: #999;">暂无数据</td>
-                                </tr>
-        """
-    html += """
-                            </table>
-                        </div>
-                    </div>
+            function initLimitUpCharts() {{
+                const industryData = {json.dumps(analyze_limit_up_statistics(today_pool)['industry_stats'], ensure_ascii=False)};
+                const industryStocks = {json.dumps(analyze_limit_up_statistics(today_pool)['industry_stocks'], ensure_ascii=False)};
+                const boardData = {json.dumps(analyze_limit_up_statistics(today_pool)['board_stats'], ensure_ascii=False)};
+                
+                // 行业分布饼图
+                const industryCtx = document.getElementById('industryChart');
+                if (industryCtx) {{
+                    const industryLabels = Object.keys(industryData).slice(0, 10);
+                    const industryValues = industryLabels.map(k => industryData[k]);
+                    const colors = ['#e74c3c', '#3498db', '#2ecc71', '#f39c12', '#9b59b6', '#1abc9c', '#e67e22', '#34495e', '#16a085', '#c0392b'];
                     
-                    <div style="flex: 1; min-width: 0;">
-                        <h3>10日排行</h3>
-                        <div class="table-container" style="width: 100%;">
-                            <table>
-                                <tr>
-                                    <th style="width: 12%;">排名</th>
-                                    <th style="width: 48%;">行业板块</th>
-                                    <th style="width: 12%;">净额(亿)</th>
-                                    <th style="width: 12%;">阶段涨跌幅</th>
-                                    <th style="width: 16%;">主力净流入占比(%)</th>
-                                </tr>
-                                """
-    if industry_flow_data and "10日" in industry_flow_data and not industry_flow_data["10日"].empty:
-        # 按净流入降序排列
-        sorted_df = industry_flow_data["10日"].sort_values(by="净额", ascending=False).head(20)
-        for idx, row in sorted_df.iterrows():
-            change_pct = row.get('阶段涨跌幅', '0%')
-            if isinstance(change_pct, str) and '%' in change_pct:
-                change_value = float(change_pct.replace('%', ''))
-            else:
-                change_value = float(change_pct) if pd.notna(change_pct) else 0
-            
-            inflow = row.get('流入资金', 0)
-            outflow = row.get('流出资金', 0)
-            net_amount = row.get('净额', 0)
-            if inflow + outflow != 0:
-                net_flow_ratio = (net_amount / (inflow + outflow)) * 100
-            else:
-                net_flow_ratio = 0
-            net_flow_class = 'positive' if net_flow_ratio > 0 else 'negative'
-            
-            html += f"""
-                                <tr>
-                                    <td>{idx + 1}</td>
-                                    <td>{row['行业']}</td>
-                                    <td class="{'positive' if row['净额'] > 0 else 'negative'}">{row['净额']:.2f}</td>
-                                    <td class="{'positive' if change_value > 0 else 'negative'}">{change_pct}</td>
-                                    <td class="{net_flow_class}">{net_flow_ratio:.2f}</td>
-                                </tr>
-            """
-    else:
-        html += """
-                                <tr>
-                                    <td colspan="5" style="text-align: center; padding: 20px; color: #999;">暂无数据</td>
-                                </tr>
-        """
-    html += """
-                            </table>
-                        </div>
-                    </div>
+                    new Chart(industryCtx, {{
+                        type: 'pie',
+                        data: {{
+                            labels: industryLabels,
+                            datasets: [{{
+                                data: industryValues,
+                                backgroundColor: colors,
+                                borderWidth: 2,
+                                borderColor: '#fff'
+                            }}]
+                        }},
+                        options: {{
+                            responsive: true,
+                            maintainAspectRatio: false,
+                            plugins: {{
+                                legend: {{
+                                    position: 'right',
+                                    labels: {{
+                                        font: {{ size: 11 }},
+                                        padding: 8
+                                    }}
+                                }},
+                                tooltip: {{
+                                    callbacks: {{
+                                        label: function(context) {{
+                                            const total = context.dataset.data.reduce((a, b) => a + b, 0);
+                                            const percentage = ((context.raw / total) * 100).toFixed(1);
+                                            const industryName = context.label;
+                                            const stocks = industryStocks[industryName] || [];
+                                            let stockText = stocks.length > 0 ? '\\n股票: ' + stocks.join(', ') : '';
+                                            return context.label + ': ' + context.raw + '只 (' + percentage + '%)' + stockText;
+                                        }}
+                                    }}
+                                }}
+                            }}
+                        }}
+                    }});
+                }}
+                
+                // 连板统计饼图
+                const boardCtx = document.getElementById('boardChart');
+                if (boardCtx) {{
+                    const boardLabels = Object.keys(boardData);
+                    const boardValues = boardLabels.map(k => boardData[k]);
+                    const boardColors = ['#2ecc71', '#f39c12', '#e74c3c'];
                     
-                    <div style="flex: 1; min-width: 0;">
-                        <h3>20日排行</h3>
-                        <div class="table-container" style="width: 100%;">
-                            <table>
-                                <tr>
-                                    <th style="width: 12%;">排名</th>
-                                    <th style="width: 48%;">行业板块</th>
-                                    <th style="width: 12%;">净额(亿)</th>
-                                    <th style="width: 12%;">阶段涨跌幅</th>
-                                    <th style="width: 16%;">主力净流入占比(%)</th>
-                                </tr>
-                                """
-    if industry_flow_data and "20日" in industry_flow_data and not industry_flow_data["20日"].empty:
-        # 按净流入降序排列
-        sorted_df = industry_flow_data["20日"].sort_values(by="净额", ascending=False).head(20)
-        for idx, row in sorted_df.iterrows():
-            change_pct = row.get('阶段涨跌幅', '0%')
-            if isinstance(change_pct, str) and '%' in change_pct:
-                change_value = float(change_pct.replace('%', ''))
-            else:
-                change_value = float(change_pct) if pd.notna(change_pct) else 0
-            
-            inflow = row.get('流入资金', 0)
-            outflow = row.get('流出资金', 0)
-            net_amount = row.get('净额', 0)
-            if inflow + outflow != 0:
-                net_flow_ratio = (net_amount / (inflow + outflow)) * 100
-            else:
-                net_flow_ratio = 0
-            net_flow_class = 'positive' if net_flow_ratio > 0 else 'negative'
-            
-            html += f"""
-                                <tr>
-                                    <td>{idx + 1}</td>
-                                    <td>{row['行业']}</td>
-                                    <td class="{'positive' if row['净额'] > 0 else 'negative'}">{row['净额']:.2f}</td>
-                                    <td class="{'positive' if change_value > 0 else 'negative'}">{change_pct}</td>
-                                    <td class="{net_flow_class}">{net_flow_ratio:.2f}</td>
-                                </tr>
-            """
-    else:
-        html += """
-                                <tr>
-                                    <td colspan="4" style="text-align: center; padding: 20px; color: #999;">暂无数据</td>
-                                </tr>
-        """
-    html += """
-                            </table>
-                        </div>
-                    </div>
+                    new Chart(boardCtx, {{
+                        type: 'doughnut',
+                        data: {{
+                            labels: boardLabels,
+                            datasets: [{{
+                                data: boardValues,
+                                backgroundColor: boardColors,
+                                borderWidth: 3,
+                                borderColor: '#fff'
+                            }}]
+                        }},
+                        options: {{
+                            responsive: true,
+                            maintainAspectRatio: false,
+                            plugins: {{
+                                legend: {{
+                                    position: 'bottom',
+                                    labels: {{
+                                        font: {{ size: 14, weight: 'bold' }},
+                                        padding: 15
+                                    }}
+                                }},
+                                tooltip: {{
+                                    callbacks: {{
+                                        label: function(context) {{
+                                            const total = context.dataset.data.reduce((a, b) => a + b, 0);
+                                            const percentage = ((context.raw / total) * 100).toFixed(1);
+                                            return context.label + ': ' + context.raw + '只 (' + percentage + '%)';
+                                        }}
+                                    }}
+                                }}
+                            }}
+                        }}
+                    }});
+                }}
+            }}
+        </script>
+    </head>
+    <body>
+        <div class="news-ticker">
+            <div class="news-label">📰 财经快讯</div>
+            <div class="news-content">
+                <div class="news-scroll" id="newsScroll">
+                    """ + news_html + """
                 </div>
             </div>
+        </div>
+        <div class="sidebar">
+            <div class="sidebar-title">📊 复盘助手</div>
+            <div class="nav-menu">
+                <div class="nav-item" onclick="showPage('hot-rank')">🔥 市场热点股票</div>
+                <div class="nav-item" onclick="showPage('capital-flow')">💰 资金流向</div>
+                <div class="nav-item" onclick="showPage('board-info')">📊 板块信息</div>
+                <div class="nav-item active" onclick="showPage('limit-up')">📈 涨停股池数据</div>
+                <div class="nav-item" onclick="showPage('chen-xiaoqun')">👤 游资追踪</div>
             </div>
-            <div id="board-info-page" class="page-content" style="display: none;">
-            <div class="section">
-                <h2>� 市场赚钱效应 <span style="font-size: 0.8em; color: #666;">实时统计</span></h2>
-                <div class="market-activity-container">
-                    <div class="activity-grid">
-                        <div class="activity-card positive">
-                            <div class="activity-icon">📈</div>
-                            <div class="activity-title">上涨家数</div>
-                            <div class="activity-value">""" + str(market_activity.loc[market_activity['item'] == '上涨', 'value'].iloc[0] if not market_activity.empty and '上涨' in market_activity['item'].values else '0') + """</div>
-                        </div>
-                        <div class="activity-card positive">
-                            <div class="activity-icon">🔥</div>
-                            <div class="activity-title">涨停家数</div>
-                            <div class="activity-value">""" + str(market_activity.loc[market_activity['item'] == '涨停', 'value'].iloc[0] if not market_activity.empty and '涨停' in market_activity['item'].values else '0') + """</div>
-                        </div>
-                        <div class="activity-card positive">
-                            <div class="activity-icon">💎</div>
-                            <div class="activity-title">真实涨停</div>
-                            <div class="activity-value">""" + str(market_activity.loc[market_activity['item'] == '真实涨停', 'value'].iloc[0] if not market_activity.empty and '真实涨停' in market_activity['item'].values else '0') + """</div>
-                        </div>
-                        <div class="activity-card negative">
-                            <div class="activity-icon">📉</div>
-                            <div class="activity-title">下跌家数</div>
-                            <div class="activity-value">""" + str(market_activity.loc[market_activity['item'] == '下跌', 'value'].iloc[0] if not market_activity.empty and '下跌' in market_activity['item'].values else '0') + """</div>
-                        </div>
-                        <div class="activity-card negative">
-                            <div class="activity-icon">💧</div>
-                            <div class="activity-title">跌停家数</div>
-                            <div class="activity-value">""" + str(market_activity.loc[market_activity['item'] == '跌停', 'value'].iloc[0] if not market_activity.empty and '跌停' in market_activity['item'].values else '0') + """</div>
-                        </div>
-                        <div class="activity-card negative">
-                            <div class="activity-icon">💣</div>
-                            <div class="activity-title">真实跌停</div>
-                            <div class="activity-value">""" + str(market_activity.loc[market_activity['item'] == '真实跌停', 'value'].iloc[0] if not market_activity.empty and '真实跌停' in market_activity['item'].values else '0') + """</div>
-                        </div>
-                        <div class="activity-card neutral">
-                            <div class="activity-icon">📊</div>
-                            <div class="activity-title">市场活跃度</div>
-                            <div class="activity-value">""" + str(market_activity.loc[market_activity['item'] == '活跃度', 'value'].iloc[0] if not market_activity.empty and '活跃度' in market_activity['item'].values else '0%') + """</div>
-                        </div>
-                        <div class="activity-card neutral">
-                            <div class="activity-icon">⏸️</div>
-                            <div class="activity-title">平盘家数</div>
-                            <div class="activity-value">""" + str(market_activity.loc[market_activity['item'] == '平盘', 'value'].iloc[0] if not market_activity.empty and '平盘' in market_activity['item'].values else '0') + """</div>
-                        </div>
-                        <div class="activity-card neutral">
-                            <div class="activity-icon">🚫</div>
-                            <div class="activity-title">停牌家数</div>
-                            <div class="activity-value">""" + str(market_activity.loc[market_activity['item'] == '停牌', 'value'].iloc[0] if not market_activity.empty and '停牌' in market_activity['item'].values else '0') + """</div>
-                        </div>
-                    </div>
-                </div>
-            </div>
-            <div class="section">
-                <h2>📊 市场分布饼图 <span style="font-size: 0.8em; color: #666;">可视化分析</span></h2>
-                <div class="chart-container">
-                    <div class="chart-card">
-                        <div class="chart-title">上涨下跌分布</div>
-                        <canvas id="upDownChart" class="chart-canvas"></canvas>
-                    </div>
-                    <div class="chart-card">
-                        <div class="chart-title">涨停跌停分布</div>
-                        <canvas id="limitChart" class="chart-canvas"></canvas>
-                    </div>
-                </div>
+        </div>
+        <div class="main-content">
+            <div class="header">
+                <h1>🚀 涨停股池数据</h1>
+                <p class="subtitle">实时更新的涨停板行情数据</p>
+                <p class="refresh-time" style="color: rgba(255,255,255,0.7); font-size: 0.9em; margin-top: 5px;"></p>
             </div>
-            <div class="section">
-                <h2>�� 板块信息 <span style="font-size: 0.8em; color: #666;">概念与行业</span></h2>
-                <div style="display: flex; gap: 20px; width: 100%;">
-                    <div style="flex: 1; margin-right: 10px;">
-                        <h3>概念板块 (共 """ + str(len(board_info)) + """ 个)</h3>
-                        <div class="table-container" style="width: 100%;">
-                            <table>
-                                <tr>
-                                    <th>排名</th>
-                                    <th>板块名称</th>
-                                    <th>板块代码</th>
-                                    <th>最新价</th>
-                                    <th>涨跌幅(%)</th>
-                                    <th>总市值(亿)</th>
-                                    <th>换手率(%)</th>
-                                    <th>上涨家数</th>
-                                    <th>下跌家数</th>
-                                    <th>领涨股票</th>
-                                    <th>领涨股票-涨跌幅(%)</th>
-                                </tr>
-    """
-    
-    if not board_info.empty:
-        for _, row in board_info.iterrows():
-            change_class = 'positive' if row['涨跌幅'] > 0 else 'negative'
-            html += f"""
-                                <tr>
-                                    <td>{int(row['排名'])}</td>
-                                    <td>{row['板块名称']}</td>
-                                    <td>{row['板块代码']}</td>
-                                    <td>{row['最新价']:.2f}</td>
-                                    <td class="{change_class}">{row['涨跌幅']:.2f}</td>
-                                    <td>{row['总市值']/100000000:.2f}</td>
-                                    <td>{row['换手率']:.2f}</td>
-                                    <td>{int(row['上涨家数'])}</td>
-                                    <td>{int(row['下跌家数'])}</td>
-                                    <td>{row['领涨股票']}</td>
-                                    <td class="{change_class}">{row['领涨股票-涨跌幅']:.2f}</td>
-                                </tr>
-            """
-    else:
-        html += """
-                                <tr>
-                                    <td colspan="11" style="text-align: center; padding: 20px; color: #999;">暂无数据</td>
-                                </tr>
-        """
-    
-    html += """
-                            </table>
-                        </div>
-                    </div>
-                    <div style="flex: 1; margin-left: 10px;">
-                        <h3>行业板块 (共 """ + str(len(industry_info)) + """ 个)</h3>
-                        <div class="table-container" style="width: 100%;">
-                            <table>
-                                <tr>
-                                    <th>排名</th>
-                                    <th>板块名称</th>
-                                    <th>涨跌幅(%)</th>
-                                    <th>总成交量(万手)</th>
-                                    <th>总成交额(亿元)</th>
-                                    <th>净流入(亿元)</th>
-                                    <th>上涨家数</th>
-                                    <th>下跌家数</th>
-                                    <th>均价</th>
-                                    <th>领涨股</th>
-                                    <th>领涨股-最新价</th>
-                                    <th>领涨股-涨跌幅(%)</th>
-                                </tr>
+            <button class="refresh-btn" onclick="refreshCurrentPage()">🔄 刷新数据</button>
+            <div class="container">
     """
-    
-    if not industry_info.empty:
-        for _, row in industry_info.iterrows():
-            change_class = 'positive' if row['涨跌幅'] > 0 else 'negative'
-            html += f"""
-                                <tr>
-                                    <td>{int(row['序号'])}</td>
-                                    <td>{row['板块']}</td>
-                                    <td class="{change_class}">{row['涨跌幅']:.2f}</td>
-                                    <td>{row['总成交量']:.2f}</td>
-                                    <td>{row['总成交额']:.2f}</td>
-                                    <td>{row['净流入']:.2f}</td>
-                                    <td>{int(row['上涨家数'])}</td>
-                                    <td>{int(row['下跌家数'])}</td>
-                                    <td>{row['均价']:.2f}</td>
-                                    <td>{row['领涨股']}</td>
-                                    <td>{row['领涨股-最新价']:.2f}</td>
-                                    <td class="{change_class}">{row['领涨股-涨跌幅']:.2f}</td>
-                                </tr>
-            """
-    else:
-        html += """
-                                <tr>
-                                    <td colspan="12" style="text-align: center; padding: 20px; color: #999;">暂无数据</td>
-                                </tr>
+    for page_id in REPORT_PAGES:
+        hidden = '' if page_id == DEFAULT_REPORT_PAGE else ' style="display: none;"'
+        lazy = ' data-lazy="1"' if page_id in lazy_pages else ''
+        yield f"""
+            <div id="{page_id}-page" class="page-content"{lazy}{hidden}>
         """
-    
-    html += """
-                            </table>
-                        </div>
-                    </div>
-                </div>
-            </div>
+        if page_id in lazy_pages:
+            yield REPORT_PAGE_PLACEHOLDER
+        elif page_id in rendered_pages:
+            yield rendered_pages[page_id]
+        else:
+            yield from profile_iter(f"render:{page_id}", iter_report_page(page_id, page_data))
+        yield """
             </div>
-            <div id="chen-xiaoqun-page" class="page-content" style="display: none;">
-            <div class="section">
-                <h2>👤 游资龙虎榜追踪</h2>
-                <div style="margin-bottom: 15px;">
-                    <select id="yz-select" onchange="changeYz()" style="padding: 8px 12px; font-size: 14px; border-radius: 5px; border: 1px solid #ddd; background: #fff; cursor: pointer;">
-    """
-    if yz_lhb_data:
-        for yz_name in yz_lhb_data.keys():
-            html += f"""
-                        <option value="{yz_name}">{yz_name}</option>
-            """
-    html += """
-                    </select>
-                </div>
-                <div class="table-container">
-                    <table id="yz-table">
-                        <thead>
-                            <tr>
-                                <th>序号</th>
-                                <th>股票代码</th>
-                                <th>股票名称</th>
-                                <th>交易日期</th>
-                                <th>涨跌幅(%)</th>
-                                <th>买入金额(万)</th>
-                                <th>卖出金额(万)</th>
-                                <th>净额(万)</th>
-                                <th>上榜原因</th>
-                            </tr>
-                        </thead>
-                        """
-    if yz_lhb_data:
-        first_yz = list(yz_lhb_data.keys())[0]
-        for yz_name, yz_data in yz_lhb_data.items():
-            html += f"""
-                        <tbody id="yz-data-{yz_name}" style="display: {'table-row-group' if yz_name == first_yz else 'none'};">
-            """
-            if not yz_data.empty:
-                for _, row in yz_data.iterrows():
-                    change_class = 'positive' if row['涨跌幅'] > 0 else 'negative'
-                    net_class = 'positive' if row['净额'] > 0 else 'negative'
-                    stock_url = get_stock_url(row['股票代码'])
-                    html += f"""
-                            <tr>
-                                <td>{int(row['序号'])}</td>
-                                <td>{row['股票代码']}</td>
-                                <td><a href="{stock_url}" target="_blank" style="color: #3498db; text-decoration: none; font-weight: 500;">{row['股票名称']}</a></td>
-                                <td>{row['交易日期']}</td>
-                                <td class="{change_class}">{row['涨跌幅']:.2f}</td>
-                                <td>{row['买入金额']/10000:.2f}</td>
-                                <td>{row['卖出金额']/10000:.2f}</td>
-                                <td class="{net_class}">{row['净额']/10000:.2f}</td>
-                                <td>{row['上榜原因']}</td>
-                            </tr>
-                    """
-            else:
-                html += """
-                            <tr>
-                                <td colspan="9" style="text-align: center; padding: 40px; color: #999;">暂无数据</td>
-                            </tr>
-                """
-            html += """
-                        </tbody>
-            """
-    else:
-        html += """
-                        <tr>
-                            <td colspan="9" style="text-align: center; padding: 40px; color: #999;">暂无数据</td>
-                        </tr>
         """
-    html += """
-                    </table>
-                </div>
-            </div>
-            </div>
+    yield """
         </div>
         </div>
     </body>
 </html>
     """
     
-    return html
+
+def generate_limit_up_pool_html(*args, **kwargs):
+    """生成完整的涨停股池HTML报告字符串"""
+    return "".join(iter_limit_up_pool_html(*args, **kwargs))
+
+
+def write_limit_up_pool_html(file_path, *args, **kwargs):
+    """把HTML报告逐段写入文件，写完后原子替换目标文件
+
+    临时文件名带进程和线程编号，与同时生成报告的服务器互不覆盖；生成失败时删除临时文件，目标文件保持原样。
+    """
+    tmp_path = f"{file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for chunk in iter_limit_up_pool_html(*args, **kwargs):
+                f.write(chunk)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
 
 
 if __name__ == "__main__":
-    # 获取今天和昨天的涨停股池数据
+    import argparse
+    import profiler
+
+    parser = argparse.ArgumentParser(description="获取涨停股池等数据并生成HTML报告")
+    parser.add_argument("--profile", action="store_true", help="统计各抓取、处理、渲染阶段的耗时和CPU时间")
+    parser.add_argument("--profile-memory", action="store_true", help="同时用 tracemalloc 统计各阶段的内存峰值（明显变慢）")
+    parser.add_argument("--profile-cprofile", action="store_true", help="同时用 cProfile 统计函数调用，写入与JSON同名的 .prof 文件")
+    parser.add_argument("--profile-out", default=profiler.PROFILE_JSON, help="分阶段统计JSON的输出路径")
+    args = parser.parse_args()
+    if args.profile or args.profile_memory or args.profile_cprofile:
+        profiler.enable(memory=args.profile_memory, cprofile=args.profile_cprofile)
+
+    # 并发获取所有数据源
     print("=" * 60)
     print("开始获取涨停股池数据...")
     print("=" * 60)
+    with stage("pipeline:fetch_report_data", "pipeline"):
+        report_data, orchestrator = fetch_report_data()
+    orchestrator.print_summary()
     
-    # 获取今天涨停股池
-    print("\n正在获取今天涨停股池...")
-    today_pool = get_today_limit_up_pool()
-    
-    # 获取昨日涨停股池
-    print("\n正在获取昨日涨停股池...")
-    yesterday_pool = get_yesterday_limit_up_pool()
-    
-    # 获取概念板块信息
-    print("\n正在获取概念板块信息...")
-    board_info = get_board_concept_info()
-    
-    # 获取行业板块信息
-    print("\n正在获取行业板块信息...")
-    industry_info = get_board_industry_info()
-    
-    # 获取资金流向数据
-    print("\n正在获取资金流向数据...")
-    capital_flow_data = get_capital_flow_data()
-    
-    # 获取行业资金流向数据
-    print("\n正在获取行业资金流向数据...")
-    industry_flow_data = get_industry_flow_data()
-    
-    # 定义游资列表（游资名称: 营业部代码列表，支持多个ID）
-    yz_list = {
-        "陈小群": ["10030463"],
-        "章盟主": ["10000526029"],
-        "赵老哥": ["10023543"],
-        "炒股养家": ["10028416","10028419"],
-        "宁波桑田路": ["10456710"],
-        "逍闲派": ["10026729"]
-    }
-    
-    # 获取所有游资的龙虎榜数据
-    print("\n正在获取游资龙虎榜数据...")
-    yz_lhb_data = {}
-    for yz_name, yyb_codes in yz_list.items():
-        print(f"  正在获取 {yz_name} 的数据...")
-        all_data = []
-        for yyb_code in yyb_codes:
-            data = get_yyb_lhb_data(yyb_code=yyb_code)
-            if not data.empty:
-                all_data.append(data)
-        if all_data:
-            yz_lhb_data[yz_name] = pd.concat(all_data, ignore_index=True)
-            if '序号' in yz_lhb_data[yz_name].columns:
-                yz_lhb_data[yz_name] = yz_lhb_data[yz_name][yz_lhb_data[yz_name]['序号'] <= 40]
-        else:
-            yz_lhb_data[yz_name] = pd.DataFrame()
-    
-    # 获取财联社新闻数据
-    print("\n正在获取财联社新闻数据...")
-    cls_news = get_cls_news()
-    
-    # 获取同花顺新闻数据
-    print("\n正在获取同花顺新闻数据...")
-    ths_news = get_ths_news()
-    
-    # 获取百度热搜股票数据
-    print("\n正在获取百度热搜股票数据...")
-    hot_search_data = get_hot_search_data()
-    
-    # 获取东方财富热度榜数据
-    print("\n正在获取东方财富热度榜数据...")
-    hot_rank_data = get_hot_rank_em()
+    today_pool = report_data["today_pool"]
+    yesterday_pool = report_data["yesterday_pool"]
     
     # 显示今天涨停股池数据
     if not today_pool.empty:
@@ -2578,16 +3146,25 @@ if __name__ == "__main__":
     print("正在生成HTML报告...")
     print("=" * 60)
  
-    html_content = generate_limit_up_pool_html(today_pool, yesterday_pool, board_info, industry_info, capital_flow_data, industry_flow_data, yz_lhb_data, cls_news, ths_news, hot_search_data, hot_rank_data)
-    
-    # 保存HTML文件
+    # 逐段写入HTML文件
     html_file_path = "limit_up_pool_report.html"
-    with open(html_file_path, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+    with stage("render:write_limit_up_pool_html", "render"):
+        write_limit_up_pool_html(html_file_path, **report_data)
     
     print(f"\nHTML报告已生成: {html_file_path}")
     print("请在浏览器中打开该文件查看涨停股池数据")
     
+    llm_cache = get_llm_reason_cache()
+    if llm_cache is not None:
+        llm_cache.report()
+    akc.report()
+    
+    stage_profiler = profiler.disable()
+    if stage_profiler is not None:
+        stage_profiler.print_table()
+        stage_profiler.dump(args.profile_out)
+    
     print("\n" + "=" * 60)
     print("数据获取完成！")
     print("=" * 60)
+    orchestrator.exit_if_late()
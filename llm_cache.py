@@ -0,0 +1,87 @@
+# LLM涨停原因本地缓存：按 交易日 + 股票代码 + 提示词指纹 存入SQLite，重复运行时不再重复调用LLM
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+LLM_CACHE_PATH = "llm_reason_cache.sqlite3"
+LLM_CACHE_TTL_DAYS = 7  # 超过该天数的记录在打开缓存时清理
+LLM_CACHE_MAX_ROWS = 20000  # 超出后按写入时间淘汰最旧的记录
+
+
+def prompt_fingerprint(*parts):
+    """根据提示词输入计算指纹，输入变化时指纹随之变化"""
+    raw = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()[:32]
+
+
+class LLMReasonCache:
+    """SQLite实现的LLM结果缓存，可在多个线程中共享"""
+
+    def __init__(self, path=LLM_CACHE_PATH, ttl_days=LLM_CACHE_TTL_DAYS, max_rows=LLM_CACHE_MAX_ROWS):
+        self.path = path
+        self.ttl_seconds = ttl_days * 86400
+        self.max_rows = max_rows
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS llm_reason (
+                trade_date TEXT NOT NULL,
+                stock_code TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                reason TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (trade_date, stock_code, fingerprint)
+            )
+        """)
+        self.conn.commit()
+        self.evict()
+
+    def get(self, trade_date, stock_code, fingerprint):
+        """查询缓存，未命中返回None"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT reason, created_at FROM llm_reason WHERE trade_date=? AND stock_code=? AND fingerprint=?",
+                (trade_date, str(stock_code), fingerprint)
+            ).fetchone()
+            if row is not None and time.time() - row[1] <= self.ttl_seconds:
+                self.hits += 1
+                return row[0]
+            self.misses += 1
+            return None
+
+    def set(self, trade_date, stock_code, fingerprint, reason):
+        """写入缓存"""
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO llm_reason VALUES (?, ?, ?, ?, ?)",
+                (trade_date, str(stock_code), fingerprint, reason, time.time())
+            )
+            self.conn.commit()
+            self.writes += 1
+
+    def evict(self):
+        """清理过期记录，并把总行数控制在 max_rows 以内"""
+        with self.lock:
+            expired = self.conn.execute(
+                "DELETE FROM llm_reason WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+            ).rowcount
+            overflow = self.conn.execute(
+                "DELETE FROM llm_reason WHERE rowid IN ("
+                "SELECT rowid FROM llm_reason ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_rows,)
+            ).rowcount
+            self.conn.commit()
+        if expired or overflow:
+            print(f"LLM缓存清理: 过期 {expired} 条，超量 {overflow} 条")
+
+    def report(self):
+        """打印本次运行的命中统计"""
+        total = self.hits + self.misses
+        hit_rate = self.hits / total * 100 if total else 0
+        print(f"LLM缓存统计: 命中 {self.hits} 次，未命中 {self.misses} 次，命中率 {hit_rate:.1f}%，新写入 {self.writes} 条")
@@ -0,0 +1,162 @@
+# 运行指标：计数器、数值和直方图，按 Prometheus 文本格式输出，供 /metrics 接口抓取
+import math
+import threading
+
+METRICS_PREFIX = 'tradingdb_'
+# 上游请求和后台任务耗时较长，请求处理耗时较短，分别使用不同的桶
+FETCH_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+REQUEST_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+JOB_BUCKETS = (0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300, 600)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels) + '}'
+
+
+class _Metric:
+    """一个指标族，按标签值分别保存数值
+
+    collect 为可选的函数，抓取时调用，返回 {标签值元组: 数值}，用于由其他对象的状态计算出的指标。
+    """
+    type = 'untyped'
+
+    def __init__(self, name, documentation, labelnames=(), collect=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.collect = collect
+        self.lock = threading.Lock()
+        self.values = {}
+
+    def _key(self, labels):
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self):
+        """返回 [(名称后缀, 标签列表, 数值)]"""
+        if self.collect is not None:
+            values = self.collect()
+        else:
+            with self.lock:
+                values = dict(self.values)
+        return [('', list(zip(self.labelnames, key)), value) for key, value in sorted(values.items())]
+
+
+class Counter(_Metric):
+    type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    type = 'gauge'
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = value
+
+
+class Histogram(_Metric):
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=FETCH_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self.lock:
+            counts, total = self.values.get(key) or ([0] * len(self.buckets), 0.0)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            self.values[key] = (counts, total + value)
+
+    def samples(self):
+        with self.lock:
+            values = {key: (list(counts), total) for key, (counts, total) in self.values.items()}
+        samples = []
+        for key, (counts, total) in sorted(values.items()):
+            labels = list(zip(self.labelnames, key))
+            for bound, count in zip(self.buckets, counts):
+                samples.append(('_bucket', labels + [('le', _format_value(float(bound)))], count))
+            samples.append(('_sum', labels, total))
+            samples.append(('_count', labels, counts[-1]))
+        return samples
+
+
+class MetricsRegistry:
+    """进程内的指标集合，render 输出 Prometheus 文本格式（没有数据的指标族不输出）"""
+
+    def __init__(self, prefix=METRICS_PREFIX):
+        self.prefix = prefix
+        self.lock = threading.Lock()
+        self.metrics = {}
+
+    def _register(self, metric):
+        metric.name = self.prefix + metric.name
+        with self.lock:
+            if metric.name in self.metrics:
+                raise ValueError(f"指标 {metric.name} 已注册")
+            self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, documentation, labelnames=(), collect=None):
+        return self._register(Counter(name, documentation, labelnames, collect))
+
+    def gauge(self, name, documentation, labelnames=(), collect=None):
+        return self._register(Gauge(name, documentation, labelnames, collect))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=FETCH_BUCKETS):
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self, groups=None):
+        """输出各指标族；groups 为名称（去掉前缀后）的开头列表时只输出这些指标族"""
+        with self.lock:
+            metrics = sorted(self.metrics.values(), key=lambda metric: metric.name)
+        lines = []
+        for metric in metrics:
+            if groups is not None and not metric.name[len(self.prefix):].startswith(tuple(groups)):
+                continue
+            try:
+                samples = metric.samples()
+            except Exception as e:
+                print(f"收集指标 {metric.name} 失败: {e}")
+                continue
+            if not samples:
+                continue
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for suffix, labels, value in samples:
+                lines.append(f"{metric.name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+        return '\n'.join(lines) + '\n' if lines else ''
+
+
+# 全局指标集合，ak_cache / scheduler / lb.py / server.py 共用
+metrics = MetricsRegistry()
+
+AKSHARE_FETCH_SECONDS = metrics.histogram(
+    'akshare_fetch_seconds', 'akshare接口实际请求的耗时（未命中缓存的调用）', ['source', 'outcome'])
+AKSHARE_FETCH_ROWS = metrics.gauge('akshare_fetch_rows', 'akshare接口最近一次成功请求返回的行数', ['source'])
+REFRESH_SECONDS = metrics.histogram('refresh_seconds', '后台刷新任务的耗时', ['job', 'outcome'], JOB_BUCKETS)
+LLM_REQUEST_SECONDS = metrics.histogram('llm_request_seconds', 'LLM调用的耗时', ['model', 'outcome'])
+LLM_TOKENS = metrics.counter('llm_tokens_total', 'LLM调用消耗的token数', ['model', 'kind'])
+HTTP_REQUESTS = metrics.counter('http_requests_total', 'HTTP请求数', ['route', 'method', 'status'])
+HTTP_REQUEST_SECONDS = metrics.histogram('http_request_seconds', 'HTTP请求的处理耗时', ['route'], REQUEST_BUCKETS)
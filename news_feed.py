@@ -0,0 +1,75 @@
+# 增量新闻流：跨刷新去重的有界环形缓冲，客户端凭游标只拉取之后新增的新闻
+import hashlib
+import threading
+from collections import OrderedDict
+
+NEWS_FEED_CAPACITY = 500  # 缓冲区保留的新闻条数，远大于单次刷新两个来源的条数之和
+NEWS_DELTA_LIMIT = 100  # 单次增量最多返回的条数，超过时让客户端重新拉取全量
+
+
+def news_key(item):
+    """新闻条目的内容哈希，同一来源同一时间同一标题视为同一条"""
+    content = f"{item['source']}\x1f{item['time']}\x1f{item['title']}"
+    return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+
+class NewsFeed:
+    """按首次出现顺序保存新闻，每条新闻分配一个递增的序号，游标即最后一条的序号
+
+    已见过的新闻（按内容哈希）再次出现时不重复加入；超过容量时丢弃最早的新闻。
+    """
+
+    def __init__(self, capacity=NEWS_FEED_CAPACITY, delta_limit=NEWS_DELTA_LIMIT):
+        self.capacity = capacity
+        self.delta_limit = delta_limit
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # 内容哈希 -> (序号, 条目)
+        self.cursor = 0
+
+    def add(self, items):
+        """加入一次刷新得到的新闻列表，返回其中新增的条目 [(序号, 条目)]"""
+        added = []
+        with self.lock:
+            for item in items:
+                key = news_key(item)
+                if key in self.entries:
+                    continue
+                self.cursor += 1
+                self.entries[key] = (self.cursor, item)
+                added.append((self.cursor, item))
+            self._trim()
+        return added
+
+    def restore(self, entries):
+        """按原序号加入其他进程产生的条目 [(序号, 条目)]（序号升序），已有的序号跳过"""
+        with self.lock:
+            for seq, item in entries:
+                if seq <= self.cursor:
+                    continue
+                self.entries[news_key(item)] = (seq, item)
+                self.cursor = seq
+            self._trim()
+
+    def _trim(self):
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+    def since(self, cursor):
+        """返回 (游标之后新增的条目（先新后旧）, 当前游标, 是否需要重新拉取全量)
+
+        游标早于缓冲区中最早的新闻、晚于当前游标（服务器已重启）或新增条数超过上限时，
+        不返回条目，客户端应改为拉取全量新闻。
+        """
+        with self.lock:
+            current = self.cursor
+            if cursor == current:
+                return [], current, False
+            oldest = next(iter(self.entries.values()))[0] if self.entries else current + 1
+            if cursor > current or cursor < oldest - 1 or current - cursor > self.delta_limit:
+                return [], current, True
+            items = []
+            for seq, item in reversed(self.entries.values()):
+                if seq <= cursor:
+                    break
+                items.append(item)
+        return items, current, False
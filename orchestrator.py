@@ -0,0 +1,178 @@
+# 数据抓取编排器：把互相独立的数据源声明成依赖图，放到有界线程池里并发执行
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+
+class FetchTask:
+    """单个抓取任务（一个数据源或一个汇总步骤）"""
+
+    def __init__(self, name, func, deps=(), timeout=None, default=None):
+        self.name = name
+        self.func = func
+        self.deps = tuple(deps)
+        self.timeout = timeout
+        self.default = default
+
+
+class FetchOrchestrator:
+    """按依赖关系并发执行抓取任务
+
+    - 没有依赖或依赖已完成的任务立即提交到线程池
+    - 任务函数按 deps 的顺序接收依赖任务的结果作为位置参数
+    - 超时或异常的任务使用 default 作为结果，下游任务照常执行
+    """
+
+    def __init__(self, max_workers=8, default_timeout=60):
+        self.max_workers = max_workers
+        self.default_timeout = default_timeout
+        self.tasks = {}
+        self.results = {}
+        self.timings = {}
+        # 超时后仍在后台运行的任务，调用方可以自行决定是否等待其迟到的结果
+        self.late_futures = {}
+
+    def add(self, name, func, deps=(), timeout=None, default=None):
+        """注册一个任务，返回任务名便于链式声明依赖"""
+        if name in self.tasks:
+            raise ValueError(f"重复的任务名: {name}")
+        self.tasks[name] = FetchTask(name, func, deps, timeout, default)
+        return name
+
+    def _check_graph(self):
+        """检查依赖是否存在且无环"""
+        for task in self.tasks.values():
+            for dep in task.deps:
+                if dep not in self.tasks:
+                    raise ValueError(f"任务 {task.name} 依赖未注册的任务 {dep}")
+        visiting, done = set(), set()
+
+        def visit(name):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"任务依赖存在环: {name}")
+            visiting.add(name)
+            for dep in self.tasks[name].deps:
+                visit(dep)
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self.tasks:
+            visit(name)
+
+    def _run_task(self, task, args):
+        timing = self.timings[task.name]
+        timing['start'] = time.perf_counter()
+        try:
+            return task.func(*args)
+        finally:
+            timing['end'] = time.perf_counter()
+
+    def _deadline(self, task):
+        """任务的截止时间，从真正开始执行时计时，排队时间不算在内"""
+        timeout = task.timeout if task.timeout is not None else self.default_timeout
+        start = self.timings[task.name]['start']
+        if not timeout or start is None:
+            return None
+        return start + timeout
+
+    def _wait_timeout(self, running):
+        now = time.perf_counter()
+        deadlines = [self._deadline(task) for task in running.values()]
+        # 还在排队的任务开始时间未知，定期醒来重新计算截止时间
+        if any(self.timings[task.name]['start'] is None for task in running.values()):
+            deadlines.append(now + 1)
+        deadlines = [d for d in deadlines if d is not None]
+        return max(0, min(deadlines) - now) if deadlines else None
+
+    def run(self):
+        """执行所有任务，返回 {任务名: 结果}"""
+        self._check_graph()
+        run_start = time.perf_counter()
+        self._run_start = run_start
+        remaining = dict(self.tasks)
+        running = {}
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="fetch")
+        try:
+            while remaining or running:
+                # 提交依赖已满足的任务
+                for name in list(remaining):
+                    task = remaining[name]
+                    if all(dep in self.results for dep in task.deps):
+                        args = [self.results[dep] for dep in task.deps]
+                        self.timings[name] = {'submit': time.perf_counter(), 'start': None}
+                        running[executor.submit(self._run_task, task, args)] = task
+                        del remaining[name]
+
+                if not running:
+                    break
+
+                done, _ = wait(list(running), timeout=self._wait_timeout(running), return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    task = running.pop(future)
+                    self._finish(task, future)
+
+                # 处理超时任务：不再等待，直接使用默认值
+                now = time.perf_counter()
+                for future, task in list(running.items()):
+                    deadline = self._deadline(task)
+                    if deadline is not None and now >= deadline and not future.done():
+                        running.pop(future)
+                        self.late_futures[task.name] = future
+                        self._record(task, 'timeout', default=True)
+                        print(f"任务 {task.name} 超时，使用默认值继续")
+        finally:
+            # 超时任务的线程无法强制结束，这里不等待它们
+            executor.shutdown(wait=False, cancel_futures=True)
+        self.total_time = time.perf_counter() - run_start
+        return self.results
+
+    def exit_if_late(self, code=0):
+        """命令行运行结束时调用：仍有超时任务在后台运行时直接结束进程
+
+        超时任务的线程无法强制结束，解释器退出时会等待线程池中的所有线程（包括任务内部自建的线程池），
+        不直接退出的话进程会一直挂起，直到这些任务自己返回。
+        """
+        pending = [name for name, future in self.late_futures.items() if not future.done()]
+        if not pending:
+            return
+        print(f"超时任务仍在后台运行，不再等待: {', '.join(pending)}")
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(code)
+
+    def _finish(self, task, future):
+        try:
+            self.results[task.name] = future.result()
+            self._record(task, 'ok')
+        except Exception as e:
+            print(f"任务 {task.name} 执行失败: {e}")
+            self._record(task, 'error', default=True)
+
+    def _record(self, task, status, default=False):
+        if default:
+            self.results[task.name] = task.default() if callable(task.default) else task.default
+        timing = self.timings[task.name]
+        end = timing.get('end') or time.perf_counter()
+        start = timing['start'] if timing['start'] is not None else timing['submit']
+        timing.update({
+            'status': status,
+            'offset': start - self._run_start,
+            'elapsed': end - start,
+            'queued': start - timing['submit'],
+        })
+
+    def print_summary(self):
+        """按耗时降序打印各阶段耗时"""
+        print("\n" + "=" * 60)
+        print("数据抓取阶段耗时统计:")
+        print("=" * 60)
+        print(f"{'任务':<24}{'状态':<10}{'开始(s)':>10}{'耗时(s)':>10}")
+        rows = sorted(self.timings.items(), key=lambda item: item[1].get('elapsed', 0), reverse=True)
+        for name, timing in rows:
+            print(f"{name:<24}{timing.get('status', '-'):<10}{timing.get('offset', 0):>10.2f}{timing.get('elapsed', 0):>10.2f}")
+        serial_time = sum(timing.get('elapsed', 0) for timing in self.timings.values())
+        print(f"总耗时: {self.total_time:.2f}s，串行累计: {serial_time:.2f}s")
@@ -0,0 +1,180 @@
+# 涨停股池本地存储：按 数据集/日期 分区保存，附带一个记录已保存日期的目录文件
+import json
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+import pandas as pd
+
+POOL_STORE_ROOT = "data"
+MARKET_CLOSE_TIME = "1530"  # 该时间之后获取的当日数据视为最终数据
+
+try:
+    import pyarrow  # noqa: F401  只用于判断是否支持Parquet
+    STORE_FORMAT = "parquet"
+except ImportError:
+    # 未安装pyarrow时退回pickle，读写速度同样在毫秒级
+    STORE_FORMAT = "pickle"
+
+
+def is_final(date, fetched_at=None):
+    """判断某个交易日的数据是否已收盘定型：历史日期，或收盘后才获取的当日数据"""
+    fetched_at = fetched_at or datetime.now()
+    day = fetched_at.strftime('%Y%m%d')
+    return date < day or (date == day and fetched_at.strftime('%H%M') >= MARKET_CLOSE_TIME)
+
+
+class PoolStore:
+    """按日期分区的DataFrame存储
+
+    目录结构: <root>/<dataset>/date=YYYYMMDD/part.parquet，<root>/catalog.json 记录每个分区的行数、
+    格式、获取时间以及是否为收盘后的最终数据。盘中获取的当日数据和空的结果会写入但不视为最终数据，下次仍会重新获取。
+    服务器的刷新进程和手动运行的 lb.py 可能同时写入：更新目录时在文件锁内重新读取并合并，目录文件变化后读取方重新加载。
+    """
+
+    def __init__(self, root=POOL_STORE_ROOT):
+        self.root = root
+        self.catalog_path = os.path.join(root, "catalog.json")
+        self.lock = threading.Lock()
+        self.catalog_mtime = None
+        self.catalog = self._load_catalog()
+
+    def _load_catalog(self):
+        try:
+            self.catalog_mtime = os.stat(self.catalog_path).st_mtime_ns
+            with open(self.catalog_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            print(f"读取股池目录失败，将重新建立: {e}")
+            return {}
+
+    def _reload_if_changed(self):
+        """其他进程更新了目录文件时重新加载"""
+        try:
+            mtime = os.stat(self.catalog_path).st_mtime_ns
+        except FileNotFoundError:
+            return
+        with self.lock:
+            if mtime != self.catalog_mtime:
+                self.catalog = self._load_catalog()
+
+    @contextmanager
+    def _catalog_file_lock(self):
+        """跨进程的目录文件锁"""
+        os.makedirs(self.root, exist_ok=True)
+        with open(f"{self.catalog_path}.lock", 'a+b') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+                else:
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def _save_catalog(self):
+        tmp_path = f"{self.catalog_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.catalog, f, ensure_ascii=False, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.catalog_path)
+        self.catalog_mtime = os.stat(self.catalog_path).st_mtime_ns
+
+    def _partition_file(self, dataset, date, fmt):
+        ext = "parquet" if fmt == "parquet" else "pkl"
+        return os.path.join(self.root, dataset, f"date={date}", f"part.{ext}")
+
+    def entry(self, dataset, date):
+        """返回目录中某个分区的记录，不存在时返回None"""
+        self._reload_if_changed()
+        return self.catalog.get(dataset, {}).get(date)
+
+    def dates(self, dataset):
+        """已保存的日期列表（升序）"""
+        self._reload_if_changed()
+        return sorted(self.catalog.get(dataset, {}))
+
+    def has(self, dataset, date, require_final=True):
+        entry = self.entry(dataset, date)
+        if entry is None or not os.path.exists(os.path.join(self.root, entry['file'])):
+            return False
+        return entry['final'] or not require_final
+
+    def read(self, dataset, date):
+        """读取某个分区，不存在时返回None"""
+        entry = self.entry(dataset, date)
+        if entry is None:
+            return None
+        path = os.path.join(self.root, entry['file'])
+        try:
+            if entry['format'] == "parquet":
+                return pd.read_parquet(path)
+            return pd.read_pickle(path)
+        except Exception as e:
+            print(f"读取本地股池 {dataset}/{date} 失败: {e}")
+            return None
+
+    def write(self, dataset, date, df, fetched_at=None):
+        """写入某个分区并更新目录"""
+        fetched_at = fetched_at or datetime.now()
+        fmt = STORE_FORMAT
+        path = self._partition_file(dataset, date, fmt)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        if fmt == "parquet":
+            df.to_parquet(tmp_path, index=False)
+        else:
+            df.to_pickle(tmp_path)
+        os.replace(tmp_path, path)
+        with self.lock, self._catalog_file_lock():
+            # 在锁内重新读取，保留其他进程写入的分区
+            self.catalog = self._load_catalog()
+            self.catalog.setdefault(dataset, {})[date] = {
+                'file': os.path.relpath(path, self.root),
+                'format': fmt,
+                'rows': len(df),
+                'fetched_at': fetched_at.strftime('%Y-%m-%d %H:%M:%S'),
+                # 空结果可能是上游的临时故障，不当作该日没有涨停的最终数据
+                'final': is_final(date, fetched_at) and not df.empty
+            }
+            self._save_catalog()
+
+    def get_or_fetch(self, dataset, date, fetcher):
+        """优先读取本地最终数据，缺失或非最终时调用 fetcher 获取并保存；fetcher 抛出的异常原样向上抛出"""
+        if self.has(dataset, date):
+            df = self.read(dataset, date)
+            if df is not None:
+                print(f"从本地读取 {dataset}/{date}，共 {len(df)} 条")
+                return df
+        df = fetcher()
+        try:
+            self.write(dataset, date, df)
+        except Exception as e:
+            print(f"保存股池 {dataset}/{date} 失败: {e}")
+        return df
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_pool_store():
+    """获取全局默认的股池存储"""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = PoolStore()
+        return _default_store
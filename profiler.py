@@ -0,0 +1,288 @@
+# 报告流水线的分阶段性能分析：python lb.py --profile 时统计各抓取、处理、渲染阶段的耗时、CPU时间和内存峰值
+import cProfile
+import functools
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+PROFILE_JSON = "lb_profile.json"  # 阶段统计的JSON输出，可用 python profiler.py 旧.json 新.json 对比两次运行
+PROFILE_PSTATS_SUFFIX = ".prof"  # 开启cProfile时合并后的调用统计与JSON同名，可用 snakeviz 等工具查看
+PROFILE_TOP_FUNCTIONS = 25  # 开启cProfile时打印的函数数（按累计时间排序）
+
+_active = None  # 当前运行的 StageProfiler，未开启分析时为 None
+
+
+class _Stage:
+    """同名阶段的累计统计，一个阶段可以多次进入（如每次LLM调用、每段HTML输出）"""
+
+    def __init__(self, name, kind):
+        self.name = name
+        self.kind = kind
+        self.calls = 0
+        self.errors = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.peak_memory = None
+        self.concurrent = False
+        self.running = 0  # 正在进行的次数
+        self.unfinished = 0  # 分析结束时仍未完成的次数（如超时后仍在后台运行的抓取任务）
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'kind': self.kind,
+            'calls': self.calls,
+            'errors': self.errors,
+            'wall': round(self.wall, 6),
+            'cpu': round(self.cpu, 6),
+            'peak_memory': self.peak_memory,
+            'concurrent': self.concurrent,
+            'unfinished': self.unfinished,
+        }
+
+
+class StageProfiler:
+    """记录各阶段的墙钟时间、本线程CPU时间，可选 tracemalloc 内存峰值和 cProfile 调用统计
+
+    阶段在抓取线程池中并发执行，CPU时间按执行阶段的线程统计；内存峰值是阶段执行期间进程的分配峰值
+    减去阶段开始时的已分配量，与其他阶段同时进行（并发或嵌套，concurrent 为 true）时只是上限。
+    嵌套的阶段（如抓取涨停股池中的LLM分析）同时计入内外两层。
+    """
+
+    def __init__(self, memory=False, cprofile=False):
+        self.memory = memory
+        self.cprofile = cprofile
+        self.lock = threading.Lock()
+        self.stages = {}
+        self.active = 0
+        self.profiles = []
+        self.local = threading.local()
+        self.started_at = None
+        self.wall_start = None
+        self.cpu_start = None
+        self.wall = None
+        self.cpu = None
+        self.peak_memory = None
+        self.stopped = False
+
+    def start(self):
+        self.started_at = datetime.now()
+        self.wall_start = time.perf_counter()
+        self.cpu_start = time.process_time()
+        if self.memory:
+            tracemalloc.start()
+
+    def stop(self):
+        """结束分析；之后才结束的阶段不再计入，只在统计中记为未完成"""
+        with self.lock:
+            self.stopped = True
+            for stage in self.stages.values():
+                stage.unfinished = stage.running
+        self.wall = time.perf_counter() - self.wall_start
+        self.cpu = time.process_time() - self.cpu_start
+        if self.memory:
+            self.peak_memory = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    def _begin(self, stage):
+        with self.lock:
+            stage.running += 1
+            if self.memory and self.active == 0:
+                tracemalloc.reset_peak()
+            self.active += 1
+            concurrent = self.active > 1
+        memory_start = tracemalloc.get_traced_memory()[0] if self.memory else None
+        profile = None
+        # 同一线程中已有外层阶段在分析时不再嵌套开启（会替换掉外层的分析器）
+        if self.cprofile and not getattr(self.local, 'profiling', False):
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+                self.local.profiling = True
+            except ValueError:
+                profile = None  # Python 3.12+ 同时只能有一个分析器，其他线程中的阶段不做调用统计
+        return concurrent, memory_start, profile, time.perf_counter(), time.thread_time()
+
+    def _end(self, stage, state, error=False):
+        concurrent, memory_start, profile, wall_start, cpu_start = state
+        wall = time.perf_counter() - wall_start
+        cpu = time.thread_time() - cpu_start
+        if profile is not None:
+            profile.disable()
+            self.local.profiling = False
+        with self.lock:
+            stage.running -= 1
+            if self.stopped:
+                return
+            peak = tracemalloc.get_traced_memory()[1] - memory_start if self.memory else None
+            concurrent = concurrent or self.active > 1
+            self.active -= 1
+            stage.calls += 1
+            stage.errors += int(error)
+            stage.wall += wall
+            stage.cpu += cpu
+            stage.concurrent = stage.concurrent or concurrent
+            if peak is not None:
+                stage.peak_memory = max(stage.peak_memory or 0, peak)
+            if profile is not None:
+                self.profiles.append(profile)
+
+    def _stage(self, name, kind):
+        with self.lock:
+            stage = self.stages.get(name)
+            if stage is None:
+                stage = self.stages[name] = _Stage(name, kind)
+            return stage
+
+    @contextmanager
+    def stage(self, name, kind):
+        stage = self._stage(name, kind)
+        state = self._begin(stage)
+        try:
+            yield
+        except BaseException:
+            self._end(stage, state, error=True)
+            raise
+        self._end(stage, state)
+
+    def iter(self, name, iterable, kind):
+        """逐段生成时只统计生成每一段的时间，不包含调用方写出的时间"""
+        stage = self._stage(name, kind)
+        iterator = iter(iterable)
+        while True:
+            state = self._begin(stage)
+            try:
+                chunk = next(iterator)
+            except StopIteration:
+                self._end(stage, state)
+                return
+            except BaseException:
+                self._end(stage, state, error=True)
+                raise
+            self._end(stage, state)
+            yield chunk
+
+    def to_dict(self):
+        with self.lock:
+            stages = sorted(self.stages.values(), key=lambda stage: stage.wall, reverse=True)
+            return {
+                'started_at': self.started_at.isoformat(timespec='seconds') if self.started_at else None,
+                'argv': sys.argv,
+                'memory': self.memory,
+                'cprofile': self.cprofile,
+                'wall': round(self.wall, 6) if self.wall is not None else None,
+                'cpu': round(self.cpu, 6) if self.cpu is not None else None,
+                'peak_memory': self.peak_memory,
+                'stages': [stage.to_dict() for stage in stages],
+            }
+
+    def print_table(self):
+        """按墙钟时间从长到短打印各阶段"""
+        profile = self.to_dict()
+        print("\n" + "=" * 60)
+        print(f"分阶段耗时（总耗时 {profile['wall']:.2f}s，进程CPU {profile['cpu']:.2f}s）:")
+        print("=" * 60)
+        print(f"{'阶段':<40} {'类型':<10} {'次数':>6} {'耗时(s)':>10} {'CPU(s)':>10} {'内存峰值':>10}")
+        for stage in profile['stages']:
+            memory = format_bytes(stage['peak_memory']) if stage['peak_memory'] is not None else '-'
+            flags = ' *' if stage['concurrent'] else ''
+            flags += f" 失败{stage['errors']}次" if stage['errors'] else ''
+            flags += f" 未完成{stage['unfinished']}次" if stage['unfinished'] else ''
+            print(f"{stage['name']:<40} {stage['kind']:<10} {stage['calls']:>6} {stage['wall']:>10.3f} "
+                  f"{stage['cpu']:>10.3f} {memory:>10}{flags}")
+        print("* 与其他阶段同时进行（并发或嵌套），内存峰值为上限；嵌套阶段的时间同时计入外层阶段")
+        if profile['peak_memory'] is not None:
+            print(f"整个运行的内存分配峰值: {format_bytes(profile['peak_memory'])}")
+
+    def dump(self, path=PROFILE_JSON):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+        print(f"分阶段统计已写入: {path}")
+        if self.profiles:
+            stats = pstats.Stats(self.profiles[0])
+            for profile in self.profiles[1:]:
+                stats.add(profile)
+            pstats_path = os.path.splitext(path)[0] + PROFILE_PSTATS_SUFFIX
+            stats.dump_stats(pstats_path)
+            print(f"cProfile调用统计已写入: {pstats_path}，累计耗时最多的函数:")
+            stats.sort_stats('cumulative').print_stats(PROFILE_TOP_FUNCTIONS)
+
+
+def format_bytes(size):
+    for unit in ('B', 'KB', 'MB'):
+        if abs(size) < 1024:
+            return f"{size:.0f}{unit}"
+        size /= 1024
+    return f"{size:.1f}GB"
+
+
+def enable(memory=False, cprofile=False):
+    """开始分阶段分析，返回 StageProfiler"""
+    global _active
+    _active = StageProfiler(memory=memory, cprofile=cprofile)
+    _active.start()
+    return _active
+
+
+def disable():
+    """结束分析，返回 StageProfiler（未开启时返回 None）"""
+    global _active
+    profiler, _active = _active, None
+    if profiler is not None:
+        profiler.stop()
+    return profiler
+
+
+def stage(name, kind='stage'):
+    """阶段计时的上下文管理器，未开启分析时不做任何事"""
+    return _active.stage(name, kind) if _active is not None else nullcontext()
+
+
+def profile_iter(name, iterable, kind='render'):
+    """统计逐段生成的内容，未开启分析时原样返回"""
+    return _active.iter(name, iterable, kind) if _active is not None else iterable
+
+
+def staged(kind, name=None):
+    """把函数的每次调用作为一个阶段统计的装饰器"""
+    def decorator(func):
+        stage_name = name or f"{kind}:{func.__name__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(stage_name, kind):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def compare(old_path, new_path):
+    """对比两次运行的JSON统计，按耗时变化从大到小打印"""
+    with open(old_path, encoding='utf-8') as f:
+        old = json.load(f)
+    with open(new_path, encoding='utf-8') as f:
+        new = json.load(f)
+    old_stages = {stage['name']: stage for stage in old['stages']}
+    new_stages = {stage['name']: stage for stage in new['stages']}
+    rows = []
+    for name in old_stages.keys() | new_stages.keys():
+        before = old_stages.get(name, {}).get('wall', 0)
+        after = new_stages.get(name, {}).get('wall', 0)
+        rows.append((after - before, name, before, after))
+    print(f"总耗时: {old['wall']:.3f}s -> {new['wall']:.3f}s")
+    print(f"{'阶段':<40} {'旧(s)':>10} {'新(s)':>10} {'变化(s)':>10}")
+    for delta, name, before, after in sorted(rows, key=lambda row: abs(row[0]), reverse=True):
+        print(f"{name:<40} {before:>10.3f} {after:>10.3f} {delta:>+10.3f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("用法: python profiler.py 旧的lb_profile.json 新的lb_profile.json")
+        sys.exit(1)
+    compare(sys.argv[1], sys.argv[2])
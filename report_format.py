@@ -0,0 +1,106 @@
+# 报告表格的按列格式化：一次性算出整列的显示文本，渲染时只需按行拼接，不再逐行 iterrows
+import string
+
+import numpy as np
+import pandas as pd
+
+_formatter = string.Formatter()
+
+
+def _as_text(series):
+    """逐元素 str()，空值同样转为 'nan'（pandas 3 的 astype(str) 会保留空值）"""
+    values = pd.Series(series).to_numpy(dtype=object).astype(str).astype(object)
+    return pd.Series(values, index=pd.Series(series).index)
+
+
+def column_or(df, name, default):
+    """取出某一列，缺失时返回同长度的默认值列（对应逐行写法中的 row.get(name, default)）"""
+    if name in df.columns:
+        return df[name]
+    return pd.Series([default] * len(df), index=df.index, dtype=object)
+
+
+def fmt_num(series, digits=2, scale=1):
+    """数值列格式化为固定小数位，等价于逐个 f"{x / scale:.2f}" """
+    values = series.to_numpy()
+    if scale != 1:
+        values = values / scale
+    return np.char.mod(f'%.{digits}f', values.astype(float)).astype(object)
+
+
+def fmt_int(series):
+    """数值列取整后转文本，等价于逐个 int(x)"""
+    return series.to_numpy().astype(np.int64).astype(str).astype(object)
+
+
+def fmt_str(series):
+    """任意列转文本，等价于逐个 f"{x}" """
+    return _as_text(series).to_numpy(dtype=object)
+
+
+def fmt_thousands(series):
+    """千分位格式，等价于逐个 f"{x:,}" """
+    return series.map('{:,}'.format).to_numpy(dtype=object)
+
+
+def fmt_hhmm(series):
+    """HHMMSS 格式的时间转为 HH:MM，空值输出空字符串"""
+    text = _as_text(series)
+    missing = series.isna().to_numpy() | (text == '').to_numpy()
+    hhmm = text.str[:2] + ':' + text.str[2:4]
+    result = np.where(text.str.len().to_numpy() >= 4, hhmm.to_numpy(dtype=object), text.to_numpy(dtype=object))
+    return np.where(missing, '', result).astype(object)
+
+
+def sign_class(values):
+    """正数为 positive，其余为 negative（与表格中涨红跌绿的样式类一致）"""
+    return np.where(np.asarray(values, dtype=float) > 0, 'positive', 'negative').astype(object)
+
+
+def stock_urls(codes):
+    """按股票代码批量生成东方财富行情页URL，空代码返回 #"""
+    codes = pd.Series(codes)
+    text = _as_text(codes).where(codes.notna(), '')
+    prefix = np.select(
+        [text.str.startswith('6'), text.str.startswith('0') | text.str.startswith('3')],
+        ['sh', 'sz'],
+        default=''
+    )
+    urls = "https://quote.eastmoney.com/" + pd.Series(prefix, index=text.index) + text + ".html"
+    return np.where(text == '', '#', urls.to_numpy(dtype=object)).astype(object)
+
+
+def parse_percent(series):
+    """把 "3.21%" 这类文本或数值统一解析为浮点数，空值记为0"""
+    text = series.astype(str).str.replace('%', '', regex=False).str.replace('+', '', regex=False)
+    values = pd.to_numeric(text, errors='coerce')
+    values[series.isna()] = 0
+    return values.to_numpy(dtype=float)
+
+
+def split_name_code(series):
+    """拆分 "名称(代码)" 格式的文本，返回 (名称数组, 代码数组)；不含括号时名称为原文、代码为空"""
+    text = series.fillna('').astype(str)
+    has_code = (text.str.contains('(', regex=False) & text.str.contains(')', regex=False)).to_numpy()
+    parts = text.str.split('(')
+    names = np.where(has_code, parts.str[0].str.strip().to_numpy(dtype=object), text.to_numpy(dtype=object))
+    codes = np.where(has_code, parts.str[1].str.split(')').str[0].str.strip().to_numpy(dtype=object), '')
+    return names.astype(object), codes.astype(object)
+
+
+def render_rows(template, columns):
+    """用预先算好的各列文本填充行模板并拼接成一段HTML
+
+    template 为 str.format 风格的模板（只使用 {字段名}），columns 为 {字段名: 长度相同的文本数组}。
+    """
+    lengths = {len(values) for values in columns.values()}
+    if len(lengths) > 1:
+        raise ValueError(f"各列长度不一致: {lengths}")
+    count = lengths.pop() if lengths else 0
+    rows = np.full(count, '', dtype=object)
+    for literal, field, _, _ in _formatter.parse(template):
+        if literal:
+            rows = rows + literal
+        if field is not None:
+            rows = rows + np.asarray(columns[field], dtype=object)
+    return ''.join(rows)
@@ -0,0 +1,223 @@
+# 按交易时段调度的数据刷新器：盘中刷新得更勤，收盘后放慢，非交易日不刷新；各数据源错开执行
+import heapq
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, time as dtime, timedelta
+
+import pandas as pd
+
+from ak_cache import akc
+from metrics import REFRESH_SECONDS
+
+SESSION_START = dtime(9, 15)  # 集合竞价开始
+SESSION_END = dtime(15, 0)
+AFTER_CLOSE_END = dtime(20, 0)  # 收盘后继续低频刷新到该时间，之后到下一个交易日开盘前不刷新
+RETRY_DELAY = 60  # 刷新失败后隔多久重试（秒）
+CALENDAR_LOOKAHEAD_DAYS = 30  # 寻找下一个交易日时最多向后看的天数
+SCHEDULER_MAX_WORKERS = 4  # 同时执行的刷新任务数，耗时长的任务（如生成报告）不会耽误其他数据源
+
+
+class TradingCalendar:
+    """交易日历，来自新浪历史交易日；获取失败时按工作日判断（不考虑节假日）
+
+    日历每天最多重新加载一次，加载失败的那天不再重复请求。
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.trade_dates = None
+        self.last_date = None
+        self.loaded_on = None
+
+    def _load(self, today):
+        try:
+            calendar = akc.tool_trade_date_hist_sina()
+            self.trade_dates = frozenset(pd.to_datetime(calendar['trade_date']).dt.date)
+            self.last_date = max(self.trade_dates)
+        except Exception as e:
+            print(f"获取交易日历失败，按工作日判断: {e}")
+            self.trade_dates = None
+        self.loaded_on = today
+
+    def is_trading_day(self, day):
+        with self.lock:
+            today = datetime.now().date()
+            if self.loaded_on != today:
+                self._load(today)
+            trade_dates, last_date = self.trade_dates, self.last_date
+        # 日历只覆盖到当年年底，超出范围的日期同样按工作日判断
+        if trade_dates is None or day > last_date:
+            return day.weekday() < 5
+        return day in trade_dates
+
+
+class Schedule:
+    """一个数据源的刷新计划
+
+    - session_interval: 交易日 09:15–15:00 的刷新间隔（秒）
+    - after_close_interval: 交易日收盘后到 AFTER_CLOSE_END 的刷新间隔（秒）
+    - jitter: 每次执行时间随机推迟 0~jitter 秒，避免多个数据源同一时刻请求
+    """
+
+    def __init__(self, name, func, session_interval, after_close_interval, jitter=30):
+        self.name = name
+        self.func = func
+        self.session_interval = session_interval
+        self.after_close_interval = after_close_interval
+        self.jitter = jitter
+        self.next_run = None
+        self.last_run = None
+        self.last_error = None
+        self.runs = 0
+        self.failures = 0
+        self.running = False
+
+
+class RefreshScheduler:
+    """由一个后台线程按各数据源的计划派发刷新任务，任务在小线程池中执行
+
+    没有到期任务时线程一直睡到最近的下一次执行时间，不做轮询。
+    同一数据源上一次执行结束后才安排下一次，不会重叠执行。
+    """
+
+    def __init__(self, calendar=None, now=datetime.now, max_workers=SCHEDULER_MAX_WORKERS):
+        self.calendar = calendar or TradingCalendar()
+        self.now = now
+        self.schedules = {}
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.queue = []  # (下一次执行时间, 名称) 小顶堆
+        self.pending = []  # 尚未计算第一次执行时间的数据源，由调度线程计算（可能需要请求交易日历）
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='refresh')
+        self.listeners = []
+
+    def subscribe(self, listener):
+        """注册回调 listener(scheduler)，每次任务执行结束并安排好下一次后调用"""
+        self.listeners.append(listener)
+
+    def add(self, name, func, session_interval, after_close_interval, jitter=30, first_run=None):
+        """注册一个数据源
+
+        第一次执行时间默认按当前时刻计算（启动时已刷新过一次），first_run 可指定第一次执行的时间。
+        默认的第一次执行时间在调度线程中计算，add 不会因为获取交易日历而阻塞。
+        """
+        if name in self.schedules:
+            raise ValueError(f"重复的数据源: {name}")
+        schedule = Schedule(name, func, session_interval, after_close_interval, jitter)
+        self.schedules[name] = schedule
+        if first_run is not None:
+            self._push(schedule, first_run)
+        else:
+            with self.lock:
+                self.pending.append(schedule)
+            self.wakeup.set()
+        return schedule
+
+    def next_run_time(self, schedule, now):
+        """计算 now 之后的下一次执行时间（含随机抖动）"""
+        day = now.date()
+        for _ in range(CALENDAR_LOOKAHEAD_DAYS):
+            if self.calendar.is_trading_day(day):
+                session_start = datetime.combine(day, SESSION_START)
+                if now < session_start:
+                    return self._jittered(schedule, session_start)
+                if now < datetime.combine(day, SESSION_END):
+                    return self._jittered(schedule, now + timedelta(seconds=schedule.session_interval))
+                candidate = now + timedelta(seconds=schedule.after_close_interval)
+                if candidate <= datetime.combine(day, AFTER_CLOSE_END):
+                    return self._jittered(schedule, candidate)
+            day += timedelta(days=1)
+            now = datetime.combine(day, dtime.min)
+        raise RuntimeError(f"{CALENDAR_LOOKAHEAD_DAYS}天内没有交易日，无法安排 {schedule.name}")
+
+    @staticmethod
+    def _jittered(schedule, when):
+        return when + timedelta(seconds=random.uniform(0, schedule.jitter))
+
+    def _push(self, schedule, when):
+        with self.lock:
+            schedule.next_run = when
+            heapq.heappush(self.queue, (when, schedule.name))
+        self.wakeup.set()
+
+    def status(self):
+        """各数据源的下一次执行时间和运行情况，供调试查看"""
+        with self.lock:
+            return [{
+                'name': s.name,
+                'next_run': s.next_run.isoformat(timespec='seconds') if s.next_run else None,
+                'last_run': s.last_run.isoformat(timespec='seconds') if s.last_run else None,
+                'session_interval': s.session_interval,
+                'after_close_interval': s.after_close_interval,
+                'running': s.running,
+                'runs': s.runs,
+                'failures': s.failures,
+                'last_error': s.last_error,
+            } for s in sorted(self.schedules.values(), key=lambda s: s.next_run or datetime.max)]
+
+    def _next_run_or_retry(self, schedule, now):
+        """下一次执行时间；无法计算（如日历异常导致找不到交易日）时 RETRY_DELAY 后再试，任务不会就此停止"""
+        try:
+            return self.next_run_time(schedule, now)
+        except Exception as e:
+            print(f"计算 {schedule.name} 的下一次执行时间失败，{RETRY_DELAY}秒后重试: {e}")
+            return self._jittered(schedule, now + timedelta(seconds=RETRY_DELAY))
+
+    def _run(self, schedule):
+        started = self.now()
+        timer = time.monotonic()
+        schedule.running = True
+        failed = False
+        try:
+            schedule.func()
+            REFRESH_SECONDS.observe(time.monotonic() - timer, job=schedule.name, outcome='ok')
+            schedule.last_error = None
+        except Exception as e:
+            REFRESH_SECONDS.observe(time.monotonic() - timer, job=schedule.name, outcome='error')
+            print(f"后台更新 {schedule.name} 失败: {e}")
+            schedule.failures += 1
+            schedule.last_error = str(e)
+            failed = True
+        now = self.now()
+        next_run = self._next_run_or_retry(schedule, now)
+        # 失败后提前重试，但不把刷新延续到当天的刷新时段之外
+        if failed and next_run.date() == now.date():
+            next_run = min(next_run, self._jittered(schedule, now + timedelta(seconds=RETRY_DELAY)))
+        schedule.last_run = started
+        schedule.runs += 1
+        schedule.running = False
+        self._push(schedule, next_run)
+        print(f"{schedule.name} 下一次刷新时间: {next_run:%Y-%m-%d %H:%M:%S}")
+        for listener in self.listeners:
+            try:
+                listener(self)
+            except Exception as e:
+                print(f"调度回调失败: {e}")
+
+    def run_forever(self):
+        """调度循环，在后台线程中调用"""
+        while True:
+            self.wakeup.clear()
+            with self.lock:
+                pending, self.pending = self.pending, []
+            for schedule in pending:
+                self._push(schedule, self._next_run_or_retry(schedule, self.now()))
+            with self.lock:
+                when, name = self.queue[0] if self.queue else (None, None)
+            if when is None:
+                self.wakeup.wait()
+                continue
+            delay = (when - self.now()).total_seconds()
+            if delay > 0:
+                self.wakeup.wait(delay)
+                continue
+            with self.lock:
+                heapq.heappop(self.queue)
+            self.executor.submit(self._run, self.schedules[name])
+
+    def start(self):
+        thread = threading.Thread(target=self.run_forever, name='refresh-scheduler', daemon=True)
+        thread.start()
+        return thread
@@ -1,230 +1,524 @@
-from flask import Flask, jsonify, send_from_directory
+from flask import Flask, Response, abort, g, request
 import pandas as pd
-import akshare as ak
-from datetime import datetime
+import json
+import os
+import sqlite3
+import sys
 import threading
 import time
+from datetime import datetime
+# 数据源抓取函数与 lb.py 共用，akshare调用经过 ak_cache 的记忆化层
+from lb import (get_cls_news, get_ths_news, get_hot_search_baidu, get_hot_rank_em, get_capital_flow_data,
+                get_industry_flow_data, get_fund_flow_rankings, fund_flow_rankings_to_records,
+                fetch_report_data, generate_limit_up_pool_html, render_report_pages, REPORT_PAGES, DEFAULT_REPORT_PAGE)
+from ak_cache import akc
+from report_format import column_or, split_name_code
+from compression import PrecompressedFile, negotiate
+from snapshots import SnapshotStore
+from scheduler import RefreshScheduler
+from orchestrator import FetchOrchestrator
+from events import EventBroker, format_event
+from news_feed import NewsFeed
+from shared_store import SharedStore, SHARED_STORE_PATH
+from metrics import metrics, HTTP_REQUESTS, HTTP_REQUEST_SECONDS
 
 app = Flask(__name__)
 
-# 全局变量缓存新闻数据
-news_cache = {
-    'cls_news': None,
-    'ths_news': None,
-    'last_update': None
-}
+# 各数据源的最新快照：news / hot_rank / fund_flow
+# 后台线程每次刷新都构建新的不可变快照并整体替换，请求线程读取时不加锁
+snapshots = SnapshotStore()
+
+# 报告页面：服务器定时在后台重新生成并在内存中发布；手动运行 lb.py 重新生成的文件也会被发现并重新压缩
+REPORT_FILE = 'limit_up_pool_report.html'
+report_file = PrecompressedFile(REPORT_FILE)
+# 首页外壳：只内嵌默认页面，其余标签页发布为 page:<页面id> 快照，首次打开时通过 /api/page/<页面id> 获取
+REPORT_SHELL_FILE = 'limit_up_pool_shell.html'
+report_shell_file = PrecompressedFile(REPORT_SHELL_FILE)
+LAZY_REPORT_PAGES = tuple(page_id for page_id in REPORT_PAGES if page_id != DEFAULT_REPORT_PAGE)
+REPORT_WATCH_INTERVAL = 30  # 检查报告文件是否被外部重新生成的间隔（秒），只读文件状态
+
+# 多进程部署：一个刷新进程（python server.py --refresher）把快照写入共享存储，
+# 多个请求进程（WSGI服务器导入本模块，且设置了该环境变量）只从共享存储读取，不访问akshare
+SHARED_STORE_ENV = 'TRADINGDB_SHARED_STORE'
+SHARED_POLL_INTERVAL = 1  # 请求进程检查共享存储新版本的间隔（秒）
+READER_MODE = bool(os.environ.get(SHARED_STORE_ENV)) and __name__ != '__main__'
+shared_store = None
+
+# 跨刷新去重的新闻流，/api/news?since=<cursor> 只返回游标之后新增的新闻
+news_feed = NewsFeed()
 
-# 全局变量缓存市场热点数据
-hot_rank_cache = {
-    'hot_search_data': None,
-    'hot_rank_data': None,
-    'last_update': None
+# 推送给页面的事件：snapshot（某个数据源发布了新版本）/ report（报告文件已重新生成）
+events = EventBroker()
+
+# 刷新间隔（秒）：(盘中, 收盘后)，非交易日不刷新
+NEWS_REFRESH_INTERVALS = (120, 900)  # 新闻盘中2分钟，收盘后15分钟
+HOT_RANK_REFRESH_INTERVALS = (300, 1800)  # 市场热点盘中5分钟，收盘后30分钟
+FUND_FLOW_REFRESH_INTERVALS = (600, 1800)  # 资金流排行盘中10分钟，收盘后30分钟
+REPORT_REFRESH_INTERVALS = (900, 3600)  # 报告盘中15分钟，收盘后1小时重新生成
+REFRESH_JITTER = 30  # 每次刷新随机推迟0~30秒，错开各数据源
+
+# 单次刷新内各数据源并发抓取，超过截止时间（秒）的数据源沿用上一次快照中的数据
+REFRESH_MAX_WORKERS = 3
+REFRESH_DEFAULT_TIMEOUT = 20
+REFRESH_TIMEOUTS = {
+    'hot_rank_data': 30,
 }
 
-# 缓存时间（秒）
-NEWS_CACHE_DURATION = 300  # 新闻5分钟
-HOT_RANK_CACHE_DURATION = 600  # 市场热点10分钟
+NEWS_ICONS = ['📰', '📊', '💹', '📈', '💼', '🏢', '💡', '⚡', '🔔', '📢']
+API_TOP_N = 20  # 热点接口返回的条数
 
-def get_cls_news():
-    """获取财联社电报数据"""
-    try:
-        df = ak.stock_info_global_cls(symbol="全部")
-        print(f"成功获取财联社电报数据，共 {len(df)} 条")
-        return df
-    except Exception as e:
-        print(f"获取财联社电报失败: {e}")
-        return pd.DataFrame()
-
-def get_ths_news():
-    """获取同花顺财经直播数据"""
-    try:
-        df = ak.stock_info_global_ths()
-        print(f"成功获取同花顺财经直播数据，共 {len(df)} 条")
-        return df
-    except Exception as e:
-        print(f"获取同花顺财经直播失败: {e}")
-        return pd.DataFrame()
-
-def get_hot_search_data():
-    """获取百度热搜股票数据"""
-    try:
-        today_str = datetime.now().strftime('%Y%m%d')
-        print(f"尝试获取百度热搜股票数据，日期: {today_str}")
-        
-        try:
-            hot_today_df = ak.stock_hot_search_baidu(symbol="A股", date=today_str, time="今日")
-            print(f"成功获取百度热搜股票数据（今日），共 {len(hot_today_df)} 条记录")
-        except Exception as e:
-            print(f"获取今日热搜数据失败: {e}")
-            hot_today_df = pd.DataFrame()
-        
-        try:
-            hot_hour_df = ak.stock_hot_search_baidu(symbol="A股", date=today_str, time="1小时")
-            print(f"成功获取百度热搜股票数据（1小时），共 {len(hot_hour_df)} 条记录")
-        except Exception as e:
-            print(f"获取1小时热搜数据失败: {e}")
-            hot_hour_df = pd.DataFrame()
-        
-        return {"今日": hot_today_df, "1小时": hot_hour_df}
-    except Exception as e:
-        print(f"获取百度热搜股票数据失败: {e}")
-        return {"今日": pd.DataFrame(), "1小时": pd.DataFrame()}
-
-def get_hot_rank_em():
-    """获取东方财富热度榜数据"""
-    try:
-        hot_rank_df = ak.stock_hot_rank_em()
-        print(f"成功获取东方财富热度榜数据，共 {len(hot_rank_df)} 条记录")
-        return hot_rank_df
-    except Exception as e:
-        print(f"获取东方财富热度榜数据失败: {e}")
-        return pd.DataFrame()
+def news_items(news_df, source, start_idx=0):
+    """新闻DataFrame转为接口中的条目列表"""
+    if news_df is None or news_df.empty:
+        return []
+    titles = column_or(news_df, '标题', '').map(str).tolist()
+    times = column_or(news_df, '发布时间', '').map(str).tolist()
+    icons = [NEWS_ICONS[(start_idx + idx) % len(NEWS_ICONS)] for idx in news_df.index]
+    return [{'icon': icon, 'source': source, 'time': time_str, 'title': title}
+            for icon, time_str, title in zip(icons, times, titles)]
+
+def hot_search_items(hot_search_data):
+    """百度热搜（今日）转为接口中的条目列表"""
+    if not hot_search_data or hot_search_data.get('今日') is None or hot_search_data['今日'].empty:
+        return []
+    df = hot_search_data['今日'].head(API_TOP_N)
+    names, codes = split_name_code(column_or(df, '名称/代码', ''))
+    heat = column_or(df, '综合热度', 0)
+    heat = heat.map(str).where(heat.notna(), '0').tolist()
+    return [{'rank': int(idx) + 1, 'code': code, 'name': name, 'change': change, 'heat': hot}
+            for idx, code, name, change, hot in zip(df.index, codes, names, column_or(df, '涨跌幅', '0%').tolist(), heat)]
+
+def hot_rank_items(hot_rank_data):
+    """东方财富热度榜转为接口中的条目列表"""
+    if hot_rank_data is None or hot_rank_data.empty:
+        return []
+    df = hot_rank_data.head(API_TOP_N)
+    ranks = df['当前排名'] if '当前排名' in df.columns else df.index.to_series() + 1
+
+    def numbers(name):
+        return pd.to_numeric(column_or(df, name, None), errors='coerce').fillna(0).astype(float).tolist()
+
+    return [{'rank': int(rank), 'code': code, 'name': name, 'price': price, 'change': change, 'volume': volume}
+            for rank, code, name, price, change, volume in zip(
+                ranks.tolist(), column_or(df, '代码', '').map(str).tolist(), column_or(df, '股票名称', '').map(str).tolist(),
+                numbers('最新价'), numbers('涨跌幅'), numbers('成交量'))]
+
+def payload_response(payload, mimetype='application/json'):
+    """返回预先序列化的响应
+
+    按 Accept-Encoding 选择已压缩好的版本；客户端带 If-None-Match / If-Modified-Since 且内容未变时返回304。
+    """
+    encoding = negotiate(request.accept_encodings, payload.variants)
+    response = Response(payload.variants[encoding], mimetype=mimetype)
+    response.vary.add('Accept-Encoding')
+    if encoding == 'identity':
+        response.set_etag(payload.etag)
+    else:
+        # 不同编码的字节不同，使用不同的ETag
+        response.headers['Content-Encoding'] = encoding
+        response.set_etag(f"{payload.etag}-{encoding}")
+    response.last_modified = payload.last_modified
+    response.cache_control.no_cache = True  # 浏览器每次都带上ETag重新验证
+    return response.make_conditional(request)
+
+# 快照的发布串行化：定时刷新与超时数据源的迟到结果可能同时发布同一个快照
+publish_lock = threading.Lock()
+
+def has_data(value):
+    """抓取结果是否包含数据：None、空表以及只含空表的字典视为没有数据"""
+    if value is None:
+        return False
+    if isinstance(value, dict):
+        return any(has_data(item) for item in value.values())
+    return not getattr(value, 'empty', False)
+
+def refresh_slots(name, fetchers, publish):
+    """并发抓取快照 name 的各个数据槽，再交给 publish 构建并发布快照
+
+    fetchers 为 {槽位名: 抓取函数}。每个数据源有自己的截止时间，超时或失败的槽位沿用上一次快照的数据，
+    不拖慢其他数据源；超时的数据源稍后返回时，只替换它自己的槽位并重新发布。
+    当前快照是启动时载入的旧数据时没有原始数据可以沿用，只有所有槽位都取到数据才发布，
+    否则继续提供载入的旧数据（部分数据源的结果会覆盖掉其他数据源仍然可用的旧数据）。
+    """
+    previous = snapshots.get(name).data
+    orch = FetchOrchestrator(max_workers=REFRESH_MAX_WORKERS, default_timeout=REFRESH_DEFAULT_TIMEOUT)
+    for slot, func in fetchers.items():
+        orch.add(slot, func, timeout=REFRESH_TIMEOUTS.get(slot), default=lambda slot=slot: previous.get(slot))
+    data = orch.run()
+    if snapshots.get(name).stale:
+        missing = [slot for slot, value in data.items() if not has_data(value)]
+        if missing:
+            raise RuntimeError(f"{name} 的 {', '.join(missing)} 没有获取到数据，继续使用启动时载入的数据")
+    with publish_lock:
+        publish(data)
+    for slot, future in orch.late_futures.items():
+        future.add_done_callback(lambda future, slot=slot: publish_late_slot(name, slot, data[slot], future, publish))
+
+def publish_late_slot(name, slot, stale, future, publish):
+    """超时数据源的结果迟到后，替换快照中仍是旧数据的槽位并重新发布"""
+    if future.cancelled() or future.exception() is not None:
+        return
+    with publish_lock:
+        data = dict(snapshots.get(name).data)
+        if data.get(slot) is not stale:  # 之后的刷新已经更新了该槽位
+            return
+        print(f"{slot} 超时后返回，单独更新该数据")
+        data[slot] = future.result()
+        publish(data)
+
+def publish_news(data):
+    cls_items = news_items(data['cls_news'], '财联社')
+    ths_items = news_items(data['ths_news'], '同花顺', start_idx=len(cls_items))
+    items = cls_items + ths_items
+    added = news_feed.add(items)
+    if shared_store is not None:
+        shared_store.write_news(added)  # 先写新闻流，请求进程收到新快照时增量接口已能返回新增条目
+    snapshot = snapshots.publish('news', data, {'news': items, 'cursor': news_feed.cursor})
+    if added:
+        print(f"新增新闻 {len(added)} 条，游标: {news_feed.cursor}")
+    print(f"新闻缓存更新完成，版本: {snapshot.version}，内容更新时间: {snapshot.updated_at}")
 
 def update_news_cache():
     """更新新闻缓存"""
     print("开始更新新闻缓存...")
-    news_cache['cls_news'] = get_cls_news()
-    news_cache['ths_news'] = get_ths_news()
-    news_cache['last_update'] = datetime.now()
-    print(f"新闻缓存更新完成，时间: {news_cache['last_update']}")
+    refresh_slots('news', {'cls_news': get_cls_news, 'ths_news': get_ths_news}, publish_news)
+
+def publish_hot_rank(data):
+    hot_search_data = {'今日': data['hot_search_今日'], '1小时': data['hot_search_1小时']}
+    snapshot = snapshots.publish('hot_rank', data, {
+        'hot_search': hot_search_items(hot_search_data),
+        'hot_rank': hot_rank_items(data['hot_rank_data'])
+    })
+    publish_pages(render_report_pages(['hot-rank'], {
+        'hot_search_data': {key: df for key, df in hot_search_data.items() if df is not None},
+        'hot_rank_data': data['hot_rank_data']
+    }))
+    print(f"市场热点缓存更新完成，版本: {snapshot.version}，内容更新时间: {snapshot.updated_at}")
 
 def update_hot_rank_cache():
     """更新市场热点缓存"""
     print("开始更新市场热点缓存...")
-    hot_rank_cache['hot_search_data'] = get_hot_search_data()
-    hot_rank_cache['hot_rank_data'] = get_hot_rank_em()
-    hot_rank_cache['last_update'] = datetime.now()
-    print(f"市场热点缓存更新完成，时间: {hot_rank_cache['last_update']}")
-
-def background_update():
-    """后台线程定期更新数据"""
-    news_update_time = time.time()
-    hot_rank_update_time = time.time()
-    
+    refresh_slots('hot_rank', {
+        'hot_search_今日': lambda: get_hot_search_baidu('今日'),
+        'hot_search_1小时': lambda: get_hot_search_baidu('1小时'),
+        'hot_rank_data': get_hot_rank_em
+    }, publish_hot_rank)
+
+def publish_pages(pages):
+    """把渲染好的标签页 {页面id: HTML} 发布为快照，内容未变化的页面不产生新版本"""
+    for page_id, html in pages.items():
+        snapshots.publish(f'page:{page_id}', {}, {'html': html})
+
+def update_fund_flow_cache():
+    """更新资金流缓存，并计算各窗口的排行"""
+    print("开始更新资金流缓存...")
+    capital_flow_data = get_capital_flow_data()
+    industry_flow_data = get_industry_flow_data()
+    rankings = get_fund_flow_rankings(capital_flow_data, industry_flow_data)
+    if snapshots.get('fund_flow').stale and not has_data(rankings):
+        raise RuntimeError("资金流没有获取到任何数据，继续使用启动时载入的数据")
+    snapshot = snapshots.publish('fund_flow', {
+        'capital_flow_data': capital_flow_data,
+        'industry_flow_data': industry_flow_data,
+        'rankings': rankings
+    }, {'rankings': fund_flow_rankings_to_records(rankings)})
+    publish_pages(render_report_pages(['capital-flow'], {'fund_flow_rankings': rankings}))
+    print(f"资金流缓存更新完成，版本: {snapshot.version}，内容更新时间: {snapshot.updated_at}")
+
+def snapshot_event(snapshot):
+    return {'name': snapshot.name, 'version': snapshot.version, 'etag': snapshot.etag,
+            'last_update': snapshot.updated_at.isoformat()}
+
+# 新快照发布后推送给所有页面，事件id为快照版本，浏览器重连时通过 Last-Event-ID 补齐
+snapshots.subscribe(lambda snapshot: events.publish('snapshot', snapshot_event(snapshot), snapshot.version))
+
+report_lock = threading.Lock()
+report_etag = None  # 最近一次通知页面的报告版本
+
+def notify_report(payload):
+    """报告内容变化时通知页面重新加载，同一版本只通知一次"""
+    global report_etag
+    with report_lock:
+        changed = report_etag is not None and payload.etag != report_etag
+        report_etag = payload.etag
+    if changed:
+        events.publish('report', {'etag': payload.etag})
+
+def report_inputs():
+    """从快照中取出报告可以直接复用的数据，尚未成功获取过的数据源不提供，由报告任务自行抓取"""
+    news = snapshots.get('news').data
+    hot_rank = snapshots.get('hot_rank').data
+    fund_flow = snapshots.get('fund_flow').data
+    provided = {
+        'cls_news': news.get('cls_news'),
+        'ths_news': news.get('ths_news'),
+        'hot_rank_data': hot_rank.get('hot_rank_data'),
+        'capital_flow_data': fund_flow.get('capital_flow_data'),
+        'industry_flow_data': fund_flow.get('industry_flow_data'),
+        'fund_flow_rankings': fund_flow.get('rankings'),
+    }
+    if hot_rank.get('hot_search_今日') is not None and hot_rank.get('hot_search_1小时') is not None:
+        provided['hot_search_data'] = {'今日': hot_rank['hot_search_今日'], '1小时': hot_rank['hot_search_1小时']}
+    return {key: value for key, value in provided.items() if value is not None}
+
+def regenerate_report():
+    """运行 lb.py 的报告流水线，新闻、热点、资金流复用服务器缓存，生成后在内存中发布并原子写入磁盘"""
+    print("开始重新生成报告...")
+    provided = report_inputs()
+    report_data, orchestrator = fetch_report_data(provided=provided)
+    orchestrator.print_summary()
+    # 各标签页只渲染一次：完整报告（写入磁盘，可直接用浏览器打开）和按需加载的外壳共用
+    pages = render_report_pages(LAZY_REPORT_PAGES, report_data)
+    body = generate_limit_up_pool_html(**report_data, rendered_pages=pages).encode('utf-8')
+    shell = generate_limit_up_pool_html(**report_data, lazy_pages=LAZY_REPORT_PAGES).encode('utf-8')
+    report_file.publish(body)
+    publish_pages(pages)
+    notify_report(report_shell_file.publish(shell))
+    print(f"报告重新生成完成，复用缓存数据: {', '.join(provided) or '无'}，完整报告 {len(body)} 字节，外壳 {len(shell)} 字节")
+
+def current_report():
+    """首页内容：各标签页快照齐全时返回外壳，否则（或手动运行 lb.py 生成了更新的报告时）返回完整报告"""
+    try:
+        report = report_file.get()
+    except FileNotFoundError:
+        report = None
+    if all(snapshots.get(f'page:{page_id}') for page_id in LAZY_REPORT_PAGES):
+        try:
+            shell = report_shell_file.get()
+            if report is None or shell.last_modified >= report.last_modified:
+                return shell
+        except FileNotFoundError:
+            pass
+    if report is None:
+        raise FileNotFoundError(REPORT_FILE)
+    return report
+
+def watch_report():
+    """报告文件被手动运行的 lb.py 重新生成后预先压缩，并通知页面重新加载"""
     while True:
-        current_time = time.time()
-        
-        # 更新新闻（每5分钟）
-        if current_time - news_update_time >= NEWS_CACHE_DURATION:
-            try:
-                update_news_cache()
-                news_update_time = current_time
-            except Exception as e:
-                print(f"后台更新新闻失败: {e}")
-        
-        # 更新市场热点（每10分钟）
-        if current_time - hot_rank_update_time >= HOT_RANK_CACHE_DURATION:
-            try:
-                update_hot_rank_cache()
-                hot_rank_update_time = current_time
-            except Exception as e:
-                print(f"后台更新市场热点失败: {e}")
-        
-        time.sleep(10)  # 每10秒检查一次
+        try:
+            notify_report(current_report())
+        except FileNotFoundError:
+            pass
+        time.sleep(REPORT_WATCH_INTERVAL)
+
+def resume_from_shared_store(store):
+    """启动时载入上次保存的快照（标记为旧数据）和新闻流，立即可以提供服务
+
+    版本号和新闻游标接着上次继续，请求进程和浏览器持有的游标保持有效；旧数据标记同样写入共享存储，请求进程据此标记。
+    """
+    news_feed.restore(store.read_news())
+    store.mark_stale()
+    loaded = store.read_snapshots()
+    for snapshot in loaded:
+        snapshots.install(snapshot)
+    if loaded:
+        print(f"已从 {store.path} 载入 {len(loaded)} 个快照，后台刷新完成前作为旧数据提供")
+
+def sync_shared_store(store, version):
+    """请求进程：读取共享存储中版本号大于 version 的快照和新增的新闻，安装到本进程，返回最新版本号"""
+    news_feed.restore(store.read_news(news_feed.cursor))
+    for snapshot in store.read_snapshots(version):
+        snapshots.install(snapshot)
+        version = max(version, snapshot.version)
+    return version
+
+def follow_shared_store(store, version):
+    """请求进程的后台线程：定期同步共享存储，新快照经本进程的发布回调推送给SSE客户端"""
+    while True:
+        time.sleep(SHARED_POLL_INTERVAL)
+        try:
+            version = sync_shared_store(store, version)
+        except sqlite3.Error as e:
+            print(f"读取共享存储失败: {e}")
+
+if READER_MODE:
+    follower_lock = threading.Lock()
+    follower_pid = None
+
+    @app.before_request
+    def start_follower():
+        """在每个请求进程中第一次处理请求时连接共享存储（WSGI服务器可能在导入模块后才fork出工作进程）"""
+        global shared_store, follower_pid
+        if follower_pid == os.getpid():
+            return
+        with follower_lock:
+            if follower_pid == os.getpid():
+                return
+            shared_store = SharedStore(os.environ[SHARED_STORE_ENV])
+            version = sync_shared_store(shared_store, 0)
+            threading.Thread(target=follow_shared_store, args=(shared_store, version),
+                             name='shared-store-follower', daemon=True).start()
+            threading.Thread(target=watch_report, name='report-watcher', daemon=True).start()
+            follower_pid = os.getpid()
+else:
+    # 首次更新完成前接口返回空数据
+    snapshots.publish('news', {}, {'news': [], 'cursor': news_feed.cursor})
+    snapshots.publish('hot_rank', {}, {'hot_search': [], 'hot_rank': []})
+    snapshots.publish('fund_flow', {}, {'rankings': {'concept': {}, 'industry': {}}})
+
+def create_scheduler():
+    """按交易时段刷新各数据源的调度器，各数据源启动后立即在后台刷新一次"""
+    scheduler = RefreshScheduler()
+    now = datetime.now()
+    scheduler.add('news', update_news_cache, *NEWS_REFRESH_INTERVALS, jitter=REFRESH_JITTER, first_run=now)
+    scheduler.add('hot_rank', update_hot_rank_cache, *HOT_RANK_REFRESH_INTERVALS, jitter=REFRESH_JITTER, first_run=now)
+    scheduler.add('fund_flow', update_fund_flow_cache, *FUND_FLOW_REFRESH_INTERVALS, jitter=REFRESH_JITTER, first_run=now)
+    # 还没有报告文件时立即生成一次，否则按计划时间生成
+    scheduler.add('report', regenerate_report, *REPORT_REFRESH_INTERVALS, jitter=REFRESH_JITTER,
+                  first_run=None if os.path.exists(REPORT_FILE) else datetime.now())
+    return scheduler
+
+scheduler = None
+
+# 多进程部署时指标分布在两类进程中：请求进程统计请求和本进程的快照，刷新进程统计上游请求、后台任务和LLM调用
+READER_METRIC_GROUPS = ('http_', 'snapshot_', 'sse_')
+REFRESHER_METRIC_GROUPS = ('akshare_', 'refresh_', 'llm_')
+
+metrics.gauge('snapshot_age_seconds', '各快照距上次发布的秒数', ['name'], collect=lambda: {
+    (name,): (datetime.now() - snapshot.updated_at).total_seconds() for name, snapshot in snapshots.all().items()})
+metrics.gauge('snapshot_stale', '快照是否为启动时载入、尚未刷新确认的旧数据', ['name'], collect=lambda: {
+    (name,): int(snapshot.stale) for name, snapshot in snapshots.all().items()})
+metrics.gauge('sse_clients', '已连接的SSE客户端数', collect=lambda: {(): events.client_count})
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.monotonic()
+
+@app.after_request
+def record_request_metrics(response):
+    """按路由统计请求数和处理耗时（SSE只统计到开始推送为止）"""
+    started = g.get('request_started')
+    route = request.url_rule.rule if request.url_rule else 'unmatched'
+    HTTP_REQUESTS.inc(route=route, method=request.method, status=response.status_code)
+    if started is not None:
+        HTTP_REQUEST_SECONDS.observe(time.monotonic() - started, route=route)
+    return response
+
+def snapshot_response(name):
+    snapshot = snapshots.get(name)
+    if snapshot is None:
+        abort(503)  # 请求进程还没有从共享存储读到该数据源
+    response = payload_response(snapshot.payload)
+    if snapshot.stale:
+        # 启动时从磁盘载入、尚未被本次运行的刷新确认的数据
+        response.headers['X-Snapshot-Stale'] = '1'
+        response.headers['Warning'] = '110 - "Response is Stale"'
+    return response
 
 @app.route('/')
 def index():
     """返回主页"""
-    return send_from_directory('.', 'limit_up_pool_report.html')
+    try:
+        return payload_response(current_report(), mimetype='text/html')
+    except FileNotFoundError:
+        abort(404)
 
 @app.route('/api/news')
 def api_news():
-    """返回新闻数据API"""
-    icons = ['📰', '📊', '💹', '📈', '💼', '🏢', '💡', '⚡', '🔔', '📢']
-    news_items = []
-    
-    # 添加财联社新闻
-    if news_cache['cls_news'] is not None and not news_cache['cls_news'].empty:
-        for idx, row in news_cache['cls_news'].iterrows():
-            title = str(row.get('标题', ''))
-            time_str = str(row.get('发布时间', ''))
-            icon = icons[idx % len(icons)]
-            news_items.append({
-                'icon': icon,
-                'source': '财联社',
-                'time': time_str,
-                'title': title
-            })
-    
-    # 添加同花顺新闻
-    if news_cache['ths_news'] is not None and not news_cache['ths_news'].empty:
-        start_idx = len(news_items)
-        for idx, row in news_cache['ths_news'].iterrows():
-            title = str(row.get('标题', ''))
-            time_str = str(row.get('发布时间', ''))
-            icon = icons[(start_idx + idx) % len(icons)]
-            news_items.append({
-                'icon': icon,
-                'source': '同花顺',
-                'time': time_str,
-                'title': title
-            })
-    
-    return jsonify({
-        'news': news_items,
-        'last_update': news_cache['last_update'].isoformat() if news_cache['last_update'] else None
-    })
+    """返回新闻数据API
+
+    带 since=<cursor> 时只返回该游标之后新增的新闻（先新后旧）；reset 为 true 时客户端应重新拉取全量。
+    """
+    since = request.args.get('since', type=int)
+    if since is None:
+        return snapshot_response('news')
+    items, cursor, reset = news_feed.since(since)
+    body = json.dumps({'news': items, 'cursor': cursor, 'reset': reset}, ensure_ascii=False, separators=(',', ':'))
+    response = Response(body, mimetype='application/json')
+    response.cache_control.no_cache = True
+    return response
 
 @app.route('/api/hot-rank')
 def api_hot_rank():
     """返回市场热点数据API"""
-    hot_search_data = hot_rank_cache.get('hot_search_data')
-    hot_rank_data = hot_rank_cache.get('hot_rank_data')
-    
-    # 处理百度热搜数据
-    hot_search_items = []
-    if hot_search_data:
-        if '今日' in hot_search_data and not hot_search_data['今日'].empty:
-            for idx, row in hot_search_data['今日'].head(20).iterrows():
-                name_code = row.get('名称/代码', '')
-                change_pct = row.get('涨跌幅', '0%')
-                hot_value = row.get('综合热度', 0)
-                
-                stock_code = ''
-                stock_name = ''
-                if '(' in name_code and ')' in name_code:
-                    stock_name = name_code.split('(')[0].strip()
-                    stock_code = name_code.split('(')[1].split(')')[0].strip()
-                else:
-                    stock_name = name_code
-                
-                hot_search_items.append({
-                    'rank': idx + 1,
-                    'code': stock_code,
-                    'name': stock_name,
-                    'change': change_pct,
-                    'heat': str(hot_value) if pd.notna(hot_value) else '0'
-                })
-    
-    # 处理东方财富热度榜数据
-    hot_rank_items = []
-    if hot_rank_data is not None and not hot_rank_data.empty:
-        for idx, row in hot_rank_data.head(20).iterrows():
-            hot_rank_items.append({
-                'rank': int(row.get('当前排名', idx + 1)),
-                'code': str(row.get('代码', '')),
-                'name': str(row.get('股票名称', '')),
-                'price': float(row.get('最新价', 0)) if pd.notna(row.get('最新价')) else 0,
-                'change': float(row.get('涨跌幅', 0)) if pd.notna(row.get('涨跌幅')) else 0,
-                'volume': float(row.get('成交量', 0)) if pd.notna(row.get('成交量')) else 0
-            })
-    
-    return jsonify({
-        'hot_search': hot_search_items,
-        'hot_rank': hot_rank_items,
-        'last_update': hot_rank_cache['last_update'].isoformat() if hot_rank_cache['last_update'] else None
-    })
+    return snapshot_response('hot_rank')
+
+@app.route('/api/fund-flow')
+def api_fund_flow():
+    """返回概念/行业资金流各窗口的净额前N名和后N名"""
+    return snapshot_response('fund_flow')
+
+@app.route('/api/page/<page_id>')
+def api_page(page_id):
+    """返回按需加载的标签页内容 {'html': ...}，各页面随对应数据源或报告任务单独更新"""
+    if page_id not in LAZY_REPORT_PAGES:
+        abort(404)
+    return snapshot_response(f'page:{page_id}')
+
+@app.route('/api/events')
+def api_events():
+    """SSE推送通道：连接时先发送当前报告的ETag和各数据源的当前版本，之后每次发布新快照推送一条事件"""
+    last_event_id = request.headers.get('Last-Event-ID', type=int)
+
+    def initial():
+        messages = [format_event('snapshot', snapshot_event(snapshot), snapshot.version)
+                    for snapshot in snapshots.all().values()
+                    if last_event_id is None or snapshot.version > last_event_id]
+        # 当前报告的ETag：页面以此为基准，之后报告变化（包括断线期间的变化）时重新加载
+        try:
+            messages.insert(0, format_event('report', {'etag': current_report().etag}))
+        except FileNotFoundError:
+            pass
+        return messages
+
+    response = Response(events.stream(initial), mimetype='text/event-stream')
+    response.cache_control.no_cache = True
+    response.headers['X-Accel-Buffering'] = 'no'  # 经过nginx等反向代理时不要缓冲
+    return response
+
+@app.route('/api/schedule')
+def api_schedule():
+    """返回各数据源的下一次刷新时间，供调试"""
+    if READER_MODE:
+        return {'schedules': shared_store.read_meta('schedule', []) if shared_store else []}
+    return {'schedules': scheduler.status() if scheduler else []}
+
+@app.route('/api/health')
+def api_health():
+    """返回各akshare接口的健康状态：耗时、错误率、连续失败次数和熔断状态"""
+    if READER_MODE:
+        return {'sources': shared_store.read_meta('health', []) if shared_store else []}
+    return {'sources': akc.health()}
+
+@app.route('/metrics')
+def api_metrics():
+    """Prometheus文本格式的运行指标；请求进程附上刷新进程写入共享存储的指标"""
+    if READER_MODE:
+        body = metrics.render(READER_METRIC_GROUPS)
+        body += shared_store.read_meta('metrics', '') if shared_store else ''
+    else:
+        body = metrics.render()
+    return Response(body, mimetype='text/plain; version=0.0.4')
 
 if __name__ == '__main__':
-    # 启动时先更新一次数据
-    update_news_cache()
-    update_hot_rank_cache()
-    
-    # 启动后台更新线程
-    update_thread = threading.Thread(target=background_update, daemon=True)
-    update_thread.start()
+    # --refresher: 只刷新数据并写入共享存储，不提供HTTP服务，请求由多进程WSGI服务器处理
+    refresher = '--refresher' in sys.argv[1:]
+
+    # 先载入上次保存的快照立即提供服务，之后每次发布的快照都写入磁盘
+    shared_store = SharedStore(os.environ.get(SHARED_STORE_ENV) or SHARED_STORE_PATH)
+    resume_from_shared_store(shared_store)
+    snapshots.subscribe(shared_store.write_snapshot)
+
+    # 启动后台刷新调度器，各数据源立即在后台刷新一次，不阻塞启动
+    scheduler = create_scheduler()
+    shared_store.write_meta('schedule', scheduler.status())
+    scheduler.subscribe(lambda scheduler: shared_store.write_meta('schedule', scheduler.status()))
+    scheduler.subscribe(lambda scheduler: shared_store.write_meta('health', akc.health()))
+    scheduler.subscribe(lambda scheduler: shared_store.write_meta('metrics', metrics.render(REFRESHER_METRIC_GROUPS)))
+    scheduler.start()
+    for item in scheduler.status():
+        print(f"{item['name']} 下一次刷新时间: {item['next_run'] or '由调度线程计算'}")
+
+    if refresher:
+        print(f"刷新进程运行中，共享存储: {shared_store.path}")
+        print(f"请求进程需设置环境变量 {SHARED_STORE_ENV}={os.path.abspath(shared_store.path)} 后由WSGI服务器启动，例如:")
+        print("  gunicorn -w 4 -k gthread --threads 16 -b 0.0.0.0:5000 server:app")
+        threading.Event().wait()
+
+    threading.Thread(target=watch_report, name='report-watcher', daemon=True).start()
     
     # 启动Flask服务器
     print("服务器启动中...")
     print("请访问: http://localhost:5000")
-    app.run(host='0.0.0.0', port=5000, debug=False)
+    app.run(host='0.0.0.0', port=5000, debug=False, threaded=True)  # 每个SSE连接占用一个线程
@@ -0,0 +1,124 @@
+# 快照的持久化与跨进程共享：刷新进程把快照写入SQLite（WAL），多个请求进程只读；重启时从中恢复上次的数据
+import json
+import sqlite3
+import threading
+from datetime import datetime
+
+from compression import Payload
+from snapshots import Snapshot
+
+SHARED_STORE_PATH = "shared_store.sqlite3"
+SHARED_NEWS_ROWS = 500  # 共享新闻流保留的条数，与 NewsFeed 的容量一致
+
+
+class SharedStore:
+    """SQLite实现的快照共享存储，可在多个线程中共享
+
+    保存各数据源最新快照的预压缩响应、新闻流条目和少量元数据（如调度状态）。
+    WAL模式下读取不会阻塞写入，请求进程按版本号增量读取。
+    """
+
+    def __init__(self, path=SHARED_STORE_PATH, news_rows=SHARED_NEWS_ROWS):
+        self.path = path
+        self.news_rows = news_rows
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS snapshots (
+                name TEXT PRIMARY KEY,
+                version INTEGER NOT NULL,
+                etag TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                last_modified TEXT NOT NULL,
+                identity BLOB NOT NULL,
+                gzip BLOB,
+                br BLOB,
+                stale INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE TABLE IF NOT EXISTS news_feed (
+                seq INTEGER PRIMARY KEY,
+                item TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+        """)
+        # 旧版本创建的文件没有 stale 列
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(snapshots)")}
+        if 'stale' not in columns:
+            self.conn.execute("ALTER TABLE snapshots ADD COLUMN stale INTEGER NOT NULL DEFAULT 0")
+        self.conn.commit()
+
+    def write_snapshot(self, snapshot):
+        """写入（替换）某个数据源的最新快照，包括旧数据标记"""
+        variants = snapshot.payload.variants
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (snapshot.name, snapshot.version, snapshot.etag, snapshot.updated_at.isoformat(),
+                 snapshot.payload.last_modified.isoformat(), variants['identity'], variants.get('gzip'), variants.get('br'),
+                 int(snapshot.stale))
+            )
+            self.conn.commit()
+
+    def mark_stale(self):
+        """刷新进程启动时把上次保存的快照全部标记为旧数据
+
+        同时把版本号整体移到当前最大版本之后，已在运行的请求进程也会读到带标记的快照。
+        """
+        with self.lock:
+            self.conn.execute("UPDATE snapshots SET stale = 1, "
+                              "version = version + (SELECT COALESCE(MAX(version), 0) FROM snapshots)")
+            self.conn.commit()
+
+    def read_snapshots(self, after_version=0):
+        """读取版本号大于 after_version 的快照，按版本升序；快照中不含原始数据"""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT name, version, etag, updated_at, last_modified, identity, gzip, br, stale "
+                "FROM snapshots WHERE version > ? ORDER BY version", (after_version,)
+            ).fetchall()
+        snapshots = []
+        for name, version, etag, updated_at, last_modified, identity, gzip_body, br_body, stale in rows:
+            variants = {'identity': identity}
+            if gzip_body is not None:
+                variants['gzip'] = gzip_body
+            if br_body is not None:
+                variants['br'] = br_body
+            payload = Payload(variants, etag, datetime.fromisoformat(last_modified))
+            snapshots.append(Snapshot(name, version, {}, payload, datetime.fromisoformat(updated_at), bool(stale)))
+        return snapshots
+
+    def write_news(self, entries):
+        """追加新闻流条目 [(序号, 条目)]，只保留最近 news_rows 条"""
+        if not entries:
+            return
+        with self.lock:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO news_feed VALUES (?, ?)",
+                [(seq, json.dumps(item, ensure_ascii=False)) for seq, item in entries]
+            )
+            self.conn.execute("DELETE FROM news_feed WHERE seq <= ?", (entries[-1][0] - self.news_rows,))
+            self.conn.commit()
+
+    def read_news(self, after_seq=0):
+        """读取序号大于 after_seq 的新闻流条目 [(序号, 条目)]，按序号升序"""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT seq, item FROM news_feed WHERE seq > ? ORDER BY seq", (after_seq,)
+            ).fetchall()
+        return [(seq, json.loads(item)) for seq, item in rows]
+
+    def write_meta(self, key, value):
+        with self.lock:
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                              (key, json.dumps(value, ensure_ascii=False)))
+            self.conn.commit()
+
+    def read_meta(self, key, default=None):
+        with self.lock:
+            row = self.conn.execute("SELECT value FROM meta WHERE key=?", (key,)).fetchone()
+        return json.loads(row[0]) if row is not None else default
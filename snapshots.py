@@ -0,0 +1,119 @@
+# 服务器数据快照：每次刷新在旁边构建一个新的不可变快照，再通过一次引用赋值发布，读取方无需加锁
+import hashlib
+import json
+import threading
+from datetime import datetime, timezone
+from types import MappingProxyType
+
+from compression import Payload, compress_variants
+
+
+def _dumps(data):
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+class Snapshot:
+    """某个数据源一次刷新结果的不可变快照
+
+    - data: 原始数据（只读映射，其中的DataFrame读取方不应修改）
+    - version: 全局递增的版本号，只在内容变化时增加，可作为增量推送的游标
+    - payload: 预先序列化并压缩好的接口响应，ETag 为响应内容的哈希
+    - updated_at: 内容最后一次变化的本地时间
+    - stale: 是否为启动时从磁盘载入、本次运行尚未刷新确认过的快照
+    """
+
+    __slots__ = ('name', 'version', 'data', 'payload', 'updated_at', 'stale')
+
+    def __init__(self, name, version, data, payload, updated_at, stale=False):
+        object.__setattr__(self, 'name', name)
+        object.__setattr__(self, 'version', version)
+        object.__setattr__(self, 'data', MappingProxyType(dict(data)))
+        object.__setattr__(self, 'payload', payload)
+        object.__setattr__(self, 'updated_at', updated_at)
+        object.__setattr__(self, 'stale', stale)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("快照不可修改")
+
+    @property
+    def etag(self):
+        return self.payload.etag
+
+
+class SnapshotStore:
+    """按数据源名称保存最新快照
+
+    发布时复制一份新的 {名称: 快照} 字典再整体替换引用（写时复制），
+    读取方拿到的永远是某一次完整发布的结果，不会看到一半新一半旧的数据。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()  # 只串行化发布，读取不加锁
+        self._snapshots = MappingProxyType({})
+        self._version = 0
+        self._listeners = []
+
+    def subscribe(self, listener):
+        """注册发布回调 listener(snapshot)，每次发布新版本后在发布线程中调用"""
+        self._listeners.append(listener)
+
+    def get(self, name):
+        """返回某个数据源的最新快照，未发布过时返回None"""
+        return self._snapshots.get(name)
+
+    def all(self):
+        """返回当前全部快照的只读映射（同一时刻的一致视图）"""
+        return self._snapshots
+
+    @property
+    def version(self):
+        return self._version
+
+    def install(self, snapshot):
+        """安装一个已构建好的快照（如从共享存储读取的），保留其版本号，同样通知发布回调"""
+        with self._lock:
+            self._swap(snapshot)
+            self._version = max(self._version, snapshot.version)
+        self._notify(snapshot)
+
+    def _swap(self, snapshot):
+        """复制一份映射替换其中一个快照后整体替换引用，调用方需持有 _lock"""
+        snapshots = dict(self._snapshots)
+        snapshots[snapshot.name] = snapshot
+        self._snapshots = MappingProxyType(snapshots)
+
+    def _notify(self, snapshot):
+        for listener in self._listeners:
+            try:
+                listener(snapshot)
+            except Exception as e:
+                print(f"快照发布回调失败: {e}")
+
+    def publish(self, name, data, content, updated_at=None):
+        """用原始数据 data 和接口内容 content 构建新快照并发布，返回该数据源的最新快照
+
+        content 为接口响应中除 version / last_update 以外的部分；与当前快照内容相同时沿用原来的响应、版本号和
+        内容更新时间，只换上本次的原始数据，不通知回调（报告等由原始数据生成的内容仍能拿到接口中没有的字段的最新值）。
+        当前快照是从磁盘载入的旧数据时同样换上原始数据并去掉 stale 标记，但版本号递增并通知回调
+        （共享存储和请求进程据此得知数据已确认）。
+        """
+        content_bytes = _dumps(content)
+        etag = hashlib.sha256(content_bytes).hexdigest()[:32]
+        updated_at = updated_at or datetime.now()
+        with self._lock:
+            current = self._snapshots.get(name)
+            version = self._version + 1
+            if current is not None and current.etag == etag:
+                if not current.stale:
+                    snapshot = Snapshot(name, current.version, data, current.payload, current.updated_at)
+                    self._swap(snapshot)
+                    return snapshot
+                snapshot = Snapshot(name, version, data, current.payload, current.updated_at)
+            else:
+                body = dict(content, version=version, last_update=updated_at.isoformat())
+                payload = Payload(compress_variants(_dumps(body)), etag, datetime.now(timezone.utc).replace(microsecond=0))
+                snapshot = Snapshot(name, version, data, payload, updated_at)
+            self._swap(snapshot)
+            self._version = version
+        self._notify(snapshot)
+        return snapshot
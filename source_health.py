@@ -0,0 +1,196 @@
+# 上游数据源健康状态与熔断：按akshare接口记录耗时、错误率和连续失败次数，持续失败的接口暂停调用
+import re
+import threading
+import time
+from datetime import datetime
+
+CIRCUIT_FAILURE_THRESHOLD = 3  # 连续失败该次数后熔断
+CIRCUIT_RESET_TIMEOUT = 60  # 熔断后等待多久（秒）放行一次试探调用
+CIRCUIT_MAX_RESET_TIMEOUT = 1800  # 试探连续失败时等待时间翻倍，最长30分钟
+CIRCUIT_SLOW_CALL = 45  # 超过该时间（秒）的调用视为失败；仍未返回的调用超时后按一次失败计入，不再等待其结果
+HEALTH_WINDOW = 50  # 错误率和平均耗时按最近多少次调用统计
+# 按参数分开熔断的接口：各窗口、各营业部分别计数，一个营业部持续失败不影响其他营业部
+CIRCUIT_SPLIT_ARGS = {
+    'stock_fund_flow_concept': ('symbol',),
+    'stock_fund_flow_industry': ('symbol',),
+    'stock_lhb_yyb_detail_em': ('symbol',),
+    'stock_hot_search_baidu': ('time',),
+}
+# 逐只股票的查询不熔断：个别股票失败不代表接口不可用，参数也没有上限
+CIRCUIT_EXEMPT = frozenset({'stock_board_concept_cons_em'})
+DATE_ARG_PATTERN = re.compile(r'^\d{8}$')
+
+CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+
+class CircuitOpenError(Exception):
+    """数据源处于熔断状态，本次调用被跳过"""
+
+
+def source_name(name, kwargs):
+    """熔断和健康统计的数据源名称：akshare函数名，加上区分数据源的参数
+
+    日期参数按当天/历史分开（历史日期的股池失败不影响当天的股池），CIRCUIT_SPLIT_ARGS 中的参数按取值分开。
+    CIRCUIT_EXEMPT 中的接口返回 None，不经过熔断器。
+    """
+    if name in CIRCUIT_EXEMPT:
+        return None
+    parts = []
+    today = datetime.now().strftime('%Y%m%d')
+    for key, value in sorted(kwargs.items()):
+        if key == 'date' and isinstance(value, str) and DATE_ARG_PATTERN.match(value):
+            parts.append(f"date={'today' if value == today else 'history'}")
+        elif key in CIRCUIT_SPLIT_ARGS.get(name, ()):
+            parts.append(f"{key}={value}")
+    return f"{name}({', '.join(parts)})" if parts else name
+
+
+class SourceHealth:
+    """单个数据源的健康统计与熔断状态
+
+    - closed: 正常调用
+    - open: 连续失败达到阈值，reset_timeout 内的调用直接抛出 CircuitOpenError
+    - half_open: 等待结束后只放行一次试探调用，成功则恢复，失败则重新熔断并加倍等待时间
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.lock = threading.Lock()
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.reset_timeout = CIRCUIT_RESET_TIMEOUT
+        self.opened_at = None
+        self.probing = None  # 半开状态下正在进行的试探调用编号
+        self.in_flight = {}  # 调用编号 -> 开始时间
+        self.next_call_id = 0
+        self.recent = []  # 最近的调用 (是否成功, 耗时)
+        self.calls = 0
+        self.failures = 0
+        self.rejected = 0
+        self.last_error = None
+        self.last_success = None
+        self.last_failure = None
+
+    def _expire_hung(self, now):
+        """超过 CIRCUIT_SLOW_CALL 仍未返回的调用各按一次失败计入并不再跟踪，之后按正常的熔断/试探流程处理"""
+        for call_id, started in list(self.in_flight.items()):
+            if now - started > CIRCUIT_SLOW_CALL:
+                del self.in_flight[call_id]
+                self._record(call_id, now - started, f"调用超过 {CIRCUIT_SLOW_CALL}s 仍未返回", now)
+
+    def before_call(self):
+        """检查是否允许调用，允许时返回调用编号，否则抛出 CircuitOpenError"""
+        now = time.monotonic()
+        with self.lock:
+            self._expire_hung(now)
+            if self.state == OPEN and now - self.opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+            if self.state == OPEN or (self.state == HALF_OPEN and self.probing is not None):
+                self.rejected += 1
+                raise CircuitOpenError(f"{self.name} 已熔断，暂停调用")
+            self.next_call_id += 1
+            if self.state == HALF_OPEN:
+                self.probing = self.next_call_id
+            self.in_flight[self.next_call_id] = now
+            return self.next_call_id
+
+    def after_call(self, call_id, error=None):
+        """记录一次调用的结果；耗时超过 CIRCUIT_SLOW_CALL 的成功调用同样记为失败，已按超时计入的调用不再记录"""
+        now = time.monotonic()
+        with self.lock:
+            started = self.in_flight.pop(call_id, None)
+            if started is None:
+                return
+            elapsed = now - started
+            if error is None and elapsed > CIRCUIT_SLOW_CALL:
+                error = f"调用耗时 {elapsed:.1f}s 超过 {CIRCUIT_SLOW_CALL}s"
+            self._record(call_id, elapsed, error, now)
+
+    def _record(self, call_id, elapsed, error, now):
+        ok = error is None
+        self.calls += 1
+        self.recent.append((ok, elapsed))
+        del self.recent[:-HEALTH_WINDOW]
+        was_probe = self.state == HALF_OPEN and self.probing == call_id
+        if was_probe:
+            self.probing = None
+        if ok:
+            self.last_success = time.time()
+            self.consecutive_failures = 0
+            if self.state != CLOSED:
+                print(f"数据源 {self.name} 试探调用成功，恢复正常")
+            self.state = CLOSED
+            self.reset_timeout = CIRCUIT_RESET_TIMEOUT
+            return
+        self.failures += 1
+        self.last_failure = time.time()
+        self.last_error = str(error)
+        self.consecutive_failures += 1
+        if was_probe:
+            self.reset_timeout = min(self.reset_timeout * 2, CIRCUIT_MAX_RESET_TIMEOUT)
+            self._open(now)
+        elif self.state == CLOSED and self.consecutive_failures >= CIRCUIT_FAILURE_THRESHOLD:
+            self._open(now)
+
+    def _open(self, now):
+        self.state = OPEN
+        self.opened_at = now
+        print(f"数据源 {self.name} 连续失败 {self.consecutive_failures} 次，熔断 {self.reset_timeout} 秒")
+
+    def status(self):
+        with self.lock:
+            recent = len(self.recent)
+            errors = sum(1 for ok, _ in self.recent if not ok)
+            return {
+                'name': self.name,
+                'state': self.state,
+                'consecutive_failures': self.consecutive_failures,
+                'error_rate': round(errors / recent, 3) if recent else 0,
+                'avg_latency': round(sum(elapsed for _, elapsed in self.recent) / recent, 3) if recent else None,
+                'in_flight': len(self.in_flight),
+                'calls': self.calls,
+                'failures': self.failures,
+                'rejected': self.rejected,
+                'last_error': self.last_error,
+                'last_success': self.last_success,
+                'last_failure': self.last_failure,
+            }
+
+
+class HealthRegistry:
+    """按数据源名称（见 source_name）保存健康状态"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.sources = {}
+
+    def get(self, name):
+        with self.lock:
+            source = self.sources.get(name)
+            if source is None:
+                source = self.sources[name] = SourceHealth(name)
+            return source
+
+    def call(self, name, func):
+        """经过熔断器调用 func：熔断时抛出 CircuitOpenError，异常原样抛出并计入失败"""
+        source = self.get(name)
+        call_id = source.before_call()
+        try:
+            result = func()
+        except Exception as e:
+            source.after_call(call_id, e)
+            raise
+        source.after_call(call_id)
+        return result
+
+    def status(self):
+        """各数据源的健康状态，按名称排序"""
+        with self.lock:
+            sources = sorted(self.sources.values(), key=lambda source: source.name)
+        return [source.status() for source in sources]
+
+    def report(self):
+        for item in self.status():
+            if item['failures'] or item['rejected'] or item['state'] != CLOSED:
+                print(f"数据源 {item['name']}: 状态 {item['state']}，调用 {item['calls']} 次，"
+                      f"失败 {item['failures']} 次，熔断跳过 {item['rejected']} 次，最近错误: {item['last_error']}")
@@ -0,0 +1,97 @@
+import threading
+import time
+
+import pytest
+
+pytest.importorskip('akshare')
+
+import ak_cache  # noqa: E402
+from ak_cache import SingleFlightCache  # noqa: E402
+
+
+class Counter:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.calls
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(ak_cache.time, 'monotonic', lambda: now[0])
+    return now
+
+
+def test_ttl_expires(clock):
+    cache, func = SingleFlightCache(default_ttl=10), Counter()
+    assert cache.call('k', func) == 1
+    clock[0] += 9
+    assert cache.call('k', func) == 1
+    clock[0] += 2
+    assert cache.call('k', func) == 2
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_zero_ttl_is_not_cached(clock):
+    cache, func = SingleFlightCache(default_ttl=10), Counter()
+    assert cache.call('k', func, ttl=0) == 1
+    assert cache.call('k', func, ttl=0) == 2
+    assert not cache.values
+
+
+def test_no_default_ttl_caches_until_clear(clock):
+    cache, func = SingleFlightCache(default_ttl=None), Counter()
+    cache.call('k', func)
+    clock[0] += 10 ** 6
+    assert cache.call('k', func) == 1
+    cache.clear()
+    assert cache.call('k', func) == 2
+
+
+def test_concurrent_calls_share_one_request():
+    cache = SingleFlightCache(default_ttl=0)
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return 'result'
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(cache.call('k', slow)))
+    leader.start()
+    started.wait(5)
+    follower = threading.Thread(target=lambda: results.append(cache.call('k', slow)))
+    follower.start()
+    deadline = time.monotonic() + 5
+    while cache.shared == 0 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    release.set()
+    leader.join(5)
+    follower.join(5)
+    assert results == ['result', 'result'] and len(calls) == 1
+
+
+def test_errors_are_not_cached():
+    cache = SingleFlightCache()
+
+    def fail():
+        raise RuntimeError("上游错误")
+
+    with pytest.raises(RuntimeError):
+        cache.call('k', fail)
+    assert cache.call('k', lambda: 'ok') == 'ok'
+
+
+def test_least_recently_used_entries_evicted():
+    cache = SingleFlightCache(max_entries=2)
+    cache.call('a', lambda: 'a')
+    cache.call('b', lambda: 'b')
+    cache.call('a', lambda: 'new a')  # 命中，a 变为最近使用
+    cache.call('c', lambda: 'c')
+    assert list(cache.values) == ['a', 'c']
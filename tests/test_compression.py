@@ -0,0 +1,98 @@
+import gzip
+
+import pytest
+from werkzeug.datastructures import Accept
+from werkzeug.http import parse_accept_header
+
+from compression import MIN_COMPRESS_SIZE, PrecompressedFile, compress_variants, negotiate
+
+VARIANTS = {'identity': b'', 'gzip': b'', 'br': b''}
+
+
+def accept(header):
+    return parse_accept_header(header, Accept)
+
+
+@pytest.mark.parametrize('header, variants, expected', [
+    ('', VARIANTS, 'identity'),
+    ('gzip', VARIANTS, 'gzip'),
+    ('gzip, deflate, br', VARIANTS, 'br'),
+    ('br;q=0.5, gzip', VARIANTS, 'gzip'),
+    ('gzip, br', {'identity': b'', 'gzip': b''}, 'gzip'),
+    ('br', {'identity': b''}, 'identity'),
+])
+def test_negotiate(header, variants, expected):
+    assert negotiate(accept(header), variants) == expected
+
+
+def test_small_bodies_are_not_compressed():
+    assert compress_variants(b'x' * (MIN_COMPRESS_SIZE - 1)) == {'identity': b'x' * (MIN_COMPRESS_SIZE - 1)}
+    body = b'<html>' + '涨停'.encode('utf-8') * MIN_COMPRESS_SIZE
+    variants = compress_variants(body)
+    assert gzip.decompress(variants['gzip']) == body
+    assert compress_variants(body)['gzip'] == variants['gzip']  # mtime=0，同样的内容压缩结果相同
+
+
+def test_precompressed_file_etag_follows_content(tmp_path):
+    cache = PrecompressedFile(str(tmp_path / 'report.html'))
+    with pytest.raises(FileNotFoundError):
+        cache.get()
+    first = cache.publish(b'a' * 2000)
+    assert cache.get() is first
+    second = cache.publish(b'b' * 2000)
+    assert second.etag != first.etag
+    assert cache.get() is second
+
+
+@pytest.fixture
+def server():
+    pytest.importorskip('flask')
+    import server
+    return server
+
+
+def test_payload_response_etag_per_encoding(server, tmp_path):
+    payload = PrecompressedFile(str(tmp_path / 'page.html')).publish(b'a' * 2000)
+    with server.app.test_request_context(headers={'Accept-Encoding': 'gzip'}):
+        response = server.payload_response(payload, mimetype='text/html')
+    assert response.status_code == 200
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.get_etag() == (f"{payload.etag}-gzip", False)
+    assert 'Accept-Encoding' in response.vary
+    assert gzip.decompress(response.get_data()) == b'a' * 2000
+
+    with server.app.test_request_context():
+        response = server.payload_response(payload, mimetype='text/html')
+    assert 'Content-Encoding' not in response.headers
+    assert response.get_etag() == (payload.etag, False)
+
+
+def test_payload_response_not_modified(server, tmp_path):
+    payload = PrecompressedFile(str(tmp_path / 'page.html')).publish(b'a' * 2000)
+    headers = {'Accept-Encoding': 'gzip', 'If-None-Match': f'"{payload.etag}-gzip"'}
+    with server.app.test_request_context(headers=headers):
+        response = server.payload_response(payload)
+    assert response.status_code == 304
+    headers['If-None-Match'] = f'"{payload.etag}"'  # 原文的ETag不能用于gzip版本
+    with server.app.test_request_context(headers=headers):
+        response = server.payload_response(payload)
+    assert response.status_code == 200
+
+
+def test_publish_uses_a_private_temp_file(tmp_path, monkeypatch):
+    path = tmp_path / 'report.html'
+    stale_tmp = tmp_path / 'report.html.tmp'
+    stale_tmp.write_bytes(b'half written by another writer')
+    cache = PrecompressedFile(str(path))
+    cache.publish(b'a' * 2000)
+    assert path.read_bytes() == b'a' * 2000
+    assert stale_tmp.read_bytes() == b'half written by another writer'
+
+    def fail_replace(src, dst):
+        raise OSError("磁盘已满")
+
+    monkeypatch.setattr('compression.os.replace', fail_replace)
+    with pytest.raises(OSError):
+        cache.publish(b'b' * 2000)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['report.html', 'report.html.tmp']
+    assert path.read_bytes() == b'a' * 2000
@@ -0,0 +1,55 @@
+import pandas as pd
+
+import lb
+from lb import build_batch_reason_prompt, parse_batch_reasons
+from llm_cache import LLMReasonCache
+
+
+def test_prompt_lists_stocks_in_order():
+    prompt = build_batch_reason_prompt([
+        {'name': '甲股份', 'code': '600001', 'info': '机器人', 'concepts': '人形机器人,减速器'},
+        {'name': '乙科技', 'code': '300002', 'info': '算力', 'concepts': None},
+    ])
+    assert '以下2只股票' in prompt
+    assert '1. 甲股份(600001) 股票信息：机器人 所属概念板块：人形机器人,减速器' in prompt
+    assert '2. 乙科技(300002) 股票信息：算力\n' in prompt
+
+
+def test_parse_accepts_common_separators_and_numbering():
+    text = "600001|人形机器人减速器\n2. 300002｜算力租赁\n000003 丙公司：固态电池\n"
+    assert parse_batch_reasons(text, ['600001', '300002', '000003']) == {
+        '600001': '人形机器人减速器',
+        '300002': '算力租赁',
+        '000003': '固态电池',
+    }
+
+
+def test_parse_ignores_unknown_duplicate_and_empty_lines():
+    text = "好的，结果如下\n999999|无关股票\n600001|第一次\n600001|第二次\n300002|\n"
+    assert parse_batch_reasons(text, [600001, 300002]) == {'600001': '第一次'}
+
+
+def test_parse_truncates_reason_and_handles_missing_text():
+    reasons = parse_batch_reasons("600001|" + "很长的原因" * 10, ['600001'])
+    assert len(reasons['600001']) == 20
+    assert parse_batch_reasons(None, ['600001']) == {}
+
+
+def test_fallback_does_not_query_the_cache_again(tmp_path, monkeypatch):
+    cache = LLMReasonCache(path=str(tmp_path / 'llm.sqlite3'))
+    monkeypatch.setattr(lb, 'get_llm_reason_cache', lambda: cache)
+    prompts = []
+
+    def fake_llm(prompt, max_tokens, rate_limiter=None):
+        prompts.append(prompt)
+        if '分别分析' in prompt:
+            return "600001|机器人"  # 批量回答漏掉了 300002
+        return "算力租赁"
+
+    monkeypatch.setattr(lb, 'call_qwen_llm', fake_llm)
+    pool = pd.DataFrame({'名称': ['甲股份', '乙科技'], '代码': ['600001', '300002']})
+    reasons = lb.analyze_limit_up_reasons([('甲股份', '600001'), ('乙科技', '300002')], pool,
+                                          max_workers=2, requests_per_second=0, batch_size=2)
+    assert reasons == ['机器人', '算力租赁']
+    assert len(prompts) == 2
+    assert (cache.hits, cache.misses, cache.writes) == (0, 2, 2)
@@ -0,0 +1,64 @@
+import pytest
+
+from metrics import MetricsRegistry
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry(prefix='test_')
+
+
+def test_counter_and_gauge_text_format(registry):
+    requests = registry.counter('requests_total', '请求数', ['route', 'status'])
+    requests.inc(route='/api/news', status=200)
+    requests.inc(2, route='/api/news', status=200)
+    requests.inc(route='/', status=304)
+    registry.gauge('age_seconds', '快照年龄', collect=lambda: {(): 1.5})
+    assert registry.render() == (
+        '# HELP test_age_seconds 快照年龄\n'
+        '# TYPE test_age_seconds gauge\n'
+        'test_age_seconds 1.5\n'
+        '# HELP test_requests_total 请求数\n'
+        '# TYPE test_requests_total counter\n'
+        'test_requests_total{route="/",status="304"} 1\n'
+        'test_requests_total{route="/api/news",status="200"} 3\n'
+    )
+
+
+def test_histogram_buckets_are_cumulative(registry):
+    seconds = registry.histogram('fetch_seconds', '耗时', ['source'], buckets=(1, 0.5))
+    for value in (0.2, 0.7, 3):
+        seconds.observe(value, source='a')
+    lines = registry.render().splitlines()
+    assert lines[1] == '# TYPE test_fetch_seconds histogram'
+    assert lines[2:] == [
+        'test_fetch_seconds_bucket{source="a",le="0.5"} 1',
+        'test_fetch_seconds_bucket{source="a",le="1"} 2',
+        'test_fetch_seconds_bucket{source="a",le="+Inf"} 3',
+        'test_fetch_seconds_sum{source="a"} 3.9',
+        'test_fetch_seconds_count{source="a"} 3',
+    ]
+
+
+def test_label_values_are_escaped(registry):
+    registry.counter('errors_total', '错误数', ['error']).inc(error='a "b"\\c\nd')
+    assert 'test_errors_total{error="a \\"b\\"\\\\c\\nd"} 1' in registry.render()
+
+
+def test_empty_failing_and_filtered_metrics(registry):
+    registry.counter('unused_total', '没有数据')
+
+    def broken():
+        raise RuntimeError("收集失败")
+
+    registry.gauge('broken', '收集失败', collect=broken)
+    assert registry.render() == ''
+    registry.gauge('snapshot_stale', '旧数据').set(1)
+    registry.gauge('sse_clients', '连接数').set(2)
+    assert registry.render(['snapshot']) == '# HELP test_snapshot_stale 旧数据\n# TYPE test_snapshot_stale gauge\ntest_snapshot_stale 1\n'
+
+
+def test_duplicate_registration_rejected(registry):
+    registry.counter('a_total', 'a')
+    with pytest.raises(ValueError):
+        registry.gauge('a_total', 'a')
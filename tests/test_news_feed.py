@@ -0,0 +1,38 @@
+from news_feed import NewsFeed
+
+
+def news(index, source='财联社'):
+    return {'source': source, 'time': f"09:{index:02d}", 'title': f"新闻{index}", 'icon': '📰'}
+
+
+def test_add_deduplicates_and_assigns_cursor():
+    feed = NewsFeed()
+    assert feed.add([news(1), news(2)]) == [(1, news(1)), (2, news(2))]
+    assert feed.add([news(2), news(3), news(3, source='同花顺')]) == [(3, news(3)), (4, news(3, source='同花顺'))]
+    assert feed.cursor == 4
+
+
+def test_since_returns_newest_first():
+    feed = NewsFeed()
+    feed.add([news(1), news(2), news(3)])
+    assert feed.since(1) == ([news(3), news(2)], 3, False)
+    assert feed.since(3) == ([], 3, False)
+    assert feed.since(0) == ([news(3), news(2), news(1)], 3, False)
+
+
+def test_since_requests_reset():
+    feed = NewsFeed(capacity=3, delta_limit=2)
+    feed.add([news(i) for i in range(1, 6)])  # 只保留序号3~5
+    assert feed.since(10) == ([], 5, True)  # 服务器重启后游标超前
+    assert feed.since(1) == ([], 5, True)  # 早于缓冲区
+    assert feed.since(2) == ([], 5, True)  # 新增条数超过上限
+    assert feed.since(3) == ([news(5), news(4)], 5, False)
+
+
+def test_restore_keeps_sequence_numbers():
+    feed = NewsFeed()
+    feed.add([news(1)])
+    feed.restore([(1, news(9)), (5, news(5)), (6, news(6))])
+    assert feed.cursor == 6
+    assert feed.since(1) == ([news(6), news(5)], 6, False)
+    assert feed.add([news(5), news(7)]) == [(7, news(7))]
@@ -0,0 +1,65 @@
+import threading
+
+import pytest
+
+from orchestrator import FetchOrchestrator
+
+
+def test_dependencies_receive_results_in_order():
+    orchestrator = FetchOrchestrator(max_workers=4)
+    orchestrator.add('a', lambda: 1)
+    orchestrator.add('b', lambda: 2)
+    orchestrator.add('sum', lambda a, b: (a, b), deps=('b', 'a'))
+    results = orchestrator.run()
+    assert results == {'a': 1, 'b': 2, 'sum': (2, 1)}
+    assert all(timing['status'] == 'ok' for timing in orchestrator.timings.values())
+
+
+def test_timeout_uses_default_and_downstream_still_runs():
+    release = threading.Event()
+    orchestrator = FetchOrchestrator(max_workers=2, default_timeout=5)
+    orchestrator.add('slow', lambda: release.wait(10) and 'late', timeout=0.1, default='default')
+    orchestrator.add('after', lambda value: f"got {value}", deps=('slow',))
+    try:
+        results = orchestrator.run()
+    finally:
+        release.set()
+    assert results == {'slow': 'default', 'after': 'got default'}
+    assert orchestrator.timings['slow']['status'] == 'timeout'
+    assert 'slow' in orchestrator.late_futures
+    assert orchestrator.late_futures['slow'].result(timeout=5) == 'late'
+
+
+def test_error_uses_callable_default():
+    def fail():
+        raise RuntimeError("上游错误")
+
+    orchestrator = FetchOrchestrator()
+    orchestrator.add('broken', fail, default=list)
+    results = orchestrator.run()
+    assert results == {'broken': []}
+    assert orchestrator.timings['broken']['status'] == 'error'
+    assert not orchestrator.late_futures
+
+
+def test_exit_if_late_returns_when_nothing_is_running():
+    orchestrator = FetchOrchestrator()
+    orchestrator.add('a', lambda: 1)
+    orchestrator.run()
+    orchestrator.exit_if_late()  # 没有超时任务时直接返回
+
+
+def test_duplicate_task_name_rejected():
+    orchestrator = FetchOrchestrator()
+    orchestrator.add('a', lambda: 1)
+    with pytest.raises(ValueError):
+        orchestrator.add('a', lambda: 2)
+
+
+@pytest.mark.parametrize('deps', [{'a': ('missing',)}, {'a': ('b',), 'b': ('a',)}])
+def test_invalid_graph_rejected(deps):
+    orchestrator = FetchOrchestrator()
+    for name, task_deps in deps.items():
+        orchestrator.add(name, lambda *args: None, deps=task_deps)
+    with pytest.raises(ValueError):
+        orchestrator.run()
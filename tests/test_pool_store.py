@@ -0,0 +1,67 @@
+from datetime import datetime
+
+import pandas as pd
+
+import lb
+from pool_store import PoolStore, is_final
+
+
+def pool():
+    return pd.DataFrame({'代码': ['600001'], '名称': ['甲股份']})
+
+
+def test_is_final():
+    assert is_final('20260105', datetime(2026, 1, 6, 9, 30))
+    assert not is_final('20260106', datetime(2026, 1, 6, 14, 0))
+    assert is_final('20260106', datetime(2026, 1, 6, 15, 30))
+
+
+def test_get_or_fetch_reuses_final_partitions_only(tmp_path):
+    store = PoolStore(root=str(tmp_path))
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return pool()
+
+    store.get_or_fetch('zt_pool', '20200102', fetch)
+    assert store.get_or_fetch('zt_pool', '20200102', fetch).equals(pool())
+    assert len(calls) == 1
+    today = datetime.now().strftime('%Y%m%d')
+    store.write('zt_pool', today, pool(), fetched_at=datetime.now().replace(hour=10))
+    assert not store.has('zt_pool', today)
+
+
+def test_empty_result_is_not_final(tmp_path):
+    store = PoolStore(root=str(tmp_path))
+    store.write('zt_pool', '20200102', pd.DataFrame())
+    assert store.entry('zt_pool', '20200102')['final'] is False
+    assert not store.has('zt_pool', '20200102')
+
+
+def test_catalog_merges_writes_from_other_instances(tmp_path):
+    first, second = PoolStore(root=str(tmp_path)), PoolStore(root=str(tmp_path))
+    first.write('zt_pool', '20200102', pool())
+    second.write('zt_pool', '20200103', pool())
+    assert PoolStore(root=str(tmp_path)).dates('zt_pool') == ['20200102', '20200103']
+    assert first.dates('zt_pool') == ['20200102', '20200103']
+
+
+def test_today_pool_fetched_once_per_run(monkeypatch):
+    loads = []
+    analyzed = []
+
+    def load(date):
+        loads.append(date)
+        return pool()
+
+    def analyze(stocks, zt_pool_data=None):
+        analyzed.append(zt_pool_data)
+        return ['机器人'] * len(stocks)
+
+    monkeypatch.setattr(lb, 'load_limit_up_pool', load)
+    monkeypatch.setattr(lb, 'analyze_limit_up_reasons', analyze)
+    df = lb.get_today_limit_up_pool()
+    assert len(loads) == 1
+    assert analyzed[0] is df
+    assert df['涨停原因'].tolist() == ['机器人']
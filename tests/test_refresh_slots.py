@@ -0,0 +1,42 @@
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+pytest.importorskip('flask')
+
+import server  # noqa: E402
+from compression import Payload, compress_variants  # noqa: E402
+from snapshots import Snapshot, SnapshotStore  # noqa: E402
+
+
+@pytest.fixture
+def store(monkeypatch):
+    store = SnapshotStore()
+    monkeypatch.setattr(server, 'snapshots', store)
+    # 从共享存储载入的旧快照：只有接口响应，没有原始数据
+    payload = Payload(compress_variants(b'{"news":[]}'), 'persisted', datetime.now())
+    store.install(Snapshot('news', 1, {}, payload, datetime.now(), stale=True))
+    return store
+
+
+def frame():
+    return pd.DataFrame({'标题': ['新闻']})
+
+
+def test_stale_snapshot_kept_when_a_slot_is_missing(store):
+    published = []
+
+    def broken():
+        raise RuntimeError("上游不可用")
+
+    with pytest.raises(RuntimeError, match='ths_news'):
+        server.refresh_slots('news', {'cls_news': frame, 'ths_news': broken}, published.append)
+    assert published == []
+    assert store.get('news').stale
+
+
+def test_publishes_once_every_slot_has_data(store):
+    published = []
+    server.refresh_slots('news', {'cls_news': frame, 'ths_news': frame}, published.append)
+    assert [sorted(data) for data in published] == [['cls_news', 'ths_news']]
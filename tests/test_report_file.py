@@ -0,0 +1,29 @@
+import pytest
+
+import lb
+
+
+def test_write_replaces_target_and_leaves_other_temp_files(tmp_path, monkeypatch):
+    path = tmp_path / 'report.html'
+    other_tmp = tmp_path / 'report.html.tmp'
+    other_tmp.write_text('另一个进程写到一半的报告', encoding='utf-8')
+    monkeypatch.setattr(lb, 'iter_limit_up_pool_html', lambda: iter(['<html>', '涨停', '</html>']))
+    lb.write_limit_up_pool_html(str(path))
+    assert path.read_text(encoding='utf-8') == '<html>涨停</html>'
+    assert other_tmp.read_text(encoding='utf-8') == '另一个进程写到一半的报告'
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['report.html', 'report.html.tmp']
+
+
+def test_failed_render_keeps_previous_report(tmp_path, monkeypatch):
+    path = tmp_path / 'report.html'
+    path.write_text('旧报告', encoding='utf-8')
+
+    def broken():
+        yield '<html>'
+        raise RuntimeError("渲染失败")
+
+    monkeypatch.setattr(lb, 'iter_limit_up_pool_html', broken)
+    with pytest.raises(RuntimeError):
+        lb.write_limit_up_pool_html(str(path))
+    assert path.read_text(encoding='utf-8') == '旧报告'
+    assert [p.name for p in tmp_path.iterdir()] == ['report.html']
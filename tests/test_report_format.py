@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from report_format import (column_or, fmt_hhmm, fmt_int, fmt_num, fmt_str, fmt_thousands, parse_percent, render_rows,
+                           sign_class, split_name_code, stock_urls)
+
+
+def test_number_formats_match_row_by_row_formatting():
+    values = pd.Series([1.005, 23456.7, -0.5])
+    assert list(fmt_num(values)) == [f"{x:.2f}" for x in values]
+    assert list(fmt_num(values, digits=1, scale=1e4)) == [f"{x / 1e4:.1f}" for x in values]
+    assert list(fmt_int(pd.Series([3.9, -2.1]))) == ['3', '-2']
+    assert list(fmt_thousands(pd.Series([1234567, 12]))) == ['1,234,567', '12']
+    assert list(fmt_str(pd.Series(['a', 1, None]))) == ['a', '1', 'None']
+
+
+def test_fmt_hhmm():
+    assert list(fmt_hhmm(pd.Series(['092500', '1130', None, '']))) == ['09:25', '11:30', '', '']
+
+
+def test_column_or_default():
+    df = pd.DataFrame({'a': [1, 2]})
+    assert column_or(df, 'a', 0).tolist() == [1, 2]
+    assert column_or(df, 'b', '-').tolist() == ['-', '-']
+
+
+def test_parse_percent_and_sign_class():
+    values = parse_percent(pd.Series(['3.21%', '+1.5%', None, 2.0, 'abc']))
+    assert values[:4].tolist() == [3.21, 1.5, 0.0, 2.0]
+    assert np.isnan(values[4])
+    assert list(sign_class([1.2, 0, -3])) == ['positive', 'negative', 'negative']
+
+
+def test_split_name_code_and_urls():
+    names, codes = split_name_code(pd.Series(['平安银行(000001)', '无代码', None]))
+    assert list(names) == ['平安银行', '无代码', '']
+    assert list(codes) == ['000001', '', '']
+    assert list(stock_urls(['600000', '000001', '300750', None])) == [
+        'https://quote.eastmoney.com/sh600000.html',
+        'https://quote.eastmoney.com/sz000001.html',
+        'https://quote.eastmoney.com/sz300750.html',
+        '#',
+    ]
+
+
+def test_render_rows():
+    html = render_rows("<tr><td>{name}</td><td>{value}</td></tr>", {'name': ['甲', '乙'], 'value': ['1', '2']})
+    assert html == "<tr><td>甲</td><td>1</td></tr><tr><td>乙</td><td>2</td></tr>"
+    assert render_rows("<tr>{name}</tr>", {'name': []}) == ''
+    with pytest.raises(ValueError):
+        render_rows("{a}{b}", {'a': ['1'], 'b': ['1', '2']})
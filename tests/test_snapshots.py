@@ -0,0 +1,53 @@
+from datetime import datetime
+
+import pytest
+
+from compression import Payload, compress_variants
+from snapshots import Snapshot, SnapshotStore
+
+
+@pytest.fixture
+def store():
+    store = SnapshotStore()
+    store.notified = []
+    store.subscribe(store.notified.append)
+    return store
+
+
+def test_changed_content_bumps_version_and_notifies(store):
+    first = store.publish('hot_rank', {'rows': 1}, {'hot_rank': [1]})
+    second = store.publish('hot_rank', {'rows': 2}, {'hot_rank': [2]})
+    assert (first.version, second.version) == (1, 2)
+    assert second.etag != first.etag
+    assert store.notified == [first, second]
+
+
+def test_unchanged_content_keeps_version_but_swaps_data(store):
+    first = store.publish('hot_rank', {'rows': 'old'}, {'hot_rank': [1]})
+    second = store.publish('hot_rank', {'rows': 'new'}, {'hot_rank': [1]})
+    assert second.version == first.version and second.payload is first.payload
+    assert second.updated_at == first.updated_at
+    assert store.get('hot_rank').data['rows'] == 'new'
+    assert store.notified == [first]
+    assert store.version == 1
+
+
+def test_unchanged_content_confirms_stale_snapshot(store):
+    current = store.publish('news', {}, {'news': []})
+    store.install(Snapshot('news', 5, {}, current.payload, datetime.now(), stale=True))
+    confirmed = store.publish('news', {'cls_news': 'fresh'}, {'news': []})
+    assert not confirmed.stale
+    assert confirmed.version == 6
+    assert confirmed.payload is current.payload
+    assert confirmed.data['cls_news'] == 'fresh'
+    assert store.notified[-1] is confirmed
+
+
+def test_snapshots_are_immutable(store):
+    snapshot = store.publish('news', {'a': 1}, {'news': []})
+    with pytest.raises(AttributeError):
+        snapshot.version = 2
+    with pytest.raises(TypeError):
+        snapshot.data['a'] = 2
+    with pytest.raises(AttributeError):
+        Payload(compress_variants(b''), 'etag', None).etag = 'x'
@@ -0,0 +1,112 @@
+import pytest
+
+import source_health
+from source_health import (CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_TIMEOUT, CIRCUIT_SLOW_CALL, CLOSED, HALF_OPEN, OPEN,
+                           CircuitOpenError, HealthRegistry, SourceHealth, source_name)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(source_health.time, 'monotonic', clock)
+    return clock
+
+
+def fail(source, times=1):
+    for _ in range(times):
+        source.after_call(source.before_call(), RuntimeError("上游错误"))
+
+
+def test_opens_after_consecutive_failures(clock):
+    source = SourceHealth('stock_zt_pool_em')
+    fail(source, CIRCUIT_FAILURE_THRESHOLD - 1)
+    source.after_call(source.before_call())  # 成功调用清零连续失败
+    fail(source, CIRCUIT_FAILURE_THRESHOLD - 1)
+    assert source.state == CLOSED
+    fail(source)
+    assert source.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        source.before_call()
+    assert source.status()['rejected'] == 1
+
+
+def test_half_open_probe_recovers_or_backs_off(clock):
+    source = SourceHealth('stock_zt_pool_em')
+    fail(source, CIRCUIT_FAILURE_THRESHOLD)
+    clock.now += CIRCUIT_RESET_TIMEOUT
+    probe = source.before_call()
+    assert source.state == HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        source.before_call()  # 试探调用进行中，其他调用仍被跳过
+    source.after_call(probe, RuntimeError("仍然失败"))
+    assert source.state == OPEN
+    assert source.reset_timeout == CIRCUIT_RESET_TIMEOUT * 2
+
+    clock.now += CIRCUIT_RESET_TIMEOUT
+    with pytest.raises(CircuitOpenError):
+        source.before_call()  # 等待时间已加倍
+    clock.now += CIRCUIT_RESET_TIMEOUT
+    source.after_call(source.before_call())
+    assert source.state == CLOSED
+    assert source.reset_timeout == CIRCUIT_RESET_TIMEOUT
+
+
+def test_slow_success_counts_as_failure(clock):
+    source = SourceHealth('stock_zt_pool_em')
+    call_id = source.before_call()
+    clock.now += CIRCUIT_SLOW_CALL + 1
+    source.after_call(call_id)
+    status = source.status()
+    assert status['failures'] == 1
+    assert status['consecutive_failures'] == 1
+
+
+def test_hung_calls_expire_as_one_failure_each(clock):
+    source = SourceHealth('stock_zt_pool_em')
+    hung = [source.before_call() for _ in range(CIRCUIT_FAILURE_THRESHOLD)]
+    clock.now += CIRCUIT_SLOW_CALL + 1
+    with pytest.raises(CircuitOpenError):
+        source.before_call()
+    assert source.status()['failures'] == CIRCUIT_FAILURE_THRESHOLD
+    assert source.status()['in_flight'] == 0
+    source.after_call(hung[0])  # 已按超时计入的调用迟到返回，不再记录
+    assert source.state == OPEN
+    assert source.status()['calls'] == CIRCUIT_FAILURE_THRESHOLD
+
+
+def test_hung_probe_reopens(clock):
+    source = SourceHealth('stock_zt_pool_em')
+    fail(source, CIRCUIT_FAILURE_THRESHOLD)
+    clock.now += CIRCUIT_RESET_TIMEOUT
+    source.before_call()
+    clock.now += CIRCUIT_SLOW_CALL + 1
+    with pytest.raises(CircuitOpenError):
+        source.before_call()
+    assert source.state == OPEN
+    assert source.probing is None
+
+
+def test_registry_call_passes_results_and_errors(clock):
+    registry = HealthRegistry()
+    assert registry.call('a', lambda: 42) == 42
+    with pytest.raises(ZeroDivisionError):
+        registry.call('a', lambda: 1 / 0)
+    assert [item['name'] for item in registry.status()] == ['a']
+    assert registry.status()[0]['failures'] == 1
+
+
+def test_source_name():
+    today = source_health.datetime.now().strftime('%Y%m%d')
+    assert source_name('stock_zt_pool_em', {'date': today}) == 'stock_zt_pool_em(date=today)'
+    assert source_name('stock_zt_pool_em', {'date': '20200102'}) == 'stock_zt_pool_em(date=history)'
+    assert source_name('stock_fund_flow_concept', {'symbol': '3日排行'}) == 'stock_fund_flow_concept(symbol=3日排行)'
+    assert source_name('stock_hot_rank_em', {'symbol': 'x'}) == 'stock_hot_rank_em'
+    assert source_name('stock_board_concept_cons_em', {'symbol': '机器人'}) is None
@@ -0,0 +1,39 @@
+import pandas as pd
+
+from lb import compute_limit_up_streaks
+
+
+def pool(*codes):
+    return pd.DataFrame({'代码': list(codes), '名称': [f"股票{code}" for code in codes], '所属行业': ['行业'] * len(codes)})
+
+
+def test_counts_and_streaks():
+    pools = {
+        '20260105': pool('000001', '000002', '000003'),
+        '20260106': pool('000001', '000002'),
+        '20260107': pool('000001'),
+        '20260108': pool('000001', '000002'),
+    }
+    result = compute_limit_up_streaks(pools, min_days=3).set_index('代码')
+    assert list(result.index) == ['000001', '000002', '000003']
+    assert result.loc['000001', ['涨停次数', '当前连续', '最长连续']].tolist() == [4, 4, 4]
+    assert result.loc['000002', ['涨停次数', '当前连续', '最长连续']].tolist() == [3, 1, 2]
+    assert result.loc['000003', ['涨停次数', '当前连续', '最长连续']].tolist() == [1, 0, 1]
+    assert result.loc['000002', '涨停分布'] == '●●○●'
+    assert result.loc['000003', '最近涨停'] == '20260105'
+    assert result['满足条件'].tolist() == [True, True, False]
+
+
+def test_name_taken_from_latest_day():
+    renamed = pool('000001')
+    renamed['名称'] = ['新名称']
+    result = compute_limit_up_streaks({'20260105': pool('000001'), '20260106': renamed}, min_days=2)
+    assert result.loc[0, '名称'] == '新名称'
+
+
+def test_missing_or_empty_pools_are_skipped():
+    result = compute_limit_up_streaks({'20260105': pd.DataFrame(), '20260106': None, '20260107': pool('000001')}, min_days=1)
+    assert result['代码'].tolist() == ['000001']
+    assert result.loc[0, '涨停分布'] == '○○●'
+    empty = compute_limit_up_streaks({'20260105': pd.DataFrame()})
+    assert empty.empty and '满足条件' in empty.columns